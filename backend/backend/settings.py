@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
 from pathlib import Path
+import logging
 import os
 import dj_database_url
 
@@ -52,10 +53,17 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'events.middleware.JWTSessionBootstrapMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Opt-in per-request query count / timing (Server-Timing header, JSON log
+# line and percentiles at /api/admin/metrics/). Outermost, to time everything.
+REQUEST_INSTRUMENTATION = os.environ.get('REQUEST_INSTRUMENTATION', 'False') == 'True'
+if REQUEST_INSTRUMENTATION:
+    MIDDLEWARE.insert(0, 'events.instrumentation.RequestInstrumentationMiddleware')
+
 ROOT_URLCONF = 'backend.urls'
 
 TEMPLATES = [
@@ -75,10 +83,63 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'backend.wsgi.application'
 
+# Serve the event list/detail, bookmarks and bookings endpoints from the async
+# views in events/async_views.py. Only for ASGI deployments (uvicorn workers
+# running backend.asgi:application); see "Async deployment" in the README.
+ASYNC_READ_VIEWS = os.environ.get('ASYNC_READ_VIEWS', 'False') == 'True'
+if ASYNC_READ_VIEWS:
+    # WhiteNoiseMiddleware is sync-only and would put every request in a thread
+    MIDDLEWARE[MIDDLEWARE.index('whitenoise.middleware.WhiteNoiseMiddleware')] = (
+        'events.middleware.AsyncWhiteNoiseMiddleware'
+    )
+
 
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
+# psycopg 3 connection pool (PostgreSQL only), one per worker process.
+# Sized for the threads that can hold a connection at once in a worker:
+# gunicorn --threads, or the sync_to_async thread pool under ASGI.
+# Health and pool stats: GET /api/health/ (see events/health.py).
+DB_POOL = os.environ.get('DB_POOL', 'False') == 'True'
+DATABASE_POOL_OPTIONS = {
+    'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', '2')),
+    'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', '10')),
+    # Seconds a request waits for a free connection before failing
+    'timeout': float(os.environ.get('DB_POOL_TIMEOUT', '10')),
+    # Seconds before idle connections above min_size are closed
+    'max_idle': float(os.environ.get('DB_POOL_MAX_IDLE', '300')),
+    # Seconds before any connection is recycled
+    'max_lifetime': float(os.environ.get('DB_POOL_MAX_LIFETIME', '3600')),
+}
+
+# SQLite tuned for concurrent workers (SQLITE_TUNED=True), applied to every
+# new connection:
+# - WAL journal: readers never block the writer and vice versa
+# - synchronous=NORMAL: no fsync per commit in WAL mode (a power loss can
+#   drop the last commits, but never corrupts the database)
+# - memory-mapped reads and a larger page cache
+# - busy timeout: a writer waits for the lock instead of failing with
+#   "database is locked"
+# - IMMEDIATE transactions: atomic() blocks (every write path, e.g.
+#   Event.book()) take the write lock at BEGIN, so they queue on the busy
+#   timeout instead of failing when a read lock cannot be upgraded.
+#   Reads run in autocommit and are unaffected.
+SQLITE_TUNED = os.environ.get('SQLITE_TUNED', 'False') == 'True'
+SQLITE_TUNED_OPTIONS = {
+    'init_command': ';'.join([
+        'PRAGMA journal_mode=WAL',
+        'PRAGMA synchronous=NORMAL',
+        f"PRAGMA mmap_size={int(os.environ.get('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024)))}",
+        # Negative: KiB rather than pages
+        f"PRAGMA cache_size=-{int(os.environ.get('SQLITE_CACHE_KB', '65536'))}",
+        'PRAGMA temp_store=MEMORY',
+    ]),
+    'transaction_mode': 'IMMEDIATE',
+    # Seconds (sqlite3's busy timeout)
+    'timeout': float(os.environ.get('SQLITE_BUSY_TIMEOUT', '20')),
+}
+
 # Use PostgreSQL in production, SQLite in development
 if os.environ.get('DATABASE_URL'):
     DATABASES = {
@@ -88,6 +149,10 @@ if os.environ.get('DATABASE_URL'):
             conn_health_checks=True,
         )
     }
+    if DB_POOL:
+        # The pool replaces persistent connections; Django rejects both at once
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+        DATABASES['default'].setdefault('OPTIONS', {})['pool'] = DATABASE_POOL_OPTIONS
 else:
     DATABASES = {
         'default': {
@@ -95,6 +160,70 @@ else:
             'NAME': BASE_DIR / 'db.sqlite3',
         }
     }
+    if SQLITE_TUNED:
+        DATABASES['default']['OPTIONS'] = SQLITE_TUNED_OPTIONS
+
+# Read replica (REPLICA_DATABASE_URL): reads of GET/HEAD/OPTIONS requests go
+# to it; writes, sessions and a client's reads for REPLICA_STICKY_SECONDS
+# after its own write go to the primary. See events/routers.py.
+REPLICA_STICKY_SECONDS = int(os.environ.get('REPLICA_STICKY_SECONDS', '5'))
+if os.environ.get('REPLICA_DATABASE_URL'):
+    DATABASES['replica'] = dj_database_url.parse(
+        os.environ['REPLICA_DATABASE_URL'],
+        conn_max_age=600,
+        conn_health_checks=True,
+    )
+    # Tests use the primary's test database (see EventsTestCase)
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+    if DB_POOL and DATABASES['replica']['ENGINE'] == 'django.db.backends.postgresql':
+        DATABASES['replica']['CONN_MAX_AGE'] = 0
+        DATABASES['replica'].setdefault('OPTIONS', {})['pool'] = dict(DATABASE_POOL_OPTIONS)
+    DATABASE_ROUTERS = ['events.routers.ReadReplicaRouter']
+    MIDDLEWARE.insert(
+        MIDDLEWARE.index('django.contrib.sessions.middleware.SessionMiddleware'),
+        'events.middleware.ReplicaRoutingMiddleware',
+    )
+
+
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+# Shared Redis cache in production (REDIS_URL), otherwise a per-process
+# in-memory cache, or a file-based cache shared by local workers (CACHE_DIR).
+# The event response cache (events/cache.py) is invalidated by bumping a
+# version stored in this cache, so every worker process must share it: with
+# LocMemCache a write only invalidates its own worker, and the others keep
+# serving responses from before it for up to CACHE_TIMEOUT_EVENTS. With more
+# than one worker (WEB_CONCURRENCY, which gunicorn also reads) and neither
+# REDIS_URL nor CACHE_DIR, SHARED_CACHE is False: the response cache is
+# skipped and list ETags fall back to querying the event table.
+SHARED_CACHE = True
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ.get('REDIS_URL'),
+        }
+    }
+elif os.environ.get('CACHE_DIR'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ.get('CACHE_DIR'),
+        }
+    }
+else:
+    if int(os.environ.get('WEB_CONCURRENCY', '1')) > 1:
+        SHARED_CACHE = False
+        logging.getLogger(__name__).warning(
+            'WEB_CONCURRENCY > 1 without REDIS_URL or CACHE_DIR: the event response cache is disabled, '
+            'since an in-memory cache is not shared between workers'
+        )
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'nexevents',
+        }
+    }
 
 
 # Password validation
@@ -141,13 +270,18 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 # REST Framework Configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'events.authentication.StatelessJWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ),
     'EXCEPTION_HANDLER': 'backend.custom_exception_handler.custom_exception_handler',
 }
 
 
+# Event search backend: 'auto' (pick from the database vendor), 'sqlite_fts',
+# 'postgres' or 'basic' (icontains scan, no index)
+EVENT_SEARCH_BACKEND = os.environ.get('EVENT_SEARCH_BACKEND', 'auto')
+
+
 # CORS Configuration
 CORS_ALLOW_ALL_ORIGINS = True
 
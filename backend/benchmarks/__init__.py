@@ -0,0 +1,8 @@
+"""
+Benchmark suite for the events API.
+
+Seeds a synthetic dataset (manage.py seed_events) into a separate benchmark
+database, drives the routes in events/urls.py either in-process (Django test
+client) or over a local gunicorn, and reports throughput and p50/p95/p99
+latency per endpoint against a saved baseline. See __main__.py for usage.
+"""
@@ -0,0 +1,347 @@
+"""
+Events API benchmark runner.
+
+Usage (from backend/):
+    python -m benchmarks                          # in-process, compare to baseline
+    python -m benchmarks --mode gunicorn --workers 4 --concurrency 8
+    python -m benchmarks --mode asgi --workers 1 --concurrency 64
+    python -m benchmarks --events 20000 --seekers 5000 --save-baseline
+    python -m benchmarks --no-reseed --only event-list
+    python -m benchmarks --mode gunicorn --workers 4 --concurrency 16 --only event-book --save-baseline
+    python -m benchmarks --mode gunicorn --workers 4 --concurrency 16 --only event-book --sqlite-tuned
+
+Every run writes results/last-<mode>.json; --save-baseline also writes
+results/baseline-<mode>.json, which later runs are compared against.
+
+--mode asgi runs gunicorn with uvicorn workers and ASYNC_READ_VIEWS=True.
+--sqlite-tuned runs against the SQLITE_TUNED profile (WAL, busy timeout,
+IMMEDIATE transactions); without it the SQLite benchmark database is put
+back into the default rollback-journal mode, so the two can be compared.
+Write scenarios (event-book, event-rsvp:post) send each request as a
+different seeker, so every request really writes.
+Both server modes record the server's resident memory, so sync workers and
+async workers can be compared at the same memory budget. With more than one
+worker and the cache enabled, the workers share a file-based cache under
+results/cache (unless REDIS_URL or CACHE_DIR is set), so writes invalidate
+cached responses in every worker as they would in production.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Benchmark the events API')
+    parser.add_argument('--mode', choices=('inprocess', 'gunicorn', 'asgi'), default='inprocess',
+                        help='Drive the URL routes through the Django test client, a local gunicorn, '
+                             'or gunicorn with uvicorn workers and the async read views')
+    parser.add_argument('--requests', type=int, default=200, help='Measured requests per endpoint')
+    parser.add_argument('--warmup', type=int, default=10, help='Unmeasured requests per endpoint')
+    parser.add_argument('--concurrency', type=int, default=4, help='Client threads (gunicorn/asgi modes)')
+    parser.add_argument('--workers', type=int, default=2, help='Gunicorn worker processes')
+    parser.add_argument('--port', type=int, default=8765, help='Gunicorn port')
+    parser.add_argument('--only', action='append', help='Run only these endpoints (repeatable)')
+    # Dataset, generated by manage.py seed_events
+    parser.add_argument('--organisers', type=int, default=50)
+    parser.add_argument('--seekers', type=int, default=2000)
+    parser.add_argument('--events', type=int, default=1000)
+    parser.add_argument('--rsvps', type=int, default=20000, help='Total RSVPs')
+    parser.add_argument('--bookings', type=int, default=5000, help='Total bookings')
+    parser.add_argument('--zipf', type=float, default=1.1, help='Event popularity skew')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--no-reseed', action='store_true', help='Reuse the existing benchmark database')
+    parser.add_argument('--no-cache', action='store_true', help='Disable the event response cache')
+    parser.add_argument('--sqlite-tuned', action='store_true',
+                        help='Use the SQLITE_TUNED profile for the SQLite benchmark database')
+    parser.add_argument('--save-baseline', action='store_true', help='Save this run as the new baseline')
+    return parser.parse_args()
+
+
+def setup_django(args):
+    os.environ['DJANGO_SETTINGS_MODULE'] = 'benchmarks.settings'
+    if args.no_cache:
+        os.environ['BENCH_NO_CACHE'] = 'True'
+    # Inherited by the gunicorn workers too
+    os.environ['SQLITE_TUNED'] = str(args.sqlite_tuned)
+    sys.path.insert(0, str(BACKEND_DIR))
+    import django
+    django.setup()
+
+
+def prepare_database(args):
+    """Migrate the benchmark database and (re)seed it; return the dataset summary"""
+    from django.conf import settings
+    from django.core.management import call_command
+
+    from django.db import connection
+
+    settings.RESULTS_DIR.mkdir(exist_ok=True)
+    if connection.vendor == 'sqlite' and not args.sqlite_tuned:
+        # WAL is persistent in the database file; undo an earlier tuned run
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode=DELETE')
+    call_command('migrate', verbosity=0)
+    summary_path = settings.RESULTS_DIR / 'dataset.json'
+    if args.no_reseed and summary_path.exists():
+        return json.loads(summary_path.read_text())
+
+    call_command('flush', interactive=False, verbosity=0)
+    started = time.perf_counter()
+    call_command(
+        'seed_events',
+        organisers=args.organisers, seekers=args.seekers, events=args.events,
+        rsvps=args.rsvps, bookings=args.bookings, zipf=args.zipf, seed=args.seed,
+    )
+    summary = {
+        option: getattr(args, option)
+        for option in ('organisers', 'seekers', 'events', 'rsvps', 'bookings', 'zipf', 'seed')
+    }
+    summary['seconds'] = round(time.perf_counter() - started, 2)
+    summary_path.write_text(json.dumps(summary, indent=2))
+    return summary
+
+
+def build_scenarios(args):
+    """(name, method, path, user or users to rotate through) for the routes in events/urls.py"""
+    from django.contrib.auth.models import User
+    from django.db.models import F
+    from django.urls import reverse
+    from events.models import Event
+
+    # Profiles are loaded with the users for the role claim of their tokens
+    users = User.objects.select_related('profile')
+    organiser = users.filter(profile__role='Organizer').order_by('id').first()
+    seeker = users.filter(profile__role='Seeker').order_by('id').first()
+    popular = Event.objects.order_by(F('interested_count').desc(), 'id').first()
+    # One seeker per request for the write scenarios; none has booked yet
+    writers = list(
+        users.filter(profile__role='Seeker').exclude(bookings__event=popular)
+        .order_by('id')[:args.warmup + args.requests]
+    )
+
+    return [
+        ('event-list', 'GET', reverse('event-list'), None),
+        ('event-list:upcoming', 'GET', reverse('event-list') + '?upcoming=true', None),
+        ('event-list:search', 'GET', reverse('event-list') + '?search=python', None),
+        ('event-list:category', 'GET', reverse('event-list') + '?category=Tech&limit=50', None),
+        ('event-list:seeker', 'GET', reverse('event-list'), seeker),
+        ('event-detail', 'GET', reverse('event-detail', args=[popular.pk]), None),
+        ('user-bookmarks', 'GET', reverse('user-bookmarks'), seeker),
+        ('user-bookings', 'GET', reverse('user-bookings'), seeker),
+        ('user-events', 'GET', reverse('user-events'), organiser),
+        ('organizer-revenue', 'GET', reverse('organizer-revenue'), organiser),
+        ('event-rsvp:put', 'PUT', reverse('event-rsvp', args=[popular.pk]), seeker),
+        ('event-rsvp:post', 'POST', reverse('event-rsvp', args=[popular.pk]), writers),
+        ('event-book', 'POST', reverse('event-book', args=[popular.pk]), writers),
+    ]
+
+
+def auth_headers(users):
+    """
+    Authorization header per user; request i is sent as headers[i % len(headers)].
+
+    Tokens are issued as login does (tokens_for_user), with the role claim,
+    so reads take the stateless JWT path rather than the database fallback.
+    """
+    from events.authentication import tokens_for_user
+
+    if users is None:
+        return [None]
+    if not isinstance(users, list):
+        users = [users]
+    return [f'Bearer {tokens_for_user(user).access_token}' for user in users]
+
+
+def run_inprocess(scenario, authorizations, args):
+    """Sequential requests through the full middleware stack via the test client"""
+    from django.test import Client
+
+    client = Client()
+    _, method, path, _ = scenario
+    send = getattr(client, method.lower())
+
+    def one(i):
+        authorization = authorizations[i % len(authorizations)]
+        extra = {'HTTP_AUTHORIZATION': authorization} if authorization else {}
+        start = time.perf_counter()
+        response = send(path, **extra)
+        return time.perf_counter() - start, response.status_code < 400
+
+    for i in range(args.warmup):
+        one(i)
+    started = time.perf_counter()
+    samples = [one(i) for i in range(args.warmup, args.warmup + args.requests)]
+    return samples, time.perf_counter() - started
+
+
+def run_http(scenario, authorizations, args):
+    """Concurrent requests against the local gunicorn"""
+    _, method, path, _ = scenario
+    url = f'http://127.0.0.1:{args.port}{path}'
+
+    def one(i):
+        authorization = authorizations[i % len(authorizations)]
+        headers = {'Authorization': authorization} if authorization else {}
+        request = urllib.request.Request(url, method=method, headers=headers)
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                response.read()
+                ok = True
+        except urllib.error.HTTPError as e:
+            ok = e.code < 400
+        except urllib.error.URLError:
+            ok = False
+        return time.perf_counter() - start, ok
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(one, range(args.warmup)))
+        started = time.perf_counter()
+        samples = list(pool.map(one, range(args.warmup, args.warmup + args.requests)))
+    return samples, time.perf_counter() - started
+
+
+def start_gunicorn(args):
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE='benchmarks.settings')
+    if args.workers > 1 and not args.no_cache and not (env.get('REDIS_URL') or env.get('CACHE_DIR')):
+        # Per-process LocMemCache would leave the other workers serving stale responses
+        cache_dir = BACKEND_DIR / 'benchmarks' / 'results' / 'cache'
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        env['CACHE_DIR'] = str(cache_dir)
+    if args.mode == 'asgi':
+        env['ASYNC_READ_VIEWS'] = 'True'
+        app = ['backend.asgi:application', '--worker-class', 'uvicorn_worker.UvicornWorker']
+    else:
+        app = ['backend.wsgi:application']
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', *app,
+         '--bind', f'127.0.0.1:{args.port}', '--workers', str(args.workers), '--log-level', 'warning'],
+        cwd=BACKEND_DIR, env=env,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            sys.exit('gunicorn exited during startup')
+        try:
+            socket.create_connection(('127.0.0.1', args.port), timeout=1).close()
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    sys.exit('gunicorn did not start listening within 30s')
+
+
+def server_rss_mb(process):
+    """Resident memory of the gunicorn master plus its workers, from /proc (Linux only)"""
+    def rss_kb(pid):
+        try:
+            status = Path(f'/proc/{pid}/status').read_text()
+        except OSError:
+            return 0
+        return next((int(line.split()[1]) for line in status.splitlines() if line.startswith('VmRSS:')), 0)
+
+    try:
+        children = Path(f'/proc/{process.pid}/task/{process.pid}/children').read_text().split()
+    except OSError:
+        return None
+    return round((rss_kb(process.pid) + sum(rss_kb(pid) for pid in children)) / 1024, 1)
+
+
+def summarise(samples, elapsed):
+    from events.instrumentation import percentile
+
+    latencies = sorted(seconds * 1000 for seconds, _ in samples)
+    return {
+        'requests': len(samples),
+        'errors': sum(1 for _, ok in samples if not ok),
+        'rps': round(len(samples) / elapsed, 1) if elapsed else None,
+        'mean_ms': round(sum(latencies) / len(latencies), 2),
+        'p50_ms': round(percentile(latencies, 50), 2),
+        'p95_ms': round(percentile(latencies, 95), 2),
+        'p99_ms': round(percentile(latencies, 99), 2),
+    }
+
+
+def change(current, previous):
+    if not previous:
+        return ''
+    return f'{(current - previous) / previous * 100:+.0f}%'
+
+
+def report(results, baseline):
+    base = (baseline or {}).get('endpoints', {})
+    print(f"\n{'endpoint':<22}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'err':>6}"
+          f"{'rps vs base':>13}{'p95 vs base':>13}")
+    for name, stats in results['endpoints'].items():
+        previous = base.get(name, {})
+        print(f"{name:<22}{stats['rps']:>9}{stats['p50_ms']:>10}{stats['p95_ms']:>10}{stats['p99_ms']:>10}"
+              f"{stats['errors']:>6}{change(stats['rps'], previous.get('rps')):>13}"
+              f"{change(stats['p95_ms'], previous.get('p95_ms')):>13}")
+    if results['server_rss_mb']:
+        print(f"\nServer memory: {results['server_rss_mb']} MB RSS peak across "
+              f"{results['workers']} worker(s) at concurrency {results['concurrency']}")
+    if baseline:
+        print(f"\nCompared with baseline from {baseline['timestamp']}")
+    else:
+        print('\nNo baseline yet; run with --save-baseline to record one')
+
+
+def main():
+    args = parse_args()
+    setup_django(args)
+    from django.conf import settings
+
+    dataset = prepare_database(args)
+    scenarios = [s for s in build_scenarios(args) if not args.only or s[0] in args.only]
+
+    server = start_gunicorn(args) if args.mode != 'inprocess' else None
+    run = run_http if server else run_inprocess
+    rss = []
+    try:
+        endpoints = {}
+        for scenario in scenarios:
+            samples, elapsed = run(scenario, auth_headers(scenario[3]), args)
+            endpoints[scenario[0]] = summarise(samples, elapsed)
+            if server:
+                rss.append(server_rss_mb(server))
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    results = {
+        'mode': args.mode,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'database': settings.DATABASES['default']['ENGINE'].rsplit('.', 1)[-1],
+        'cache': not args.no_cache,
+        'sqlite_tuned': args.sqlite_tuned,
+        'concurrency': args.concurrency if server else 1,
+        'workers': args.workers if server else None,
+        'server_rss_mb': max(filter(None, rss), default=None),
+        'dataset': dataset,
+        'endpoints': endpoints,
+    }
+    baseline_path = settings.RESULTS_DIR / f'baseline-{args.mode}.json'
+    baseline = json.loads(baseline_path.read_text()) if baseline_path.exists() else None
+    report(results, baseline)
+
+    (settings.RESULTS_DIR / f'last-{args.mode}.json').write_text(json.dumps(results, indent=2))
+    if args.save_baseline:
+        baseline_path.write_text(json.dumps(results, indent=2))
+        print(f'Saved baseline to {baseline_path}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""
+Settings for benchmark runs (python -m benchmarks).
+
+Same as backend.settings, but against a separate database so the
+development db.sqlite3 is never touched:
+
+- BENCH_DATABASE_URL: benchmark database URL (e.g. a scratch PostgreSQL);
+  DB_POOL and the DB_POOL_* sizes apply to it as in production
+- otherwise a SQLite file at BENCH_DB (default benchmarks/results/bench.sqlite3),
+  with the SQLITE_TUNED profile when that is set
+- BENCH_NO_CACHE=True disables the event response cache
+"""
+
+import os
+import warnings
+
+import dj_database_url
+
+from backend.settings import *  # noqa: F401,F403
+from backend.settings import BASE_DIR, DATABASE_POOL_OPTIONS, DB_POOL, SQLITE_TUNED, SQLITE_TUNED_OPTIONS
+
+DEBUG = False
+
+RESULTS_DIR = BASE_DIR / 'benchmarks' / 'results'
+
+if os.environ.get('BENCH_DATABASE_URL'):
+    DATABASES = {
+        'default': dj_database_url.parse(os.environ['BENCH_DATABASE_URL'], conn_max_age=600),
+    }
+    if DB_POOL:
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+        DATABASES['default'].setdefault('OPTIONS', {})['pool'] = DATABASE_POOL_OPTIONS
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('BENCH_DB', str(RESULTS_DIR / 'bench.sqlite3')),
+        }
+    }
+    if SQLITE_TUNED:
+        DATABASES['default']['OPTIONS'] = SQLITE_TUNED_OPTIONS
+
+# The benchmark database has no read replica (REPLICA_DATABASE_URL)
+DATABASE_ROUTERS = []
+MIDDLEWARE = [name for name in MIDDLEWARE if name != 'events.middleware.ReplicaRoutingMiddleware']  # noqa: F405
+
+if os.environ.get('BENCH_NO_CACHE') == 'True':
+    CACHES = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+
+# Seeded users share one password; keep hashing out of the measurements
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+# Static files are not benchmarked; WhiteNoise warns when collectstatic has not been run
+warnings.filterwarnings('ignore', message='No directory at')
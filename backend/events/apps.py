@@ -1,5 +1,25 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def restore_search_triggers(sender, using, **kwargs):
+    """
+    Re-create the SQLite FTS triggers after every migrate.
+
+    SQLite silently drops triggers when Django remakes a table during a
+    migration, which would leave the FTS index frozen. The statements are
+    idempotent and only run once the index exists (migration 0007).
+    """
+    from django.db import connections
+    from .search import FTS_TABLE, SQLiteFTSSearchBackend
+
+    connection = connections[using]
+    if connection.vendor == 'sqlite' and FTS_TABLE in connection.introspection.table_names():
+        SQLiteFTSSearchBackend().install(connection)
 
 
 class EventsConfig(AppConfig):
     name = 'events'
+
+    def ready(self):
+        post_migrate.connect(restore_search_triggers, sender=self)
@@ -0,0 +1,228 @@
+"""
+============================================================================
+Async (ASGI) Read Endpoints
+============================================================================
+Async counterparts of the four hottest read endpoints:
+
+- AsyncEventListView      GET /api/events/
+- AsyncEventDetailView    GET /api/events/<id>/
+- AsyncUserBookmarksView  GET /api/events/bookmarks/
+- AsyncUserBookingsView   GET /api/user/bookings/
+
+They return the same bodies, status codes, ETags and cached responses as
+the DRF views in events/views.py, but every query goes through the async
+ORM (aget, aaggregate, aiterator), so under an ASGI server a request
+waiting on the database or on a slow client holds a coroutine, not a
+worker thread or process. DRF's APIView cannot run async handlers, so these
+are plain Django views; AsyncAPIView supplies the parts of APIView they
+need (JWT/session authentication, IsAuthenticated and DRF-style errors).
+
+urls.py routes the four paths to these views when ASYNC_READ_VIEWS=True,
+which is meant for the uvicorn-worker deployment (see README). Under WSGI
+leave it off: Django would run each async view through async_to_sync.
+============================================================================
+"""
+
+import logging
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse
+from django.views import View
+from rest_framework import exceptions
+from rest_framework.renderers import JSONRenderer
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+
+from backend.custom_exception_handler import custom_exception_handler
+
+from .authentication import StatelessJWTAuthentication
+from .cache import acache_anonymous_get, aget_catalogue_version, now_relative_bucket
+from .conditional import aconditional_get, acollection_fingerprint
+from .config import ERROR_MESSAGES, EXPORT_CHUNK_SIZE
+from .models import Booking, Event
+from .pagination import apaginate_events, InvalidPageParameter
+from .serializers import BookingSerializer, CompactBookingSerializer, EventSerializer
+from .utils import parse_flag
+from .views import event_list_payload, filter_event_catalogue
+
+logger = logging.getLogger(__name__)
+
+
+class JSONResponse(HttpResponse):
+    """JSON rendered the way DRF's JSONRenderer does; keeps .data for the response cache"""
+
+    def __init__(self, data, status=200):
+        super().__init__(JSONRenderer().render(data), status=status, content_type='application/json')
+        self.data = data
+
+
+class AsyncAPIView(View):
+    """
+    Base class for async read views: authenticates like the DRF views
+    (StatelessJWTAuthentication, then the session) before dispatching.
+    """
+    login_required = False
+    authenticator = StatelessJWTAuthentication()
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            request.user = await self.authenticate(request)
+            if self.login_required and not request.user.is_authenticated:
+                raise exceptions.NotAuthenticated()
+        except (exceptions.APIException, InvalidToken, TokenError) as exc:
+            return self.error_response(request, exc)
+        return await super().dispatch(request, *args, **kwargs)
+
+    async def http_method_not_allowed(self, request, *args, **kwargs):
+        """JSON 405 with an Allow header, instead of Django's HTML one"""
+        logger.warning(f"Method Not Allowed ({request.method}): {request.path}")
+        response = self.error_response(request, exceptions.MethodNotAllowed(request.method))
+        response['Allow'] = ', '.join(self._allowed_methods())
+        return response
+
+    def error_response(self, request, exc):
+        """JSONResponse for an APIException, shaped by the project's exception handler"""
+        error = custom_exception_handler(exc, {'request': request})
+        response = JSONResponse(error.data, status=error.status_code)
+        if response.status_code == 401:
+            response['WWW-Authenticate'] = self.authenticator.authenticate_header(request)
+        return response
+
+    async def authenticate(self, request):
+        result = await self.authenticator.aauthenticate(request)
+        if result is not None:
+            return result[0]
+        user = await request.auser()
+        return user if user.is_authenticated else AnonymousUser()
+
+
+# ============================================================================
+# CONDITIONAL GET FINGERPRINTS - async versions of those in events/views.py
+# ============================================================================
+
+async def event_catalogue_afingerprint(request):
+    if not settings.SHARED_CACHE:
+        parts, last_modified = await acollection_fingerprint(Event.objects.all())
+        return (*parts, now_relative_bucket(request)), last_modified
+    return (await aget_catalogue_version(), now_relative_bucket(request)), None
+
+
+async def event_afingerprint(request, event_id):
+    parts, last_modified = await acollection_fingerprint(Event.objects.filter(id=event_id))
+    return (parts, last_modified) if parts[0] else None
+
+
+async def bookmarks_afingerprint(request):
+    return await acollection_fingerprint(Event.objects.filter(interested_users=request.user.pk))
+
+
+async def bookings_afingerprint(request):
+    return await acollection_fingerprint(Booking.objects.filter(attendee_id=request.user.pk), 'event__updated_at')
+
+
+class AsyncEventListView(AsyncAPIView):
+    """GET /api/events/ - see EventListView"""
+
+    @aconditional_get(event_catalogue_afingerprint)
+    @acache_anonymous_get
+    async def get(self, request):
+        try:
+            events, ordering, filters, errors = filter_event_catalogue(
+                request.GET, Event.objects.with_stats(request.user)
+            )
+            if errors:
+                return JSONResponse({'error': ERROR_MESSAGES['VALIDATION_FAILED'], 'fields': errors}, status=400)
+
+            try:
+                page, next_cursor = await apaginate_events(
+                    events,
+                    cursor=request.GET.get('cursor', '').strip(),
+                    limit=request.GET.get('limit'),
+                    ordering=ordering,
+                )
+            except InvalidPageParameter as e:
+                logger.warning(f"Invalid pagination parameter '{e.field}' on AsyncEventListView")
+                return JSONResponse({'error': ERROR_MESSAGES['VALIDATION_FAILED'], 'fields': {e.field: str(e)}}, status=400)
+
+            logger.info(f"AsyncEventListView accessed - Returned {len(page)} events, more: {next_cursor is not None}")
+            return JSONResponse(event_list_payload(request, page, next_cursor, filters))
+
+        except Exception as e:
+            logger.error(f"AsyncEventListView error: {type(e).__name__}: {str(e)}")
+            return JSONResponse(
+                {
+                    'error': ERROR_MESSAGES.get('EVENT_RETRIEVAL_FAILED', 'Failed to retrieve events'),
+                    'detail': str(e)
+                },
+                status=500
+            )
+
+
+class AsyncEventDetailView(AsyncAPIView):
+    """GET /api/events/<id>/ - see EventDetailView"""
+
+    @aconditional_get(event_afingerprint, honor_if_modified_since=True)
+    @acache_anonymous_get
+    async def get(self, request, event_id):
+        try:
+            event = await Event.objects.with_stats(request.user).aget(id=event_id)
+            logger.info(f"AsyncEventDetailView accessed for event ID: {event_id} - '{event.name}'")
+            return JSONResponse({'event': EventSerializer(event, context={'request': request}).data})
+
+        except Event.DoesNotExist:
+            logger.warning(f"AsyncEventDetailView - Event not found with ID: {event_id}")
+            return JSONResponse({'error': ERROR_MESSAGES['EVENT_NOT_FOUND']}, status=404)
+        except Exception as e:
+            logger.error(f"AsyncEventDetailView error: {type(e).__name__}: {str(e)}")
+            return JSONResponse({'error': str(e)}, status=500)
+
+
+class AsyncUserBookmarksView(AsyncAPIView):
+    """GET /api/events/bookmarks/ - see UserBookmarksView"""
+    login_required = True
+
+    @aconditional_get(bookmarks_afingerprint)
+    async def get(self, request):
+        try:
+            events = Event.objects.with_stats(request.user).filter(interested_users=request.user.pk)
+            bookmarked = [event async for event in events.aiterator(chunk_size=EXPORT_CHUNK_SIZE)]
+            bookmarks = EventSerializer(bookmarked, many=True, context={'request': request}).data
+
+            logger.info(f"Retrieved {len(bookmarks)} bookmarked events for user: {request.user.username}")
+            return JSONResponse({'bookmarks': bookmarks, 'count': len(bookmarks)})
+
+        except Exception as e:
+            logger.error(f"AsyncUserBookmarksView error: {type(e).__name__}: {str(e)}")
+            return JSONResponse({'error': str(e)}, status=500)
+
+
+class AsyncUserBookingsView(AsyncAPIView):
+    """GET /api/user/bookings/ - see UserBookingsView"""
+    login_required = True
+
+    @aconditional_get(bookings_afingerprint)
+    async def get(self, request):
+        try:
+            compact = parse_flag(request.GET.get('compact'))
+            if compact is None:
+                return JSONResponse(
+                    {'error': ERROR_MESSAGES['VALIDATION_FAILED'], 'fields': {'compact': ERROR_MESSAGES['INVALID_FLAG']}},
+                    status=400
+                )
+
+            queryset = Booking.objects.filter(
+                attendee_id=request.user.pk,
+                status='confirmed'
+            ).for_serializer(compact=compact).order_by('-booking_date')
+            bookings = [booking async for booking in queryset.aiterator(chunk_size=EXPORT_CHUNK_SIZE)]
+
+            serializer_class = CompactBookingSerializer if compact else BookingSerializer
+            logger.info(f"Retrieved {len(bookings)} bookings for user: {request.user.username}")
+            return JSONResponse({
+                'bookings': serializer_class(bookings, many=True).data,
+                'count': len(bookings)
+            })
+
+        except Exception as e:
+            logger.error(f"AsyncUserBookingsView error: {type(e).__name__}: {str(e)}")
+            return JSONResponse({'error': str(e)}, status=500)
@@ -0,0 +1,178 @@
+"""
+============================================================================
+Stateless JWT Authentication
+============================================================================
+Tokens issued by login/register (tokens_for_user) carry the user's
+username, staff flags and role as claims, and simplejwt copies them into
+every access token, including refreshed ones.
+
+StatelessJWTAuthentication uses those claims for read-only requests
+(GET/HEAD/OPTIONS): request.user is a ClaimsUser built from the token, so
+neither the User row nor the profile is loaded. Write requests still get
+the real User from the database, because they create rows pointing at it.
+
+Deactivated or deleted users are caught by an is_active check that is
+cached in-process for JWT_ACTIVE_USER_CACHE_SECONDS, so a revocation takes
+effect on reads within that window. Tokens issued before the role claim
+existed fall back to the database lookup.
+
+aauthenticate() does the same for the async views in events/async_views.py,
+using the async ORM for the is_active check and the user lookup.
+============================================================================
+"""
+
+import threading
+import time
+
+from django.contrib.auth.models import User
+from django.utils.functional import cached_property
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from .config import JWT_ACTIVE_USER_CACHE_SECONDS
+
+ROLE_CLAIM = 'role'
+DEFAULT_ROLE = 'Seeker'
+# Session key under which JWTSessionBootstrapMiddleware stores the role claim
+SESSION_ROLE_KEY = 'role'
+
+
+def user_role(user):
+    """Role of a request user: the token claim if present, else the profile"""
+    role = getattr(user, 'role', None)
+    if role:
+        return role
+    profile = getattr(user, 'profile', None)
+    return profile.role if profile else DEFAULT_ROLE
+
+
+def session_role(request):
+    """Role for session-authenticated page views, without a profile query when possible"""
+    return request.session.get(SESSION_ROLE_KEY) or user_role(request.user)
+
+
+def tokens_for_user(user, role=None):
+    """
+    RefreshToken for user with the claims StatelessJWTAuthentication reads.
+
+    Pass role when it is already known to skip loading the profile.
+    """
+    refresh = RefreshToken.for_user(user)
+    refresh['username'] = user.username
+    refresh['is_staff'] = user.is_staff
+    refresh['is_superuser'] = user.is_superuser
+    refresh[ROLE_CLAIM] = role or user_role(user)
+    return refresh
+
+
+class ClaimsUser(TokenUser):
+    """Request user materialised from token claims, without a database row"""
+
+    @cached_property
+    def role(self):
+        return self.token.get(ROLE_CLAIM)
+
+
+class ActiveUserCache:
+    """In-process, short-lived cache of 'is this user id still active?'"""
+
+    def __init__(self, ttl=JWT_ACTIVE_USER_CACHE_SECONDS):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def is_active(self, user_id):
+        cached = self._cached(user_id)
+        if cached is not None:
+            return cached
+        return self._store(user_id, User.objects.filter(pk=user_id, is_active=True).exists())
+
+    async def ais_active(self, user_id):
+        """Async version of is_active()"""
+        cached = self._cached(user_id)
+        if cached is not None:
+            return cached
+        return self._store(user_id, await User.objects.filter(pk=user_id, is_active=True).aexists())
+
+    def _cached(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+        if entry and entry[1] > time.monotonic():
+            return entry[0]
+        return None
+
+    def _store(self, user_id, active):
+        with self._lock:
+            self._entries[user_id] = (active, time.monotonic() + self.ttl)
+        return active
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+active_users = ActiveUserCache()
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """JWT authentication that skips the user lookup on read-only requests"""
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        if request.method in SAFE_METHODS and ROLE_CLAIM in validated_token:
+            if not active_users.is_active(validated_token[api_settings.USER_ID_CLAIM]):
+                raise AuthenticationFailed('User is inactive or deleted', code='user_inactive')
+            return ClaimsUser(validated_token), validated_token
+
+        return self.get_user(validated_token), validated_token
+
+    async def aauthenticate(self, request):
+        """Async version of authenticate(), for plain Django async views"""
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        if request.method in SAFE_METHODS and ROLE_CLAIM in validated_token:
+            if not await active_users.ais_active(validated_token[api_settings.USER_ID_CLAIM]):
+                raise AuthenticationFailed('User is inactive or deleted', code='user_inactive')
+            return ClaimsUser(validated_token), validated_token
+
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        """Async version of JWTAuthentication.get_user()"""
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken('Token contained no recognizable user identification') from e
+
+        try:
+            user = await self.user_model.objects.aget(**{api_settings.USER_ID_FIELD: user_id})
+        except self.user_model.DoesNotExist as e:
+            raise AuthenticationFailed('User not found', code='user_not_found') from e
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed('User is inactive', code='user_inactive')
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed("The user's password has been changed.", code='password_changed')
+
+        return user
@@ -0,0 +1,193 @@
+"""
+============================================================================
+Versioned Response Cache for Public Event Endpoints
+============================================================================
+Anonymous GET /api/events/ and GET /api/events/<id>/ responses are cached
+through Django's cache framework (see CACHES in settings). Every cache key
+embeds a global event-catalogue version number; any write that changes
+what those endpoints return bumps the version, which orphans all previously
+cached responses at once (they then expire via CACHE_TIMEOUT_EVENTS).
+
+Writes bump the version after the surrounding transaction commits, so a
+reader can never re-cache data from before the write under the new version.
+With a read replica (events/routers.py) the replica may still lack the
+write for a moment, so for REPLICA_STICKY_SECONDS after a bump responses
+read from the replica are served but not stored.
+
+?upcoming= and ?past= compare against the current time, so they also go
+stale without any write: their keys carry a time bucket (now_relative_bucket)
+that rolls over every NOW_RELATIVE_WINDOW seconds, and their entries live
+no longer than that.
+
+All of this needs the cache to be shared by every worker process. When
+it is not (SHARED_CACHE=False, see settings.py), responses are not cached
+and the list ETag is computed from the event table instead.
+
+The async views in events/async_views.py use acache_anonymous_get(), which
+reads and writes the same entries through the cache's async API.
+============================================================================
+"""
+
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from .config import CACHE_TIMEOUT_EVENTS, NOW_RELATIVE_WINDOW
+from .routers import reading_from_replica, replica_configured
+from .utils import parse_flag
+
+CATALOGUE_VERSION_KEY = 'events:catalogue-version'
+# Present for REPLICA_STICKY_SECONDS after a bump when a replica is configured
+CATALOGUE_WRITTEN_KEY = 'events:catalogue-written'
+RESPONSE_KEY_PREFIX = 'events:response'
+
+
+def _fresh_version():
+    # Millisecond clock instead of 1 so a version lost to eviction is never
+    # reused while responses cached under it are still alive
+    return int(time.time() * 1000)
+
+
+def get_catalogue_version():
+    """Return the current event-catalogue version, initialising it if missing"""
+    version = cache.get(CATALOGUE_VERSION_KEY)
+    if version is None:
+        cache.add(CATALOGUE_VERSION_KEY, _fresh_version(), timeout=None)
+        version = cache.get(CATALOGUE_VERSION_KEY)
+    return version
+
+
+async def aget_catalogue_version():
+    """Async version of get_catalogue_version()"""
+    version = await cache.aget(CATALOGUE_VERSION_KEY)
+    if version is None:
+        await cache.aadd(CATALOGUE_VERSION_KEY, _fresh_version(), timeout=None)
+        version = await cache.aget(CATALOGUE_VERSION_KEY)
+    return version
+
+
+def bump_catalogue_version():
+    """Invalidate every cached event response immediately"""
+    if replica_configured():
+        # Set first: whoever sees the new version also sees this
+        cache.set(CATALOGUE_WRITTEN_KEY, True, settings.REPLICA_STICKY_SECONDS)
+    try:
+        return cache.incr(CATALOGUE_VERSION_KEY)
+    except ValueError:
+        # Key missing (never set or evicted)
+        version = _fresh_version()
+        cache.set(CATALOGUE_VERSION_KEY, version, timeout=None)
+        return version
+
+
+def invalidate_event_cache():
+    """Bump the catalogue version once the current transaction commits"""
+    transaction.on_commit(bump_catalogue_version)
+
+
+def now_relative_bucket(request):
+    """Current NOW_RELATIVE_WINDOW time bucket for ?upcoming=/?past= requests, else None"""
+    if parse_flag(request.GET.get('upcoming')) or parse_flag(request.GET.get('past')):
+        return int(time.time() // NOW_RELATIVE_WINDOW)
+    return None
+
+
+def _request_digest(request):
+    query = sorted(
+        (name, value)
+        for name, values in request.GET.lists()
+        for value in values
+    )
+    return hashlib.md5(f'{request.path}?{query}@{now_relative_bucket(request)}'.encode()).hexdigest()
+
+
+def _cache_timeout(request):
+    # Entries for a time bucket are useless once it has rolled over
+    return CACHE_TIMEOUT_EVENTS if now_relative_bucket(request) is None else NOW_RELATIVE_WINDOW
+
+
+def response_cache_key(request):
+    """Cache key for a request: catalogue version + path + normalised query"""
+    return f'{RESPONSE_KEY_PREFIX}:{get_catalogue_version()}:{_request_digest(request)}'
+
+
+async def aresponse_cache_key(request):
+    """Async version of response_cache_key()"""
+    return f'{RESPONSE_KEY_PREFIX}:{await aget_catalogue_version()}:{_request_digest(request)}'
+
+
+def _replica_may_be_stale():
+    return replica_configured() and reading_from_replica() and cache.get(CATALOGUE_WRITTEN_KEY) is not None
+
+
+async def _areplica_may_be_stale():
+    return (
+        replica_configured() and reading_from_replica()
+        and await cache.aget(CATALOGUE_WRITTEN_KEY) is not None
+    )
+
+
+def cache_anonymous_get(view_method):
+    """
+    Cache successful responses of an APIView.get() for anonymous users.
+
+    Authenticated responses carry per-user fields (is_booked_by_user) and
+    always bypass the cache, as does everything without SHARED_CACHE.
+    Adds an X-Cache: HIT/MISS header.
+    """
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        if request.user.is_authenticated or not settings.SHARED_CACHE:
+            return view_method(self, request, *args, **kwargs)
+
+        key = response_cache_key(request)
+        cached = cache.get(key)
+        if cached is not None:
+            response = Response(cached['data'], status=cached['status'])
+            response['X-Cache'] = 'HIT'
+            return response
+
+        response = view_method(self, request, *args, **kwargs)
+        if response.status_code == 200 and not _replica_may_be_stale():
+            cache.set(key, {'data': response.data, 'status': response.status_code}, _cache_timeout(request))
+        response['X-Cache'] = 'MISS'
+        return response
+
+    return wrapper
+
+
+def acache_anonymous_get(view_method):
+    """
+    cache_anonymous_get() for async views returning JSON HttpResponses.
+
+    Entries hold the response data rather than the rendered body, so they
+    are interchangeable with the ones cached by the sync views.
+    """
+    @wraps(view_method)
+    async def wrapper(self, request, *args, **kwargs):
+        if request.user.is_authenticated or not settings.SHARED_CACHE:
+            return await view_method(self, request, *args, **kwargs)
+
+        key = await aresponse_cache_key(request)
+        cached = await cache.aget(key)
+        if cached is not None:
+            response = HttpResponse(
+                JSONRenderer().render(cached['data']), status=cached['status'], content_type='application/json'
+            )
+            response['X-Cache'] = 'HIT'
+            return response
+
+        response = await view_method(self, request, *args, **kwargs)
+        if response.status_code == 200 and not await _areplica_may_be_stale():
+            await cache.aset(key, {'data': response.data, 'status': response.status_code}, _cache_timeout(request))
+        response['X-Cache'] = 'MISS'
+        return response
+
+    return wrapper
@@ -0,0 +1,153 @@
+"""
+============================================================================
+Conditional GET (ETag / Last-Modified) for Event Endpoints
+============================================================================
+Views decorated with conditional_get() answer a repeated request with
+304 Not Modified before querying or serializing anything, when the client
+sends back the ETag it was given (If-None-Match).
+
+The ETag is not a hash of the response body. It is derived from a cheap
+fingerprint plus everything else the body depends on: the requesting user,
+the query string and the rendered format. For a user's own (small)
+collections the fingerprint is a query for the row count and max
+updated_at of the rows the response is built from; Event.updated_at and
+Booking.updated_at are bumped by save() and by every counter UPDATE, so any
+change to a response changes its fingerprint. The event list, which spans
+the whole catalogue, uses the catalogue version from events/cache.py
+instead, so validating it costs no query at all.
+
+aconditional_get() and acollection_fingerprint() are the same for the async
+views in events/async_views.py.
+============================================================================
+"""
+
+import hashlib
+from calendar import timegm
+from functools import wraps
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+
+def collection_fingerprint(queryset, *related_timestamps):
+    """
+    Fingerprint a collection: (row count, latest updated_at).
+
+    related_timestamps name extra datetime lookups (e.g. 'event__updated_at')
+    whose changes also show up in the response; the latest of all of them is
+    returned as the last-modified time.
+
+    Returns:
+        tuple: (parts for the ETag, last-modified datetime or None)
+    """
+    lookups = ('updated_at',) + related_timestamps
+    stats = queryset.order_by().aggregate(**_fingerprint_aggregates(lookups))
+    return _fingerprint_state(stats, lookups)
+
+
+async def acollection_fingerprint(queryset, *related_timestamps):
+    """Async version of collection_fingerprint()"""
+    lookups = ('updated_at',) + related_timestamps
+    stats = await queryset.order_by().aaggregate(**_fingerprint_aggregates(lookups))
+    return _fingerprint_state(stats, lookups)
+
+
+def _fingerprint_aggregates(lookups):
+    return {
+        'count': Count('id'),
+        **{f'latest_{i}': Max(lookup) for i, lookup in enumerate(lookups)},
+    }
+
+
+def _fingerprint_state(stats, lookups):
+    timestamps = [stats[f'latest_{i}'] for i in range(len(lookups))]
+    present = [value for value in timestamps if value is not None]
+    return (stats['count'], *timestamps), max(present) if present else None
+
+
+def compute_etag(request, parts):
+    """Strong ETag for parts as seen by this user, query string and format"""
+    user_id = request.user.pk if request.user.is_authenticated else None
+    renderer = getattr(request, 'accepted_renderer', None)
+    key = repr((
+        request.path,
+        sorted(request.GET.lists()),
+        user_id,
+        getattr(renderer, 'format', None),
+        parts,
+    ))
+    return quote_etag(hashlib.md5(key.encode()).hexdigest())
+
+
+def conditional_get(fingerprint, honor_if_modified_since=False):
+    """
+    Add ETag/Last-Modified validators to an APIView.get() and answer
+    If-None-Match (and optionally If-Modified-Since) with 304.
+
+    Args:
+        fingerprint: callable(request, *args, **kwargs) returning
+            (parts, last_modified) as collection_fingerprint() does, or None
+            to skip validation (e.g. the object does not exist)
+        honor_if_modified_since: only safe for single objects; a deletion
+            from a collection does not advance its last-modified time, so
+            collections are validated by ETag alone
+    """
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            state = fingerprint(request, *args, **kwargs)
+            if state is None:
+                return view_method(self, request, *args, **kwargs)
+
+            etag, timestamp, response = _check_validators(request, state, honor_if_modified_since)
+            if response is None:
+                response = view_method(self, request, *args, **kwargs)
+            return _add_validators(request, response, etag, timestamp)
+
+        return wrapper
+
+    return decorator
+
+
+def aconditional_get(fingerprint, honor_if_modified_since=False):
+    """conditional_get() for async view methods; fingerprint is async too"""
+    def decorator(view_method):
+        @wraps(view_method)
+        async def wrapper(self, request, *args, **kwargs):
+            state = await fingerprint(request, *args, **kwargs)
+            if state is None:
+                return await view_method(self, request, *args, **kwargs)
+
+            etag, timestamp, response = _check_validators(request, state, honor_if_modified_since)
+            if response is None:
+                response = await view_method(self, request, *args, **kwargs)
+            return _add_validators(request, response, etag, timestamp)
+
+        return wrapper
+
+    return decorator
+
+
+def _check_validators(request, state, honor_if_modified_since):
+    """(etag, last-modified timestamp, 304 response or None) for a fingerprint"""
+    parts, last_modified = state
+    etag = compute_etag(request, parts)
+    timestamp = timegm(last_modified.utctimetuple()) if last_modified else None
+    response = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=timestamp if honor_if_modified_since else None,
+    )
+    return etag, timestamp, response
+
+
+def _add_validators(request, response, etag, timestamp):
+    if response.status_code in (200, 304):
+        response['ETag'] = etag
+        if timestamp is not None:
+            response['Last-Modified'] = http_date(timestamp)
+        # Always revalidate; responses for signed-in users are per user
+        patch_cache_control(response, no_cache=True, private=request.user.is_authenticated)
+        patch_vary_headers(response, ('Authorization', 'Cookie'))
+    return response
@@ -88,6 +88,9 @@ SEARCH_DEBOUNCE_MS = 300
 # Events per page in listings
 EVENTS_PER_PAGE = 12
 
+# Upper bound for the ?limit= parameter on paginated event listings
+EVENTS_MAX_PER_PAGE = 100
+
 # ============================================================================
 # Error Messages
 # ============================================================================
@@ -131,6 +134,16 @@ ERROR_MESSAGES = {
     
     'CATEGORY_REQUIRED': 'Category is required',
     'CATEGORY_INVALID': 'Invalid category. Choose: Tech, Arts, Sports, or Education',
+    'INVALID_CATEGORY': 'Invalid category. Choose: Tech, Arts, Sports, or Education',
+    
+    'CAPACITY_INVALID': 'Capacity must be a positive whole number',
+    'ALREADY_BOOKED': 'You have already booked this event',
+    'EVENT_SOLD_OUT': 'This event is sold out',
+    
+    'INVALID_CURSOR': 'Invalid or expired pagination cursor',
+    'INVALID_LIMIT': 'Limit must be a positive whole number',
+    'INVALID_FLAG': 'Must be true or false',
+    'UPCOMING_AND_PAST': 'Use either upcoming or past, not both',
     
     'VALIDATION_FAILED': 'Validation failed',
     'INVALID_CREDENTIALS': 'Invalid username or password',
@@ -204,8 +217,43 @@ UI_COLORS = {
 }
 
 # ============================================================================
-# Cache Configuration (if needed in future)
+# Authentication
+# ============================================================================
+
+# How long a read request may trust a token's user as still active
+# without checking the database (events/authentication.py)
+JWT_ACTIVE_USER_CACHE_SECONDS = 60
+
+# ============================================================================
+# Streaming Exports
 # ============================================================================
 
+# Rows fetched from the database per round trip by export views
+# (events/streaming.py); memory stays bounded by this, not by the export size
+EXPORT_CHUNK_SIZE = 2000
+
+# Serialized rows buffered before each write to the client
+EXPORT_ROWS_PER_WRITE = 100
+
+
+# ============================================================================
+# Cache Configuration
+# ============================================================================
+
+# Lifetime of cached anonymous event list/detail responses (events/cache.py)
 CACHE_TIMEOUT_EVENTS = 300  # 5 minutes
 CACHE_TIMEOUT_USERS = 600   # 10 minutes
+
+# ?upcoming= / ?past= lists change as time passes, not only on writes: their
+# cache keys and ETags roll over every NOW_RELATIVE_WINDOW seconds, so an
+# event that has just started leaves the upcoming list within this window
+NOW_RELATIVE_WINDOW = 60  # 1 minute
+
+
+# ============================================================================
+# Request Instrumentation
+# ============================================================================
+
+# Requests kept per endpoint for the p50/p95/p99 at /api/admin/metrics/
+# (events/instrumentation.py, enabled with REQUEST_INSTRUMENTATION=True)
+METRICS_WINDOW_SIZE = 500
@@ -0,0 +1,67 @@
+"""
+============================================================================
+Database Health and Connection Pool Stats
+============================================================================
+GET /api/health/ runs a trivial query on every configured database alias
+and reports whether it answered and how long it took. Load balancers only
+need the status code (200 healthy, 503 if any database is unreachable).
+
+Staff users also get per-alias connection details. When the alias uses
+Django's psycopg connection pool (DB_POOL=True, see settings.py) that
+includes the pool's own counters from psycopg_pool's get_stats():
+
+- pool_min / pool_max:      configured bounds
+- pool_size:                connections currently open (idle + in use)
+- pool_available:           idle connections ready to be borrowed
+- requests_waiting:         threads currently queued for a connection
+- requests_num / requests_queued / requests_wait_ms: borrow totals, how
+  many had to wait and for how long in total
+- connections_num / connections_ms / connections_lost: new connections
+  opened (each one a TCP + auth handshake), their cost and drops
+
+The pool lives in the worker process, so each worker reports its own.
+============================================================================
+"""
+
+import time
+
+from django.db import DatabaseError, connections
+
+
+def pool_stats(connection):
+    """psycopg_pool stats for a pooled connection, or None when it is not pooled"""
+    pool = getattr(connection, 'pool', None)
+    if pool is None:
+        return None
+    return pool.get_stats()
+
+
+def database_health(alias):
+    """{'alias', 'ok', 'latency_ms', 'vendor', 'pooled', 'pool'} for one database alias"""
+    connection = connections[alias]
+    started = time.perf_counter()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+        ok, error = True, None
+    except DatabaseError as e:
+        ok, error = False, f'{type(e).__name__}: {str(e)}'
+
+    stats = pool_stats(connection)
+    report = {
+        'alias': alias,
+        'ok': ok,
+        'latency_ms': round((time.perf_counter() - started) * 1000, 2),
+        'vendor': connection.vendor,
+        'pooled': stats is not None,
+        'pool': stats,
+    }
+    if error:
+        report['error'] = error
+    return report
+
+
+def health_report():
+    """Health of every configured database alias"""
+    return [database_health(alias) for alias in connections]
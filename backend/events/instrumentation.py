@@ -0,0 +1,221 @@
+"""
+============================================================================
+Request Instrumentation (opt-in)
+============================================================================
+RequestInstrumentationMiddleware measures every request:
+
+- db:         number of SQL queries and time spent executing them
+- serializer: time spent in instrumented serializers' to_representation()
+              (includes any queries they trigger lazily)
+- total:      wall time through the rest of the middleware stack and view
+
+The numbers are sent back in a Server-Timing header (visible in the
+browser's network panel), logged as one JSON line on the
+'events.instrumentation' logger, and kept in a per-endpoint rolling window
+from which GET /api/admin/metrics/ reports p50/p95/p99.
+
+Enable with REQUEST_INSTRUMENTATION=True in the environment (see settings).
+The middleware is async-capable, so under ASGI it adds no thread hop; the
+queries of async views run on connections it has already wrapped.
+The rolling windows live in process memory, so each worker reports its own.
+============================================================================
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+
+from .config import METRICS_WINDOW_SIZE
+
+logger = logging.getLogger(__name__)
+
+METRIC_FIELDS = ('total_ms', 'db_ms', 'serializer_ms', 'queries')
+# Registry key route for requests that resolved to no URL pattern
+UNRESOLVED_ENDPOINT = '<unresolved>'
+
+
+class RequestMetrics:
+    """Counters for the request currently being handled"""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.serializer_seconds = 0.0
+        # Nesting depth, so nested/list serializers are only timed once
+        self.serializer_depth = 0
+
+
+# Metrics of the current request; None when instrumentation is off.
+# A ContextVar keeps concurrent requests apart under threads and asyncio.
+current_metrics = ContextVar('current_metrics', default=None)
+
+
+class MetricsRegistry:
+    """Per-endpoint rolling windows of recent request metrics"""
+
+    def __init__(self, window_size=METRICS_WINDOW_SIZE):
+        self.window_size = window_size
+        self._lock = threading.Lock()
+        self._samples = defaultdict(lambda: deque(maxlen=self.window_size))
+
+    def record(self, endpoint, sample):
+        with self._lock:
+            self._samples[endpoint].append(sample)
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+
+    def summary(self):
+        """{endpoint: {'count', metric: {'p50', 'p95', 'p99'}}} for every endpoint"""
+        with self._lock:
+            snapshot = {endpoint: list(samples) for endpoint, samples in self._samples.items()}
+
+        report = {}
+        for endpoint, samples in sorted(snapshot.items()):
+            stats = {'count': len(samples)}
+            for field in METRIC_FIELDS:
+                values = sorted(sample[field] for sample in samples)
+                stats[field] = {
+                    f'p{pct}': percentile(values, pct) for pct in (50, 95, 99)
+                }
+            report[endpoint] = stats
+        return report
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(int(-(-pct * len(sorted_values) // 100)), 1)  # ceil
+    return sorted_values[rank - 1]
+
+
+registry = MetricsRegistry()
+
+
+@contextmanager
+def serializer_timer():
+    """Add the time spent inside the block to the request's serializer time"""
+    metrics = current_metrics.get()
+    if metrics is None:
+        yield
+        return
+    metrics.serializer_depth += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.serializer_depth -= 1
+        if metrics.serializer_depth == 0:
+            metrics.serializer_seconds += time.perf_counter() - start
+
+
+class InstrumentedSerializerMixin:
+    """Serializer mixin reporting to_representation() time to the middleware"""
+
+    def to_representation(self, instance):
+        with serializer_timer():
+            return super().to_representation(instance)
+
+
+def _query_timer(metrics):
+    """connection.execute_wrapper() callback counting queries and DB time"""
+    def wrapper(execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            metrics.queries += 1
+            metrics.db_seconds += time.perf_counter() - start
+    return wrapper
+
+
+def endpoint_name(request):
+    """
+    'GET api/events/<int:event_id>/' style key, so ids do not split endpoints.
+
+    Requests that match no route (404 scans, bots) share one key, so they
+    cannot grow the registry by a window per distinct path.
+    """
+    match = getattr(request, 'resolver_match', None)
+    route = match.route if match else UNRESOLVED_ENDPOINT
+    return f'{request.method} {route}'
+
+
+def instrumentation_enabled():
+    """True if RequestInstrumentationMiddleware is installed"""
+    return f'{__name__}.RequestInstrumentationMiddleware' in settings.MIDDLEWARE
+
+
+@contextmanager
+def _measuring(metrics):
+    """Make metrics the current request's and count queries on every connection"""
+    token = current_metrics.set(metrics)
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(_query_timer(metrics)))
+            yield
+    finally:
+        current_metrics.reset(token)
+
+
+class RequestInstrumentationMiddleware:
+    """Measure queries, DB time, serializer time and total time per request"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(self.get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        start = time.perf_counter()
+        with _measuring(metrics):
+            response = self.get_response(request)
+        return self._report(request, response, metrics, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        start = time.perf_counter()
+        with _measuring(metrics):
+            response = await self.get_response(request)
+        return self._report(request, response, metrics, time.perf_counter() - start)
+
+    def _report(self, request, response, metrics, total_seconds):
+        """Record the sample, add Server-Timing and log the JSON line"""
+        sample = {
+            'total_ms': round(total_seconds * 1000, 2),
+            'db_ms': round(metrics.db_seconds * 1000, 2),
+            'serializer_ms': round(metrics.serializer_seconds * 1000, 2),
+            'queries': metrics.queries,
+        }
+        endpoint = endpoint_name(request)
+        registry.record(endpoint, sample)
+
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={sample["db_ms"]};desc="{metrics.queries} queries"',
+            f'serializer;dur={sample["serializer_ms"]}',
+            f'total;dur={sample["total_ms"]}',
+        ])
+        logger.info(json.dumps({
+            'endpoint': endpoint,
+            'path': request.path,
+            'status': response.status_code,
+            **sample,
+        }))
+        return response
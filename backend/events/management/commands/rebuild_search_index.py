@@ -0,0 +1,36 @@
+"""
+Re-create and repopulate the full-text search index used by GET /api/events/?search=.
+
+Usage:
+    python manage.py rebuild_search_index
+    python manage.py rebuild_search_index --backend sqlite_fts
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from events.cache import bump_catalogue_version
+from events.search import SEARCH_BACKENDS, get_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the event full-text search index (SQLite FTS5 or PostgreSQL tsvector)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--backend',
+            choices=sorted(SEARCH_BACKENDS),
+            help='Backend to rebuild (defaults to the one selected by EVENT_SEARCH_BACKEND)',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            backend = SEARCH_BACKENDS[options['backend']]() if options['backend'] else get_search_backend()
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        with transaction.atomic():
+            indexed = backend.rebuild()
+        bump_catalogue_version()
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt '{backend.name}' search index: {indexed} events indexed"))
@@ -0,0 +1,228 @@
+"""
+Generate a large synthetic dataset (organisers, seekers, events, RSVPs and
+bookings) for profiling and benchmarks.
+
+Usage:
+    python manage.py seed_events                        # small default dataset
+    python manage.py seed_events --seekers 200000 --events 50000 \\
+        --rsvps 3000000 --bookings 1000000
+    python manage.py seed_events --clear                # replace earlier seeded data
+
+Rows are written with batched bulk_create, so the per-user post_save profile
+signals never run; profiles are bulk inserted with their role instead.
+Event popularity follows a Zipf-like distribution (a few events collect most
+RSVPs and bookings) and every booked seeker has also bookmarked the event,
+as Event.book() does. Counters are recomputed once at the end.
+
+--clear deletes the earlier run with one DELETE per table instead of
+Model.delete(), whose per-row counter signals would issue an UPDATE for
+every RSVP and booking; the counters of surviving events that seeded
+users had bookmarked or booked are recomputed afterwards.
+"""
+
+import random
+import time
+from collections import Counter
+from datetime import timedelta
+from decimal import Decimal
+from itertools import accumulate
+
+from django.contrib.admin.models import LogEntry
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from events.cache import bump_catalogue_version
+from events.config import EVENT_CATEGORIES
+from events.models import Booking, Event, UserProfile, computed_counter_expressions
+
+WORDS = (
+    'python', 'music', 'jazz', 'startup', 'marathon', 'yoga', 'design', 'data',
+    'cloud', 'poetry', 'chess', 'robotics', 'film', 'history', 'football', 'painting',
+)
+CITIES = ('Chennai', 'Mumbai', 'Delhi', 'Bengaluru', 'Pune', 'Hyderabad', 'Kolkata')
+TICKET_PRICES = [Decimal(price) for price in (0, 99, 199, 499, 999)]
+
+# Share of generated bookings left cancelled, so status filters have work to do
+CANCELLED_RATIO = 0.05
+
+
+class Command(BaseCommand):
+    help = 'Bulk-generate organisers, seekers, events and Zipf-distributed RSVPs and bookings'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--organisers', type=int, default=50)
+        parser.add_argument('--seekers', type=int, default=2000)
+        parser.add_argument('--events', type=int, default=1000)
+        parser.add_argument('--rsvps', type=int, default=20000, help='Total RSVPs (bookmarks)')
+        parser.add_argument('--bookings', type=int, default=5000, help='Total bookings (at most --rsvps)')
+        parser.add_argument(
+            '--zipf', type=float, default=1.1,
+            help='Popularity skew: the event ranked r gets weight 1 / r^zipf (0 = uniform)',
+        )
+        parser.add_argument('--seed', type=int, default=42, help='Random seed; same seed, same dataset')
+        parser.add_argument('--prefix', default='seed', help='Username prefix of generated users')
+        parser.add_argument('--password', default='seed-password', help='Password of every generated user')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per INSERT')
+        parser.add_argument('--clear', action='store_true', help='Delete users (and their events) from an earlier run first')
+
+    def handle(self, *args, **options):
+        if options['bookings'] > options['rsvps']:
+            raise CommandError('--bookings cannot exceed --rsvps: every booked seeker also bookmarks the event')
+        if min(options['organisers'], options['seekers'], options['events']) < 1:
+            raise CommandError('--organisers, --seekers and --events must be at least 1')
+
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        prefix = options['prefix']
+        started = time.perf_counter()
+
+        existing = User.objects.filter(username__startswith=f'{prefix}_')
+        if existing.exists():
+            if not options['clear']:
+                raise CommandError(f"Users prefixed '{prefix}_' already exist; pass --clear or another --prefix")
+            deleted = self.clear_previous_run(existing)
+            self.stdout.write(f'Deleted {deleted} rows from the previous run')
+
+        with transaction.atomic():
+            password_hash = make_password(options['password'])
+            organiser_ids = self.create_users(f'{prefix}_org_', options['organisers'], 'Organizer', password_hash)
+            seeker_ids = self.create_users(f'{prefix}_seeker_', options['seekers'], 'Seeker', password_hash)
+            events = self.create_events(options['events'], organiser_ids)
+            rsvps, bookings = self.create_rsvps_and_bookings(
+                events, seeker_ids, options['rsvps'], options['bookings'], options['zipf']
+            )
+
+            self.stdout.write('Recomputing event counters...')
+            Event.objects.filter(id__in=[event_id for event_id, _ in events]).update(
+                **computed_counter_expressions()
+            )
+        bump_catalogue_version()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded {len(organiser_ids)} organisers, {len(seeker_ids)} seekers, {len(events)} events, '
+            f'{rsvps} RSVPs and {bookings} bookings in {time.perf_counter() - started:.1f}s'
+        ))
+
+    def clear_previous_run(self, users):
+        """Delete users, their events and every row pointing at either, in bulk"""
+        user_ids = users.values('id')
+        events = Event.objects.filter(organiser_id__in=user_ids).values('id')
+        Interest = Event.interested_users.through
+        with transaction.atomic():
+            # Other users' events whose counters include seeded users' rows
+            touched = set(
+                Interest.objects.filter(user_id__in=user_ids).exclude(event_id__in=events)
+                .values_list('event_id', flat=True)
+            ) | set(
+                Booking.objects.filter(attendee_id__in=user_ids).exclude(event_id__in=events)
+                .values_list('event_id', flat=True)
+            )
+            # Children first; _raw_delete() sends no signals and loads no rows
+            querysets = (
+                Interest.objects.filter(Q(user_id__in=user_ids) | Q(event_id__in=events)),
+                Booking.objects.filter(Q(attendee_id__in=user_ids) | Q(event_id__in=events)),
+                Event.objects.filter(organiser_id__in=user_ids),
+                UserProfile.objects.filter(user_id__in=user_ids),
+                User.groups.through.objects.filter(user_id__in=user_ids),
+                User.user_permissions.through.objects.filter(user_id__in=user_ids),
+                LogEntry.objects.filter(user_id__in=user_ids),
+                users,
+            )
+            deleted = sum(queryset._raw_delete(queryset.db) for queryset in querysets)
+            if touched:
+                Event.objects.filter(id__in=touched).update(**computed_counter_expressions())
+        bump_catalogue_version()
+        return deleted
+
+    def bulk_insert(self, model, rows):
+        """bulk_create an iterable of unsaved instances in batch_size chunks"""
+        batch, total = [], 0
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                model.objects.bulk_create(batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            model.objects.bulk_create(batch)
+            total += len(batch)
+        return total
+
+    def create_users(self, username_prefix, count, role, password_hash):
+        """Insert users and their profiles; returns the new user ids"""
+        self.bulk_insert(User, (
+            User(username=f'{username_prefix}{i}', email=f'{username_prefix}{i}@example.com', password=password_hash)
+            for i in range(count)
+        ))
+        # Re-read the ids: not every database returns them from bulk inserts
+        user_ids = list(
+            User.objects.filter(username__startswith=username_prefix).order_by('id').values_list('id', flat=True)
+        )
+        self.bulk_insert(UserProfile, (UserProfile(user_id=user_id, role=role) for user_id in user_ids))
+        self.stdout.write(f'Created {len(user_ids)} {role} users')
+        return user_ids
+
+    def create_events(self, count, organiser_ids):
+        """Insert events; returns [(id, ticket_price)] in creation order"""
+        rng = self.rng
+        now = timezone.now()
+        first_id = (Event.objects.order_by('-id').values_list('id', flat=True).first() or 0)
+        categories = list(EVENT_CATEGORIES)
+        self.bulk_insert(Event, (
+            Event(
+                name=f'{rng.choice(WORDS).title()} {rng.choice(WORDS).title()} {i}',
+                description=' '.join(rng.choices(WORDS, k=12)),
+                date_time=now + timedelta(hours=rng.randint(-24 * 90, 24 * 180)),
+                location=rng.choice(CITIES),
+                category=rng.choice(categories),
+                ticket_price=rng.choice(TICKET_PRICES),
+                organiser_id=rng.choice(organiser_ids),
+            )
+            for i in range(count)
+        ))
+        events = list(Event.objects.filter(id__gt=first_id).order_by('id').values_list('id', 'ticket_price'))
+        self.stdout.write(f'Created {len(events)} events')
+        return events
+
+    def create_rsvps_and_bookings(self, events, seeker_ids, total_rsvps, total_bookings, zipf):
+        """
+        Spread RSVPs over events by Zipf weight (capped at one per seeker per
+        event) and book a proportional share of each event's RSVPs.
+        """
+        rng = self.rng
+        # Random popularity rank per event, so popularity is not tied to id order
+        ranked = rng.sample(events, len(events))
+        cum_weights = list(accumulate(1 / (rank + 1) ** zipf for rank in range(len(ranked))))
+        rsvp_counts = Counter(rng.choices(range(len(ranked)), cum_weights=cum_weights, k=total_rsvps))
+        booking_ratio = total_bookings / total_rsvps if total_rsvps else 0
+
+        plan = []
+        for index, count in rsvp_counts.items():
+            event_id, price = ranked[index]
+            attendees = rng.sample(seeker_ids, min(count, len(seeker_ids)))
+            plan.append((event_id, price, attendees, round(len(attendees) * booking_ratio)))
+
+        Interest = Event.interested_users.through
+        rsvps = self.bulk_insert(Interest, (
+            Interest(event_id=event_id, user_id=user_id)
+            for event_id, _, attendees, _ in plan
+            for user_id in attendees
+        ))
+        self.stdout.write(f'Created {rsvps} RSVPs')
+
+        bookings = self.bulk_insert(Booking, (
+            Booking(
+                event_id=event_id,
+                attendee_id=user_id,
+                amount=price,
+                status='cancelled' if rng.random() < CANCELLED_RATIO else 'confirmed',
+            )
+            for event_id, price, attendees, booked in plan
+            for user_id in attendees[:booked]
+        ))
+        self.stdout.write(f'Created {bookings} bookings')
+        return rsvps, bookings
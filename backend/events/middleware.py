@@ -0,0 +1,176 @@
+"""
+============================================================================
+JWT-to-Session Bootstrap Middleware
+============================================================================
+The login and register pages hand the freshly issued access token to the
+first HTML page as ?token=<jwt> (e.g. /seeker-dashboard?token=...), because
+a plain page navigation cannot send an Authorization header.
+
+JWTSessionBootstrapMiddleware turns that token into a Django session once
+and redirects to the same URL without the token, so the token does not stay
+in the address bar, history or Referer headers. If the session already
+belongs to the token's user, the token is only stripped: no user lookup, no
+login and no session write.
+
+The middleware is sync and async capable, so under ASGI it does not push
+every request through a thread; only the rare ?token= bootstrap itself
+runs in one.
+
+AsyncWhiteNoiseMiddleware does the same for WhiteNoise, whose middleware
+is sync-only: settings.py swaps it in when ASYNC_READ_VIEWS is on.
+
+ReplicaRoutingMiddleware tells the read-replica router which requests may
+read the replica (see events/routers.py).
+============================================================================
+"""
+
+import logging
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.auth import login as auth_login
+from django.http import HttpResponseRedirect
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from .authentication import ROLE_CLAIM, SESSION_ROLE_KEY
+from .routers import current_routing, mark_sticky, routing_for
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PARAM = 'token'
+
+
+class JWTSessionBootstrapMiddleware:
+    """Log in page requests carrying ?token=<access token>, then drop the token"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.authenticator = JWTAuthentication()
+        self.async_mode = iscoroutinefunction(self.get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not self.carries_token(request):
+            return self.get_response(request)
+
+        self.bootstrap_session(request, request.GET[TOKEN_PARAM])
+        return self.redirect_without_token(request)
+
+    async def __acall__(self, request):
+        if not self.carries_token(request):
+            return await self.get_response(request)
+
+        await sync_to_async(self.bootstrap_session)(request, request.GET[TOKEN_PARAM])
+        return self.redirect_without_token(request)
+
+    @staticmethod
+    def carries_token(request):
+        return (
+            request.method == 'GET'
+            and TOKEN_PARAM in request.GET
+            and not request.path.startswith('/api/')
+        )
+
+    @staticmethod
+    def redirect_without_token(request):
+        query = request.GET.copy()
+        del query[TOKEN_PARAM]
+        clean_url = request.path + (f'?{query.urlencode()}' if query else '')
+        return HttpResponseRedirect(clean_url)
+
+    def bootstrap_session(self, request, raw_token):
+        """Attach the token's user to the session unless it is already there"""
+        try:
+            token = self.authenticator.get_validated_token(raw_token.encode())
+        except AuthenticationFailed as e:
+            # Leave the session alone; the page itself sends anonymous users to login
+            logger.warning(f"Ignoring invalid ?token= on {request.path}: {e}")
+            return
+
+        user_id = str(token.get(api_settings.USER_ID_CLAIM))
+        if request.user.is_authenticated and str(request.user.pk) == user_id:
+            return
+
+        try:
+            user = self.authenticator.get_user(token)
+        except AuthenticationFailed as e:
+            logger.warning(f"Ignoring ?token= for unknown or inactive user on {request.path}: {e}")
+            return
+
+        auth_login(request, user, backend='django.contrib.auth.backends.ModelBackend')
+        if ROLE_CLAIM in token:
+            # Lets the dashboards check the role without loading the profile
+            request.session[SESSION_ROLE_KEY] = token[ROLE_CLAIM]
+        logger.info(f"Session started from ?token= for user: {user.username}")
+
+
+class AsyncWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoiseMiddleware that stays async under ASGI.
+
+    A sync middleware makes Django run everything inside it through
+    sync_to_async, every API request included. This one only leaves the
+    event loop to build a static file response.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings)
+        self.async_mode = iscoroutinefunction(self.get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
+
+
+class ReplicaRoutingMiddleware:
+    """Scope ReadReplicaRouter decisions to the request; stick writers to the primary"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(self.get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        state = routing_for(request)
+        token = current_routing.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_routing.reset(token)
+        return mark_sticky(response, state)
+
+    async def __acall__(self, request):
+        state = routing_for(request)
+        token = current_routing.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_routing.reset(token)
+        return mark_sticky(response, state)
@@ -0,0 +1,55 @@
+# Generated by Django 6.0.2 on 2026-10-17 02:12
+
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def backfill_counters(apps, schema_editor):
+    """Populate the new counters from existing interest and booking rows"""
+    Event = apps.get_model('events', 'Event')
+    Booking = apps.get_model('events', 'Booking')
+    Interest = Event.interested_users.through
+
+    interested = dict(
+        Interest.objects.values('event_id').annotate(total=Count('id')).values_list('event_id', 'total')
+    )
+    confirmed = {
+        row['event_id']: row
+        for row in Booking.objects.filter(status='confirmed')
+        .values('event_id')
+        .annotate(total=Count('id'), revenue=Sum('amount'))
+    }
+    for event_id in set(interested) | set(confirmed):
+        booking_row = confirmed.get(event_id, {})
+        Event.objects.filter(pk=event_id).update(
+            interested_count=interested.get(event_id, 0),
+            confirmed_booking_count=booking_row.get('total', 0),
+            confirmed_revenue=booking_row.get('revenue') or Decimal('0.00'),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0005_merge_0002_booking_0004_add_event_relationships'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='confirmed_booking_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='confirmed_revenue',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='interested_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 6.0.2 on 2026-10-17 03:05
+
+from django.db import migrations
+
+
+def install_search_index(apps, schema_editor):
+    """Create and populate the full-text index for the current database vendor"""
+    from events.search import backend_for_vendor
+    connection = schema_editor.connection
+    backend_for_vendor(connection.vendor).rebuild(connection)
+
+
+def remove_search_index(apps, schema_editor):
+    from events.search import backend_for_vendor
+    connection = schema_editor.connection
+    backend_for_vendor(connection.vendor).uninstall(connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0006_event_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search_index, remove_search_index),
+    ]
@@ -1,8 +1,27 @@
+from decimal import Decimal
+
 from django.db import models
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Exists, F, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Greatest, Now
 from django.contrib.auth.models import User
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete, pre_delete
 from django.dispatch import receiver
 
+from .cache import invalidate_event_cache
+
+
+class BookingError(Exception):
+    """Base class for bookings that cannot be made"""
+
+
+class AlreadyBooked(BookingError):
+    """The user already holds a confirmed booking for the event"""
+
+
+class EventSoldOut(BookingError):
+    """Every seat of a capacity-limited event has been booked"""
+
 
 class UserProfile(models.Model):
     """User profile to store role-based information"""
@@ -19,16 +38,130 @@ class UserProfile(models.Model):
         return f"{self.user.username} - {self.role}"
 
 
-# Signal to create UserProfile when User is created
+def create_user_with_role(username, email, password, role, **extra_fields):
+    """
+    Create a user whose profile is inserted with role already set.
+
+    create_user_profile picks the role up from the unsaved instance, so
+    registration costs one INSERT per table instead of an INSERT followed by
+    a get_or_create and an UPDATE of the profile.
+    """
+    user = User(username=User.normalize_username(username), email=User.objects.normalize_email(email), **extra_fields)
+    user.set_password(password)
+    user._profile_role = role
+    user.save()
+    return user
+
+
+# Signal to create UserProfile when User is created. There is deliberately no
+# matching "save the profile on every User save" receiver: the profile shares
+# no fields with User, and that receiver turned each last_login update into an
+# extra SELECT and UPDATE of the profile.
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
     if created:
-        UserProfile.objects.create(user=instance)
+        role = getattr(instance, '_profile_role', None)
+        UserProfile.objects.create(user=instance, **({'role': role} if role else {}))
 
 
-@receiver(post_save, sender=User)
-def save_user_profile(sender, instance, **kwargs):
-    instance.profile.save()
+class EventQuerySet(models.QuerySet):
+    """QuerySet helpers for reading events in bulk"""
+
+    def with_stats(self, user=None):
+        """
+        Prepare events for EventSerializer without extra queries per event.
+
+        Interest/booking figures are denormalized columns on Event, so only
+        the organiser join and the current user's booking flag are needed.
+        """
+        queryset = self.select_related('organiser')
+        if user is not None and user.is_authenticated:
+            return queryset.annotate(
+                annotated_is_booked=Exists(
+                    Booking.objects.filter(event_id=OuterRef('pk'), attendee_id=user.pk, status='confirmed')
+                )
+            )
+        return queryset.annotate(annotated_is_booked=Value(False))
+
+    def with_revenue(self, start=None, end=None):
+        """
+        Annotate period_revenue and period_bookings for each event.
+
+        Without a date range these are the denormalized counters. With one,
+        confirmed bookings whose booking_date falls in [start, end) are
+        grouped per event in a correlated subquery; events without bookings
+        in the period get zero. Neither form is an aggregate of the outer
+        query, so callers may still wrap them in Window() totals.
+        """
+        if start is None and end is None:
+            return self.annotate(
+                period_revenue=F('confirmed_revenue'),
+                period_bookings=F('confirmed_booking_count'),
+            )
+
+        in_period = Booking.objects.filter(event_id=OuterRef('pk'), status='confirmed')
+        if start is not None:
+            in_period = in_period.filter(booking_date__gte=start)
+        if end is not None:
+            in_period = in_period.filter(booking_date__lt=end)
+        per_event = in_period.order_by().values('event_id')
+        return self.annotate(
+            period_revenue=Coalesce(
+                Subquery(per_event.annotate(total=Sum('amount')).values('total')),
+                Value(Decimal('0.00')),
+                output_field=models.DecimalField(max_digits=12, decimal_places=2),
+            ),
+            period_bookings=Coalesce(
+                Subquery(per_event.annotate(total=Count('*')).values('total')), 0
+            ),
+        )
+
+    def with_computed_counters(self):
+        """
+        Annotate the true interest/booking figures from the source tables
+        as computed_<counter field> (e.g. computed_confirmed_revenue).
+
+        Used to detect drift in the denormalized counters.
+        """
+        return self.annotate(**{
+            f'computed_{name}': expression
+            for name, expression in computed_counter_expressions().items()
+        })
+
+
+def computed_counter_expressions():
+    """
+    Expressions recomputing each denormalized Event counter from the source
+    tables, keyed by counter name. Usable both in annotate() and update().
+
+    Counts are computed with correlated subqueries rather than JOINs so that
+    interested users and bookings do not multiply each other's rows.
+    """
+    interested = (
+        Event.interested_users.through.objects
+        .filter(event_id=OuterRef('pk'))
+        .order_by()
+        .values('event_id')
+        .annotate(total=Count('*'))
+        .values('total')
+    )
+    confirmed = (
+        Booking.objects
+        .filter(event_id=OuterRef('pk'), status='confirmed')
+        .order_by()
+        .values('event_id')
+    )
+    return {
+        'interested_count': Coalesce(Subquery(interested), 0),
+        'confirmed_booking_count': Coalesce(
+            Subquery(confirmed.annotate(total=Count('*')).values('total')), 0
+        ),
+        'confirmed_revenue': Coalesce(
+            Subquery(confirmed.annotate(total=Sum('amount')).values('total')),
+            Value(Decimal('0.00')),
+            output_field=models.DecimalField(max_digits=12, decimal_places=2),
+        ),
+    }
 
 
 class Event(models.Model):
@@ -49,18 +182,205 @@ class Event(models.Model):
     organiser = models.ForeignKey(User, on_delete=models.CASCADE, related_name='organised_events', null=True, blank=True)
     interested_users = models.ManyToManyField(User, related_name='interested_events', blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Bumped by save() and by every counter UPDATE; drives ETag/Last-Modified
+    updated_at = models.DateTimeField(auto_now=True)
+    # Maximum number of confirmed bookings; None means unlimited
+    capacity = models.PositiveIntegerField(null=True, blank=True)
+
+    # Denormalized counters, kept in step via adjust_counters().
+    # Run `manage.py repair_event_counters` to fix any drift.
+    interested_count = models.PositiveIntegerField(default=0)
+    confirmed_booking_count = models.PositiveIntegerField(default=0)
+    confirmed_revenue = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0.00'))
+
+    objects = EventQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Catalogue pages: keyset pagination on (date_time, id), optionally by category
+            models.Index(fields=['date_time', 'id'], name='event_date_id_idx'),
+            models.Index(fields=['category', 'date_time', 'id'], name='event_category_date_idx'),
+            # An organiser's events, newest first (UserEventsView)
+            models.Index(fields=['organiser', '-created_at'], name='event_organiser_created_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
     def get_total_revenue(self):
-        """Calculate total revenue from bookings for this event"""
-        bookings = self.bookings.filter(status='confirmed')
-        return sum(booking.amount for booking in bookings)
+        """Get total revenue from confirmed bookings for this event"""
+        return self.confirmed_revenue
 
     def get_booking_count(self):
         """Get number of confirmed bookings"""
-        return self.bookings.filter(status='confirmed').count()
+        return self.confirmed_booking_count
+
+    @property
+    def seats_remaining(self):
+        """Seats left to book, or None for events without a capacity"""
+        if self.capacity is None:
+            return None
+        return max(self.capacity - self.confirmed_booking_count, 0)
+
+    def book(self, user):
+        """
+        Book a ticket for user at the current ticket price in one transaction.
+
+        The booking row is inserted first so duplicates are rejected by the
+        unique constraint without touching the event row. The seat is then
+        claimed with a conditional UPDATE (confirmed_booking_count < capacity)
+        as the last statement, so the hot event row is locked only briefly and
+        concurrent bookings can never oversell. The user is also bookmarked.
+
+        Returns:
+            Booking: the confirmed booking
+
+        Raises:
+            AlreadyBooked: user already has a confirmed booking for this event
+            EventSoldOut: no seats left (nothing is written)
+        """
+        price = self.ticket_price
+        with transaction.atomic():
+            try:
+                with transaction.atomic():
+                    booking = Booking.objects.create(
+                        event=self, attendee=user, amount=price, status='confirmed'
+                    )
+            except IntegrityError:
+                # A cancelled or pending booking may be confirmed again
+                reopened = (
+                    Booking.objects.filter(event=self, attendee=user)
+                    .exclude(status='confirmed')
+                    .update(status='confirmed', amount=price, updated_at=Now())
+                )
+                if not reopened:
+                    raise AlreadyBooked('You have already booked this event')
+                booking = Booking.objects.get(event=self, attendee=user)
+
+            newly_interested = self._insert_interest(user)
+
+            updates = {
+                'confirmed_booking_count': F('confirmed_booking_count') + 1,
+                'confirmed_revenue': F('confirmed_revenue') + price,
+                'updated_at': Now(),
+            }
+            if newly_interested:
+                updates['interested_count'] = F('interested_count') + 1
+            claimed = Event.objects.filter(
+                Q(capacity__isnull=True) | Q(confirmed_booking_count__lt=F('capacity')),
+                pk=self.pk,
+            ).update(**updates)
+            if not claimed:
+                # Raising rolls back the booking and bookmark rows above
+                raise EventSoldOut('This event is sold out')
+            invalidate_event_cache()
+
+        return booking
+
+    def _insert_interest(self, user):
+        """Insert the interest row unless it exists; True if it was inserted"""
+        try:
+            with transaction.atomic():
+                Event.interested_users.through.objects.create(event_id=self.pk, user_id=user.pk)
+            return True
+        except IntegrityError:
+            return False
+
+    def add_interested_user(self, user):
+        """
+        Bookmark this event for user (idempotent).
+
+        Relies on the through table's unique constraint instead of loading
+        the interested users, so the cost does not grow with popularity.
+
+        Returns:
+            bool: True if the user was newly added
+        """
+        with transaction.atomic():
+            added = self._insert_interest(user)
+            if added:
+                self.adjust_counters(interested=1)
+        return added
+
+    def remove_interested_user(self, user):
+        """
+        Remove user's bookmark (idempotent); the DELETE rowcount decides.
+
+        Returns:
+            bool: True if a bookmark was removed
+        """
+        with transaction.atomic():
+            removed, _ = Event.interested_users.through.objects.filter(
+                event_id=self.pk, user_id=user.pk
+            ).delete()
+            if removed:
+                self.adjust_counters(interested=-1)
+        return bool(removed)
+
+    def toggle_interested_user(self, user):
+        """
+        Flip user's bookmark: a conditional delete, then an insert if nothing
+        was deleted.
+
+        Returns:
+            bool: True if the user is now interested
+        """
+        with transaction.atomic():
+            if self.remove_interested_user(user):
+                return False
+            # A concurrent request may have added it first; either way it is set
+            self.add_interested_user(user)
+            return True
+
+    def adjust_counters(self, interested=0, bookings=0, revenue=0):
+        """
+        Atomically shift the denormalized counters by the given deltas.
+
+        The UPDATE uses F() expressions so concurrent requests never lose an
+        increment. In-memory values on this instance are not refreshed.
+        """
+        Event.adjust_counters_for(self.pk, interested=interested, bookings=bookings, revenue=revenue)
+
+    @staticmethod
+    def adjust_counters_for(event_ids, interested=0, bookings=0, revenue=0):
+        """Apply adjust_counters() deltas to one event id or a list of ids"""
+        updates = {}
+        if interested:
+            updates['interested_count'] = Greatest(F('interested_count') + interested, 0)
+        if bookings:
+            updates['confirmed_booking_count'] = Greatest(F('confirmed_booking_count') + bookings, 0)
+        if revenue:
+            updates['confirmed_revenue'] = F('confirmed_revenue') + revenue
+        if not updates:
+            return 0
+        if not isinstance(event_ids, (list, tuple, set)):
+            event_ids = [event_ids]
+        invalidate_event_cache()
+        return Event.objects.filter(pk__in=event_ids).update(updated_at=Now(), **updates)
+
+
+class BookingQuerySet(models.QuerySet):
+    """QuerySet helpers for reading bookings in bulk"""
+
+    # Columns BookingSerializer reads, through event, organiser and attendee
+    SERIALIZER_FIELDS = (
+        'id', 'amount', 'status', 'booking_date',
+        'event__id', 'event__name',
+        'event__organiser__id', 'event__organiser__first_name', 'event__organiser__last_name',
+        'attendee__id', 'attendee__first_name', 'attendee__last_name',
+    )
+    # Columns CompactBookingSerializer reads
+    COMPACT_SERIALIZER_FIELDS = ('id', 'amount', 'status', 'booking_date', 'event__id', 'event__name')
+
+    def for_serializer(self, compact=False):
+        """
+        Prepare bookings for BookingSerializer (or CompactBookingSerializer
+        when compact) in one joined query: related rows are selected with the
+        booking and only the columns the serializer reads are loaded.
+        """
+        if compact:
+            return self.select_related('event').only(*self.COMPACT_SERIALIZER_FIELDS)
+        return self.select_related('event__organiser', 'attendee').only(*self.SERIALIZER_FIELDS)
 
 
 class Booking(models.Model):
@@ -76,9 +396,99 @@ class Booking(models.Model):
     amount = models.DecimalField(max_digits=10, decimal_places=2)  # Ticket price at time of booking
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='confirmed')
     booking_date = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = BookingQuerySet.as_manager()
     
     class Meta:
-        unique_together = ('event', 'attendee')  # One booking per user per event
+        constraints = [
+            # One booking per user per event
+            models.UniqueConstraint(fields=('event', 'attendee'), name='unique_booking_per_user'),
+        ]
+        indexes = [
+            # Only confirmed bookings are ever listed or summed, so these are
+            # partial indexes: cancelled and pending rows take no space in them.
+            # A user's bookings, newest first (UserBookingsView and its export)
+            models.Index(
+                fields=['attendee', '-booking_date'], name='booking_attendee_confirmed_idx',
+                condition=models.Q(status='confirmed'),
+            ),
+            # Bookings per event within a date range (revenue report and export)
+            models.Index(
+                fields=['event', 'booking_date'], name='booking_event_confirmed_idx',
+                condition=models.Q(status='confirmed'),
+            ),
+        ]
     
     def __str__(self):
         return f"{self.attendee.username} - {self.event.name}"
+
+    def set_status(self, new_status):
+        """
+        Move this booking to new_status and keep the event counters in step.
+
+        The status is switched with a conditional UPDATE so that two racing
+        changes cannot both apply the same counter delta. Confirming a booking
+        claims a seat the same way Event.book() does.
+
+        Returns:
+            bool: True if the status changed, False if it was already new_status
+
+        Raises:
+            EventSoldOut: confirming would exceed the event's capacity
+        """
+        old_status = self.status
+        if old_status == new_status:
+            return False
+
+        with transaction.atomic():
+            changed = Booking.objects.filter(pk=self.pk, status=old_status).update(
+                status=new_status, updated_at=Now()
+            )
+            if not changed:
+                self.refresh_from_db(fields=['status'])
+                return False
+
+            if old_status == 'confirmed':
+                Event.adjust_counters_for(self.event_id, bookings=-1, revenue=-self.amount)
+            elif new_status == 'confirmed':
+                claimed = Event.objects.filter(
+                    Q(capacity__isnull=True) | Q(confirmed_booking_count__lt=F('capacity')),
+                    pk=self.event_id,
+                ).update(
+                    confirmed_booking_count=F('confirmed_booking_count') + 1,
+                    confirmed_revenue=F('confirmed_revenue') + self.amount,
+                    updated_at=Now(),
+                )
+                if not claimed:
+                    raise EventSoldOut('This event is sold out')
+                invalidate_event_cache()
+
+        self.status = new_status
+        return True
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def invalidate_cached_event_responses(sender, **kwargs):
+    """Created, edited or deleted events must not be served from cache"""
+    invalidate_event_cache()
+
+
+@receiver(post_delete, sender=Booking)
+def release_booking_counters(sender, instance, origin=None, **kwargs):
+    """Take a deleted confirmed booking out of its event's counters"""
+    if isinstance(origin, Event) and origin.pk == instance.event_id:
+        # Cascade from deleting the event itself: nothing left to adjust, and
+        # skipping avoids one UPDATE per booking
+        return
+    if instance.status == 'confirmed':
+        Event.adjust_counters_for(instance.event_id, bookings=-1, revenue=-instance.amount)
+
+
+@receiver(pre_delete, sender=User)
+def release_interest_counters(sender, instance, **kwargs):
+    """Interest rows vanish with the user without m2m signals, so adjust here"""
+    event_ids = list(instance.interested_events.values_list('id', flat=True))
+    if event_ids:
+        Event.adjust_counters_for(event_ids, interested=-1)
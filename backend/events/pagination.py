@@ -0,0 +1,141 @@
+"""
+============================================================================
+Keyset (cursor) pagination for event listings
+============================================================================
+Events are paged on a sort key - newest (date_time, id) first by default,
+soonest first for upcoming events, or best (search_rank, id) first for
+ranked search results - instead of OFFSET, so fetching page N costs the
+same as fetching page 1 no matter how large the catalogue grows. Sort keys
+use Django's order_by() notation: a leading '-' sorts that field descending.
+The cursor handed to clients is an opaque, URL-safe token encoding the sort
+key of the last event on the previous page.
+============================================================================
+"""
+
+import base64
+import json
+from datetime import datetime
+
+from django.db.models import Q
+
+from .config import ERROR_MESSAGES, EVENTS_PER_PAGE, EVENTS_MAX_PER_PAGE
+
+# Default sort key: newest events first, id breaks ties
+DEFAULT_ORDERING = ('-date_time', '-id')
+# Upcoming events: the next one to start comes first
+UPCOMING_ORDERING = ('date_time', 'id')
+# Ranked search results: best match first
+SEARCH_ORDERING = ('-search_rank', '-id')
+
+
+class InvalidPageParameter(ValueError):
+    """Raised when a client sends a malformed cursor or limit"""
+
+    def __init__(self, field, message):
+        super().__init__(message)
+        self.field = field
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {'dt': value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict):
+        return datetime.fromisoformat(value['dt'])
+    return value
+
+
+def encode_cursor(event, ordering=DEFAULT_ORDERING):
+    """Build the opaque cursor pointing just after ``event``"""
+    payload = json.dumps([_encode_value(getattr(event, field.lstrip('-'))) for field in ordering])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, ordering=DEFAULT_ORDERING):
+    """Return the sort-key values stored in ``cursor``"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        if not isinstance(values, list) or len(values) != len(ordering):
+            raise ValueError('cursor does not match ordering')
+        return [_decode_value(value) for value in values]
+    except (ValueError, KeyError, TypeError):
+        raise InvalidPageParameter('cursor', ERROR_MESSAGES['INVALID_CURSOR'])
+
+
+def parse_limit(raw_limit):
+    """Validate ?limit=, falling back to EVENTS_PER_PAGE and capping at EVENTS_MAX_PER_PAGE"""
+    if raw_limit in (None, ''):
+        return EVENTS_PER_PAGE
+    try:
+        limit = int(raw_limit)
+    except (TypeError, ValueError):
+        raise InvalidPageParameter('limit', ERROR_MESSAGES['INVALID_LIMIT'])
+    if limit < 1:
+        raise InvalidPageParameter('limit', ERROR_MESSAGES['INVALID_LIMIT'])
+    return min(limit, EVENTS_MAX_PER_PAGE)
+
+
+def paginate_events(queryset, cursor=None, limit=None, ordering=DEFAULT_ORDERING):
+    """
+    Return one page of events sorted by ``ordering`` plus the next cursor.
+
+    Args:
+        queryset: Event queryset (filters/annotations already applied)
+        cursor (str, optional): Value of next_cursor from the previous page
+        limit (str|int, optional): Requested page size
+        ordering (tuple): Field/annotation names forming a unique sort key,
+            '-' prefixed when descending; the last one must be unique (e.g. 'id')
+
+    Returns:
+        tuple: (list of events, next_cursor or None)
+
+    Raises:
+        InvalidPageParameter: cursor or limit could not be parsed
+    """
+    queryset, limit = _page_queryset(queryset, cursor, limit, ordering)
+    return _split_page(list(queryset), limit, ordering)
+
+
+async def apaginate_events(queryset, cursor=None, limit=None, ordering=DEFAULT_ORDERING):
+    """Async version of paginate_events()"""
+    queryset, limit = _page_queryset(queryset, cursor, limit, ordering)
+    return _split_page([event async for event in queryset], limit, ordering)
+
+
+def order_events(queryset, ordering=DEFAULT_ORDERING):
+    """Order ``queryset`` the way paginate_events() pages it"""
+    return queryset.order_by(*ordering)
+
+
+def _page_queryset(queryset, cursor, limit, ordering):
+    """Queryset for the rows of one page (plus one extra), and the parsed limit"""
+    limit = parse_limit(limit)
+    queryset = order_events(queryset, ordering)
+
+    if cursor:
+        values = decode_cursor(cursor, ordering)
+        # (a, b) after (x, y)  <=>  a after x OR (a = x AND b after y), expanded
+        # for any length; "after" is < for descending fields, > for ascending
+        fields = [field.lstrip('-') for field in ordering]
+        after = Q()
+        for position, field in enumerate(ordering):
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            step = Q(**{f'{fields[position]}__{lookup}': values[position]})
+            for previous in range(position):
+                step &= Q(**{fields[previous]: values[previous]})
+            after |= step
+        queryset = queryset.filter(after)
+
+    # Fetch one extra row to find out whether another page exists
+    return queryset[:limit + 1], limit
+
+
+def _split_page(events, limit, ordering):
+    if len(events) > limit:
+        events = events[:limit]
+        return events, encode_cursor(events[-1], ordering)
+    return events, None
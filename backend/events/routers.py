@@ -0,0 +1,109 @@
+"""
+============================================================================
+Read Replica Routing
+============================================================================
+With REPLICA_DATABASE_URL set (see settings.py), ReadReplicaRouter sends
+the reads of GET/HEAD/OPTIONS requests to the 'replica' database alias,
+so list, detail and dashboard traffic stays off the primary that takes
+the bookings. Everything else uses the primary ('default'):
+
+- writes always go to the primary, and once a request has written, the
+  rest of its reads do too
+- ReplicaRoutingMiddleware gives a client that just wrote a cookie lasting
+  REPLICA_STICKY_SECONDS; its reads stay on the primary until the cookie
+  expires, so users see their own bookings and RSVPs despite replication
+  lag (read-your-writes). Set the window above the replica's usual lag.
+- sessions and users (auth) are always read from the primary, so a fresh
+  sign-up or login is never rejected by a lagging replica; these are
+  single-row lookups, and the JWT is_active check is cached anyway
+- code outside a request (management commands, shell, tests) and streamed
+  exports, which query while the body is sent, use the primary
+- migrations only run on the primary; the replica is a copy of it
+
+The anonymous response cache does not store responses read from the
+replica within REPLICA_STICKY_SECONDS of a catalogue write (see
+events/cache.py), so it never keeps serving data from before the write.
+
+Locally, two SQLite files can stand in for the pair: point
+REPLICA_DATABASE_URL at a copy of the database (it will not follow later
+writes, which makes the routing easy to see).
+============================================================================
+"""
+
+from contextvars import ContextVar
+
+from django.conf import settings
+from rest_framework.permissions import SAFE_METHODS
+
+PRIMARY_ALIAS = 'default'
+REPLICA_ALIAS = 'replica'
+# Cookie set after a client's write; its reads use the primary while present
+STICKY_COOKIE = 'db_primary'
+# Apps whose reads must never see replication lag
+PRIMARY_ONLY_APPS = frozenset({'sessions', 'auth'})
+
+
+class RoutingState:
+    """Routing for the current request: may it read the replica, has it written?"""
+
+    def __init__(self, replica_reads):
+        self.replica_reads = replica_reads
+        self.wrote = False
+
+
+# Routing of the current request; None outside ReplicaRoutingMiddleware.
+# A mutable state in a ContextVar, so writes made in sync_to_async threads
+# of async views are seen by the middleware.
+current_routing = ContextVar('current_routing', default=None)
+
+
+def replica_configured():
+    """Whether ReadReplicaRouter is installed and has a replica to read from"""
+    return REPLICA_ALIAS in settings.DATABASES and f'{__name__}.ReadReplicaRouter' in settings.DATABASE_ROUTERS
+
+
+def reading_from_replica():
+    """Whether reads of the current request go to the replica"""
+    state = current_routing.get()
+    return state is not None and state.replica_reads
+
+
+def routing_for(request):
+    """RoutingState for a request: replica reads for safe methods of non-sticky clients"""
+    return RoutingState(request.method in SAFE_METHODS and STICKY_COOKIE not in request.COOKIES)
+
+
+def mark_sticky(response, state):
+    """Keep the client on the primary for REPLICA_STICKY_SECONDS if the request wrote"""
+    if state.wrote:
+        response.set_cookie(
+            STICKY_COOKIE, '1',
+            max_age=settings.REPLICA_STICKY_SECONDS,
+            httponly=True,
+            samesite='Lax',
+            secure=settings.SESSION_COOKIE_SECURE,
+        )
+    return response
+
+
+class ReadReplicaRouter:
+    """Reads of safe-method requests to the replica, everything else to the primary"""
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label in PRIMARY_ONLY_APPS or not reading_from_replica():
+            return PRIMARY_ALIAS
+        return REPLICA_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = current_routing.get()
+        if state is not None:
+            state.wrote = True
+            state.replica_reads = False
+        return PRIMARY_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == PRIMARY_ALIAS
@@ -0,0 +1,262 @@
+"""
+============================================================================
+Event Search Backends
+============================================================================
+Full-text search for the ?search= parameter of GET /api/events/.
+
+- SQLiteFTSSearchBackend: FTS5 virtual table mirrored from events_event by
+  triggers (development)
+- PostgresSearchBackend: tsvector column with a GIN index maintained by a
+  trigger (production)
+- BasicSearchBackend: the original icontains scan, used when neither index
+  is available
+
+The backend is chosen with the EVENT_SEARCH_BACKEND setting ('auto' picks
+one from the database vendor). The index tables, triggers and columns are
+created by migration 0007_event_search_index; rebuild them with
+`python manage.py rebuild_search_index`.
+============================================================================
+"""
+
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+from .models import Event
+
+EVENT_TABLE = Event._meta.db_table
+FTS_TABLE = f'{EVENT_TABLE}_fts'
+
+# Words (letters/digits, including accented characters) in a search query
+WORD_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+
+class BasicSearchBackend:
+    """Case-insensitive substring match on name, description and location"""
+
+    name = 'basic'
+    ranked = False
+
+    # DDL run by install()/uninstall(); subclasses fill these in
+    INSTALL_SQL = []
+    UNINSTALL_SQL = []
+
+    def search(self, queryset, query):
+        return queryset.filter(
+            Q(name__icontains=query) |
+            Q(description__icontains=query) |
+            Q(location__icontains=query)
+        ).annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+    @staticmethod
+    def no_results(queryset):
+        """Empty result that still carries search_rank for ordering"""
+        return queryset.annotate(search_rank=Value(0.0, output_field=FloatField())).none()
+
+    def install(self, connection=connection):
+        """Create the index structures (tables, columns, triggers) if missing"""
+        with connection.cursor() as cursor:
+            for statement in self.INSTALL_SQL:
+                cursor.execute(statement)
+
+    def uninstall(self, connection=connection):
+        """Drop the index structures created by install()"""
+        with connection.cursor() as cursor:
+            for statement in self.UNINSTALL_SQL:
+                cursor.execute(statement)
+
+    def rebuild(self, connection=connection):
+        """
+        Re-create the index structures and repopulate them from events_event.
+
+        Returns:
+            int: number of events indexed
+        """
+        self.install(connection)
+        return 0
+
+
+class SQLiteFTSSearchBackend(BasicSearchBackend):
+    """SQLite FTS5 index ranked with bm25()"""
+
+    name = 'sqlite_fts'
+    ranked = True
+
+    @staticmethod
+    def build_match(query):
+        """
+        Turn free text into a safe FTS5 MATCH expression.
+
+        Every word is quoted (so FTS5 operators typed by users are inert) and
+        prefix-matched, so results appear while the user is still typing.
+        """
+        words = WORD_PATTERN.findall(query)
+        return ' '.join(f'"{word}"*' for word in words)
+
+    def search(self, queryset, query):
+        match = self.build_match(query)
+        if not match:
+            return self.no_results(queryset)
+        # bm25() is lower-is-better; negate it so every backend ranks descending.
+        # Column weights favour the event name over location and description.
+        return queryset.filter(
+            id__in=RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [match])
+        ).annotate(
+            search_rank=RawSQL(
+                f'SELECT -bm25({FTS_TABLE}, 10.0, 1.0, 4.0) FROM {FTS_TABLE} '
+                f'WHERE {FTS_TABLE} MATCH %s AND rowid = {EVENT_TABLE}.id',
+                [match],
+                output_field=FloatField(),
+            )
+        )
+
+    # External-content FTS5 table: it stores only the index and reads the
+    # text back from events_event, kept in sync by the triggers below.
+    # SQLite drops triggers when Django remakes a table during a migration,
+    # so rebuild_search_index re-runs these statements.
+    INSTALL_SQL = [
+        f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+            name, description, location,
+            content='{EVENT_TABLE}', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {EVENT_TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, name, description, location)
+            VALUES (new.id, new.name, new.description, new.location);
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {EVENT_TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description, location)
+            VALUES ('delete', old.id, old.name, old.description, old.location);
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF name, description, location ON {EVENT_TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description, location)
+            VALUES ('delete', old.id, old.name, old.description, old.location);
+            INSERT INTO {FTS_TABLE}(rowid, name, description, location)
+            VALUES (new.id, new.name, new.description, new.location);
+        END
+        """,
+    ]
+
+    UNINSTALL_SQL = [
+        f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ai',
+        f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ad',
+        f'DROP TRIGGER IF EXISTS {FTS_TABLE}_au',
+        f'DROP TABLE IF EXISTS {FTS_TABLE}',
+    ]
+
+    def rebuild(self, connection=connection):
+        self.install(connection)
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+            cursor.execute(f'SELECT COUNT(*) FROM {EVENT_TABLE}')
+            return cursor.fetchone()[0]
+
+
+class PostgresSearchBackend(BasicSearchBackend):
+    """PostgreSQL tsvector/GIN index ranked with ts_rank()"""
+
+    name = 'postgres'
+    ranked = True
+
+    # Weighted document: name (A) ranks above location (B) and description (C).
+    # {row} is 'NEW.' inside the trigger and '' in the rebuild UPDATE.
+    VECTOR_SQL = (
+        "setweight(to_tsvector('english', coalesce({row}name, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce({row}location, '')), 'B') || "
+        "setweight(to_tsvector('english', coalesce({row}description, '')), 'C')"
+    )
+
+    INSTALL_SQL = [
+        f'ALTER TABLE {EVENT_TABLE} ADD COLUMN IF NOT EXISTS search_vector tsvector',
+        f"""
+        CREATE OR REPLACE FUNCTION {EVENT_TABLE}_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector := {VECTOR_SQL.format(row='NEW.')};
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        """,
+        f'DROP TRIGGER IF EXISTS {EVENT_TABLE}_search_vector_trigger ON {EVENT_TABLE}',
+        f"""
+        CREATE TRIGGER {EVENT_TABLE}_search_vector_trigger
+        BEFORE INSERT OR UPDATE OF name, description, location ON {EVENT_TABLE}
+        FOR EACH ROW EXECUTE FUNCTION {EVENT_TABLE}_search_vector_update()
+        """,
+        f'CREATE INDEX IF NOT EXISTS {EVENT_TABLE}_search_vector_gin ON {EVENT_TABLE} USING GIN (search_vector)',
+    ]
+
+    UNINSTALL_SQL = [
+        f'DROP TRIGGER IF EXISTS {EVENT_TABLE}_search_vector_trigger ON {EVENT_TABLE}',
+        f'DROP FUNCTION IF EXISTS {EVENT_TABLE}_search_vector_update()',
+        f'DROP INDEX IF EXISTS {EVENT_TABLE}_search_vector_gin',
+        f'ALTER TABLE {EVENT_TABLE} DROP COLUMN IF EXISTS search_vector',
+    ]
+
+    @staticmethod
+    def build_tsquery(query):
+        """Turn free text into a prefix-matching to_tsquery() expression"""
+        return ' & '.join(f'{word}:*' for word in WORD_PATTERN.findall(query))
+
+    def search(self, queryset, query):
+        tsquery = self.build_tsquery(query)
+        if not tsquery:
+            return self.no_results(queryset)
+        # Rank is cast to float8 so it round-trips exactly through cursors
+        return queryset.annotate(
+            search_match=RawSQL(
+                f"{EVENT_TABLE}.search_vector @@ to_tsquery('english', %s)",
+                [tsquery],
+                output_field=BooleanField(),
+            ),
+            search_rank=RawSQL(
+                f"ts_rank({EVENT_TABLE}.search_vector, to_tsquery('english', %s))::float8",
+                [tsquery],
+                output_field=FloatField(),
+            ),
+        ).filter(search_match=True)
+
+    def rebuild(self, connection=connection):
+        self.install(connection)
+        with connection.cursor() as cursor:
+            cursor.execute(f"UPDATE {EVENT_TABLE} SET search_vector = {self.VECTOR_SQL.format(row='')}")
+            return cursor.rowcount
+
+
+SEARCH_BACKENDS = {
+    backend.name: backend
+    for backend in (BasicSearchBackend, SQLiteFTSSearchBackend, PostgresSearchBackend)
+}
+
+
+def backend_for_vendor(vendor):
+    """Return the full-text backend for a database vendor ('basic' if none)"""
+    name = {'sqlite': 'sqlite_fts', 'postgresql': 'postgres'}.get(vendor, 'basic')
+    return SEARCH_BACKENDS[name]()
+
+
+def get_search_backend():
+    """
+    Return the search backend selected by settings.EVENT_SEARCH_BACKEND.
+
+    'auto' (the default) uses the full-text index of the current database
+    vendor and falls back to the basic icontains scan on other databases.
+    """
+    name = getattr(settings, 'EVENT_SEARCH_BACKEND', 'auto')
+    if name == 'auto':
+        return backend_for_vendor(connection.vendor)
+    try:
+        return SEARCH_BACKENDS[name]()
+    except KeyError:
+        raise ValueError(
+            f"Unknown EVENT_SEARCH_BACKEND '{name}'. Choose one of: auto, {', '.join(SEARCH_BACKENDS)}"
+        )
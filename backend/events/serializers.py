@@ -1,15 +1,17 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
 from .models import Event, Booking
+from .instrumentation import InstrumentedSerializerMixin
 
 
-class EventSerializer(serializers.ModelSerializer):
+class EventSerializer(InstrumentedSerializerMixin, serializers.ModelSerializer):
     organiser = serializers.StringRelatedField(read_only=True)
     organiser_username = serializers.CharField(source='organiser.username', read_only=True)
     organiser_name = serializers.CharField(source='organiser.get_full_name', read_only=True)
-    interested_count = serializers.SerializerMethodField()
-    booking_count = serializers.SerializerMethodField()
+    interested_count = serializers.IntegerField(read_only=True)
+    booking_count = serializers.IntegerField(source='confirmed_booking_count', read_only=True)
     total_revenue = serializers.SerializerMethodField()
+    seats_remaining = serializers.IntegerField(read_only=True)
     is_booked_by_user = serializers.SerializerMethodField()
 
     class Meta:
@@ -23,6 +25,8 @@ class EventSerializer(serializers.ModelSerializer):
             'category',
             'cover_image',
             'ticket_price',
+            'capacity',
+            'seats_remaining',
             'organiser',
             'organiser_username',
             'organiser_name',
@@ -34,33 +38,26 @@ class EventSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['organiser', 'created_at', 'id']
 
-    def get_interested_count(self, obj):
-        # Return 0 if interested_users doesn't exist, otherwise return count
-        if hasattr(obj, 'interested_users'):
-            return obj.interested_users.count()
-        return 0
-
-    def get_booking_count(self, obj):
-        """Get number of confirmed bookings"""
-        return obj.get_booking_count()
-
     def get_total_revenue(self, obj):
         """Get total revenue from bookings"""
-        return str(obj.get_total_revenue())
+        return str(obj.confirmed_revenue)
 
     def get_is_booked_by_user(self, obj):
         """Check if current user has booked this event"""
+        # Prefer the flag annotated by Event.objects.with_stats()
+        if hasattr(obj, 'annotated_is_booked'):
+            return bool(obj.annotated_is_booked)
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             return Booking.objects.filter(
                 event=obj,
-                attendee=request.user,
+                attendee_id=request.user.pk,
                 status='confirmed'
             ).exists()
         return False
 
 
-class BookingSerializer(serializers.ModelSerializer):
+class BookingSerializer(InstrumentedSerializerMixin, serializers.ModelSerializer):
     event_name = serializers.CharField(source='event.name', read_only=True)
     attendee_name = serializers.CharField(source='attendee.get_full_name', read_only=True)
     organiser_name = serializers.CharField(source='event.organiser.get_full_name', read_only=True)
@@ -79,3 +76,12 @@ class BookingSerializer(serializers.ModelSerializer):
             'booking_date',
         ]
         read_only_fields = ['id', 'booking_date', 'amount']
+
+
+class CompactBookingSerializer(BookingSerializer):
+    """BookingSerializer without the attendee and organiser names (?compact=true)"""
+    attendee_name = None
+    organiser_name = None
+
+    class Meta(BookingSerializer.Meta):
+        fields = ['id', 'event', 'event_name', 'amount', 'status', 'booking_date']
@@ -0,0 +1,201 @@
+"""
+============================================================================
+Streaming Exports
+============================================================================
+Export views return every matching row, so they cannot build the whole
+serialized list in memory the way the paginated views do. Instead they:
+
+1. iterate the queryset with .iterator(chunk_size=EXPORT_CHUNK_SIZE), so
+   only one chunk of model instances is alive at a time,
+2. serialize row by row with a single serializer instance, and
+3. write through a StreamingHttpResponse, EXPORT_ROWS_PER_WRITE rows per
+   write, as a JSON array, as NDJSON (one JSON object per line) or as CSV.
+
+Flat reports skip models and serializers entirely: they pass the tuples of
+a values_list() query plus its column names, which CSV writes as they are -
+except that text starting with a formula character (=, +, -, @, tab or CR),
+such as an event named =HYPERLINK(...), is prefixed with ' so spreadsheets
+show it as text instead of evaluating it (CSV/formula injection).
+
+The format is negotiated by DRF like any other response: ?format=json,
+?format=ndjson, ?format=csv or the matching Accept header. Export views list
+the renderers they support in renderer_classes so that negotiation (and
+error responses raised before streaming starts) work as usual.
+
+Under ASGI a StreamingHttpResponse given a sync iterator first reads all
+of it into a list, which would undo all of the above. Export views pass
+asynchronous=served_over_asgi(request), and the chunks are then pulled
+one at a time through sync_to_async() instead.
+
+Once streaming has started the status code is already sent; an error
+mid-export is logged and the body ends early (a JSON array is left
+unterminated, so clients can tell the export is incomplete).
+============================================================================
+"""
+
+import csv
+import io
+import json
+import logging
+from datetime import date, datetime
+from decimal import Decimal
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+from .config import EXPORT_CHUNK_SIZE, EXPORT_ROWS_PER_WRITE
+
+logger = logging.getLogger(__name__)
+
+# Leading characters that make spreadsheet applications evaluate a cell
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+CONTENT_TYPES = {
+    'json': 'application/json',
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+
+class NDJSONRenderer(BaseRenderer):
+    """Newline-delimited JSON; non-streamed responses become a single line"""
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return encode_row(data) + b'\n'
+
+
+class CSVRenderer(BaseRenderer):
+    """CSV; non-streamed responses (errors) become a header plus one row"""
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if not isinstance(data, dict):
+            data = {'detail': data}
+        out = io.StringIO()
+        writer = csv.writer(out)
+        writer.writerow(data.keys())
+        writer.writerow(
+            _csv_cell(json.dumps(value, cls=JSONEncoder) if isinstance(value, (dict, list)) else value)
+            for value in data.values()
+        )
+        return out.getvalue().encode(self.charset)
+
+
+def _plain(value):
+    """Column value as exported: exact decimals and ISO 8601 dates"""
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _csv_cell(value):
+    """CSV cell for a column value; text that a spreadsheet would run as a formula is quoted with '"""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return f"'{value}"
+    return _plain(value)
+
+
+def encode_row(row):
+    """Compact UTF-8 JSON for one row, matching DRF's JSONRenderer defaults"""
+    return json.dumps(row, cls=JSONEncoder, ensure_ascii=False, separators=(',', ':')).encode()
+
+
+def serialized_rows(queryset, serializer_class, context=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield serializer output for each row without materialising the queryset"""
+    serializer = serializer_class(context=context or {})
+    for instance in queryset.iterator(chunk_size=chunk_size):
+        yield serializer.to_representation(instance)
+
+
+def _json_chunks(rows, fmt):
+    """Encode rows as a JSON array or NDJSON, EXPORT_ROWS_PER_WRITE rows per chunk"""
+    separator = b'\n' if fmt == 'ndjson' else b','
+    buffer = []
+    first = True
+    if fmt == 'json':
+        yield b'['
+    for row in rows:
+        buffer.append(encode_row(row))
+        if len(buffer) >= EXPORT_ROWS_PER_WRITE:
+            yield (b'' if first else separator) + separator.join(buffer)
+            buffer, first = [], False
+    if buffer:
+        yield (b'' if first else separator) + separator.join(buffer)
+        first = False
+    if fmt == 'json':
+        yield b']'
+    elif not first:
+        yield b'\n'
+
+
+def _csv_chunks(rows, columns):
+    """Encode tuples as CSV with a header line, EXPORT_ROWS_PER_WRITE rows per chunk"""
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(columns)
+    pending = 0
+    for row in rows:
+        writer.writerow(_csv_cell(value) for value in row)
+        pending += 1
+        if pending >= EXPORT_ROWS_PER_WRITE:
+            yield out.getvalue().encode()
+            out.seek(0)
+            out.truncate()
+            pending = 0
+    yield out.getvalue().encode()
+
+
+def _logged(chunks, name):
+    try:
+        yield from chunks
+    except Exception as e:
+        logger.error(f"Export '{name}' failed mid-stream: {type(e).__name__}: {str(e)}")
+
+
+async def _async_chunks(chunks):
+    """Pull chunks from a sync iterator one at a time on the sync thread"""
+    next_chunk = sync_to_async(next)
+    while (chunk := await next_chunk(chunks, None)) is not None:
+        yield chunk
+
+
+def served_over_asgi(request):
+    """Whether a (Django or DRF) request came in through the ASGI handler"""
+    return isinstance(getattr(request, '_request', request), ASGIRequest)
+
+
+def streaming_export(rows, fmt, name, columns=None, asynchronous=False):
+    """
+    StreamingHttpResponse writing rows as fmt ('json', 'ndjson' or 'csv').
+
+    rows are dicts, or tuples in the order of columns when columns is given
+    (as yielded by values_list()); CSV needs columns. name is used for the
+    log line and the attachment filename. Pass asynchronous=True under ASGI
+    so the body is streamed instead of buffered.
+    """
+    if fmt == 'csv':
+        chunks = _csv_chunks(rows, columns)
+    else:
+        if columns:
+            rows = ({column: _plain(value) for column, value in zip(columns, row)} for row in rows)
+        chunks = _json_chunks(rows, fmt)
+    chunks = _logged(chunks, name)
+    if asynchronous:
+        chunks = _async_chunks(chunks)
+    response = StreamingHttpResponse(chunks, content_type=CONTENT_TYPES[fmt])
+    response['Content-Disposition'] = f'attachment; filename="{name}.{fmt}"'
+    return response
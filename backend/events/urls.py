@@ -1,7 +1,21 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 from rest_framework_simplejwt.views import TokenRefreshView
 
+# Hot read endpoints: async views under ASGI (ASYNC_READ_VIEWS), DRF views otherwise
+if settings.ASYNC_READ_VIEWS:
+    from . import async_views
+    EventListView = async_views.AsyncEventListView
+    EventDetailView = async_views.AsyncEventDetailView
+    UserBookmarksView = async_views.AsyncUserBookmarksView
+    UserBookingsView = async_views.AsyncUserBookingsView
+else:
+    EventListView = views.EventListView
+    EventDetailView = views.EventDetailView
+    UserBookmarksView = views.UserBookmarksView
+    UserBookingsView = views.UserBookingsView
+
 urlpatterns = [
     # Authentication
     path('register/', views.register, name='register'),
@@ -9,16 +23,23 @@ urlpatterns = [
     path('token/refresh/', TokenRefreshView.as_view(), name='token-refresh'),
     
     # Events
-    path('events/', views.EventListView.as_view(), name='event-list'),
-    path('events/bookmarks/', views.UserBookmarksView.as_view(), name='user-bookmarks'),
+    path('events/', EventListView.as_view(), name='event-list'),
+    path('events/export/', views.EventExportView.as_view(), name='event-export'),
+    path('events/bookmarks/', UserBookmarksView.as_view(), name='user-bookmarks'),
     path('events/create/', views.EventCreateView.as_view(), name='event-create'),
     path('events/my/', views.UserEventsView.as_view(), name='user-events'),
-    path('events/<int:event_id>/', views.EventDetailView.as_view(), name='event-detail'),
+    path('events/<int:event_id>/', EventDetailView.as_view(), name='event-detail'),
     path('events/<int:event_id>/delete/', views.EventDeleteView.as_view(), name='event-delete'),
     path('events/<int:event_id>/rsvp/', views.EventRSVPView.as_view(), name='event-rsvp'),
     path('events/<int:event_id>/book/', views.BookEventView.as_view(), name='event-book'),
     
     # User bookings and organizer revenue
-    path('user/bookings/', views.UserBookingsView.as_view(), name='user-bookings'),
+    path('user/bookings/', UserBookingsView.as_view(), name='user-bookings'),
+    path('user/bookings/export/', views.UserBookingsExportView.as_view(), name='user-bookings-export'),
     path('organizer/revenue/', views.OrganizerRevenueView.as_view(), name='organizer-revenue'),
+    path('organizer/revenue/export/', views.OrganizerRevenueExportView.as_view(), name='organizer-revenue-export'),
+
+    # Operations
+    path('admin/metrics/', views.RequestMetricsView.as_view(), name='admin-metrics'),
+    path('health/', views.HealthView.as_view(), name='health'),
 ]
@@ -0,0 +1,78 @@
+"""
+Shared helpers for parsing API query parameters.
+"""
+
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+
+class InvalidDateRange(ValueError):
+    """Raised when a from/to query parameter cannot be parsed"""
+
+    def __init__(self, field, message):
+        super().__init__(message)
+        self.field = field
+
+
+def _parse_bound(field, value, inclusive_end=False):
+    """
+    Parse one bound of a date range into an aware datetime.
+
+    A bare date (YYYY-MM-DD) means midnight at the start of that day, or the
+    start of the following day when inclusive_end is set, so that ?to=
+    covers the whole day.
+    """
+    if not value:
+        return None
+    try:
+        parsed = parse_datetime(value)
+        if parsed is None:
+            day = parse_date(value)
+            if day is None:
+                raise ValueError
+            if inclusive_end:
+                day += timedelta(days=1)
+            parsed = datetime.combine(day, time.min)
+    except ValueError:
+        raise InvalidDateRange(field, 'Invalid date. Use YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS')
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def parse_date_range(raw_from, raw_to):
+    """
+    Parse ?from= / ?to= into a half-open [start, end) datetime range.
+
+    Returns:
+        tuple: (start or None, end or None)
+
+    Raises:
+        InvalidDateRange: a bound is malformed or from is after to
+    """
+    start = _parse_bound('from', raw_from)
+    end = _parse_bound('to', raw_to, inclusive_end=True)
+    if start and end and start >= end:
+        raise InvalidDateRange('to', "'to' must be after 'from'")
+    return start, end
+
+
+TRUE_VALUES = ('true', '1', 'yes')
+FALSE_VALUES = ('false', '0', 'no', '')
+
+
+def parse_flag(value):
+    """
+    Parse a boolean query flag such as ?upcoming=true.
+
+    Returns:
+        bool, or None when the value is not recognised
+    """
+    value = (value or '').strip().lower()
+    if value in TRUE_VALUES:
+        return True
+    if value in FALSE_VALUES:
+        return False
+    return None
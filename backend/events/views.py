@@ -16,20 +16,33 @@ Version: 1.0.0
 from rest_framework import status
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
+from rest_framework.renderers import JSONRenderer
 from rest_framework.views import APIView
-from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.permissions import IsAuthenticated, AllowAny, IsAdminUser
+from django.conf import settings
 from django.contrib.auth.models import User
 from django.contrib.auth import authenticate
 from django.utils import timezone
-from django.db.models import Q
+from django.db.models import Count, F, Sum, Window
 from django.shortcuts import render, redirect
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import ensure_csrf_cookie
-from rest_framework_simplejwt.tokens import RefreshToken
 import logging
 
-from .models import Event, UserProfile, Booking
-from .serializers import EventSerializer, BookingSerializer
+from .models import Event, Booking, AlreadyBooked, EventSoldOut, create_user_with_role
+from .serializers import EventSerializer, BookingSerializer, CompactBookingSerializer
+from .pagination import (
+    paginate_events, order_events, InvalidPageParameter,
+    DEFAULT_ORDERING, UPCOMING_ORDERING, SEARCH_ORDERING,
+)
+from .search import get_search_backend
+from .utils import parse_date_range, parse_flag, InvalidDateRange
+from .cache import cache_anonymous_get, get_catalogue_version, now_relative_bucket
+from .conditional import conditional_get, collection_fingerprint
+from .streaming import CSVRenderer, NDJSONRenderer, serialized_rows, served_over_asgi, streaming_export
+from .instrumentation import registry as metrics_registry, instrumentation_enabled
+from .health import health_report
+from .authentication import tokens_for_user, user_role, session_role
 from .config import (
     ERROR_MESSAGES, SUCCESS_MESSAGES, VALIDATION_RULES,
     USERNAME_MIN_LENGTH, USERNAME_MAX_LENGTH,
@@ -37,7 +50,7 @@ from .config import (
     EVENT_NAME_MIN_LENGTH, EVENT_NAME_MAX_LENGTH,
     EVENT_DESCRIPTION_MIN_LENGTH, EVENT_DESCRIPTION_MAX_LENGTH,
     EVENT_LOCATION_MIN_LENGTH, EVENT_LOCATION_MAX_LENGTH,
-    EVENT_CATEGORIES
+    EVENT_CATEGORIES, EXPORT_CHUNK_SIZE
 )
 
 # Configure logger for debugging and monitoring
@@ -61,7 +74,7 @@ def login_page(request):
     # Redirect already authenticated users to their dashboard
     if request.user.is_authenticated:
         try:
-            if request.user.profile.role == 'Organizer':
+            if session_role(request) == 'Organizer':
                 return redirect('organizer-dashboard')
             else:
                 return redirect('seeker-dashboard')
@@ -78,7 +91,7 @@ def register_page(request):
     # Redirect already authenticated users to their dashboard
     if request.user.is_authenticated:
         try:
-            if request.user.profile.role == 'Organizer':
+            if session_role(request) == 'Organizer':
                 return redirect('organizer-dashboard')
             else:
                 return redirect('seeker-dashboard')
@@ -96,7 +109,7 @@ def join_page(request):
     # Redirect already authenticated users to their dashboard
     if request.user.is_authenticated:
         try:
-            if request.user.profile.role == 'Organizer':
+            if session_role(request) == 'Organizer':
                 return redirect('organizer-dashboard')
             else:
                 return redirect('seeker-dashboard')
@@ -111,7 +124,7 @@ def attending_join(request):
     # Redirect already authenticated users to their dashboard
     if request.user.is_authenticated:
         try:
-            if request.user.profile.role == 'Organizer':
+            if session_role(request) == 'Organizer':
                 return redirect('organizer-dashboard')
             else:
                 return redirect('seeker-dashboard')
@@ -127,7 +140,7 @@ def organizing_join(request):
     # Redirect already authenticated users to their dashboard
     if request.user.is_authenticated:
         try:
-            if request.user.profile.role == 'Organizer':
+            if session_role(request) == 'Organizer':
                 return redirect('organizer-dashboard')
             else:
                 return redirect('seeker-dashboard')
@@ -139,26 +152,7 @@ def organizing_join(request):
 
 @require_http_methods(["GET"])
 def dashboard_page(request):
-    """Serve dashboard page - requires authentication"""
-    from django.contrib.auth import login as auth_login
-    
-    # Check for JWT token in URL
-    access_token = request.GET.get('token', None)
-    if access_token and not request.user.is_authenticated:
-        from rest_framework_simplejwt.authentication import JWTAuthentication
-        from rest_framework.exceptions import AuthenticationFailed
-        from rest_framework.request import Request
-        try:
-            auth = JWTAuthentication()
-            request.META['HTTP_AUTHORIZATION'] = f'Bearer {access_token}'
-            drf_request = Request(request)
-            auth_result = auth.authenticate(drf_request)
-            if auth_result:
-                request.user = auth_result[0]
-                auth_login(request, auth_result[0], backend='django.contrib.auth.backends.ModelBackend')
-        except AuthenticationFailed:
-            return render(request, 'login.html')
-    
+    """Serve dashboard page - requires authentication (see JWTSessionBootstrapMiddleware for ?token=)"""
     if not request.user.is_authenticated:
         return render(request, 'login.html')
     
@@ -168,26 +162,7 @@ def dashboard_page(request):
 @require_http_methods(["GET"])
 @ensure_csrf_cookie
 def create_event_page(request):
-    """Serve create event page - requires authentication"""
-    from django.contrib.auth import login as auth_login
-    
-    # Check for JWT token in URL
-    access_token = request.GET.get('token', None)
-    if access_token and not request.user.is_authenticated:
-        from rest_framework_simplejwt.authentication import JWTAuthentication
-        from rest_framework.exceptions import AuthenticationFailed
-        from rest_framework.request import Request
-        try:
-            auth = JWTAuthentication()
-            request.META['HTTP_AUTHORIZATION'] = f'Bearer {access_token}'
-            drf_request = Request(request)
-            auth_result = auth.authenticate(drf_request)
-            if auth_result:
-                request.user = auth_result[0]
-                auth_login(request, auth_result[0], backend='django.contrib.auth.backends.ModelBackend')
-        except AuthenticationFailed:
-            return render(request, 'login.html')
-    
+    """Serve create event page - requires authentication (see JWTSessionBootstrapMiddleware for ?token=)"""
     if not request.user.is_authenticated:
         return render(request, 'login.html')
     
@@ -287,25 +262,20 @@ def register(request):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # Create new user with hashed password
-        user = User.objects.create_user(
+        # Create the user and its profile (with the selected role) in one INSERT each
+        user = create_user_with_role(
             username=username,
             email=email,
             password=password,
+            role=role,
             first_name=first_name,
             last_name=last_name
         )
-        
-        # Explicitly create or update user profile with the selected role
-        from events.models import UserProfile
-        profile, created = UserProfile.objects.get_or_create(user=user)
-        profile.role = role
-        profile.save()
-        
-        logger.info(f"User profile created/updated for {username} with role: {role}")
-        
-        # Generate JWT tokens for the new user
-        refresh = RefreshToken.for_user(user)
+
+        logger.info(f"User profile created for {username} with role: {role}")
+
+        # Generate JWT tokens for the new user (role is embedded as a claim)
+        refresh = tokens_for_user(user, role)
         access_token = str(refresh.access_token)
         refresh_token = str(refresh)
         
@@ -386,16 +356,12 @@ def login(request):
                 status=status.HTTP_401_UNAUTHORIZED
             )
 
-        # Generate JWT tokens for authenticated user
-        refresh = RefreshToken.for_user(user)
+        # Generate JWT tokens for authenticated user (role is embedded as a claim)
+        role = user_role(user)
+        refresh = tokens_for_user(user, role)
         access_token = str(refresh.access_token)
         refresh_token = str(refresh)
         
-        # Get user role
-        role = 'Seeker'  # Default role
-        if hasattr(user, 'profile'):
-            role = user.profile.role
-        
         logger.info(f"Successful login for user: {username} (ID: {user.id})")
         logger.debug(f"Generated access token length: {len(access_token)}")
         logger.debug(f"Generated refresh token length: {len(refresh_token)}")
@@ -426,79 +392,218 @@ def login(request):
         )
 
 
+# ============================================================================
+# CONDITIONAL GET FINGERPRINTS - see events/conditional.py
+# ============================================================================
+
+def event_catalogue_fingerprint(request):
+    """
+    Every write that can change a list page bumps the catalogue version
+    (events/cache.py), so the version stands in for a table-wide query.
+    ?upcoming=/?past= pages also change with the clock, hence the time bucket.
+    Without SHARED_CACHE each worker has its own version, so the whole
+    table is fingerprinted instead.
+    """
+    if not settings.SHARED_CACHE:
+        parts, last_modified = collection_fingerprint(Event.objects.all())
+        return (*parts, now_relative_bucket(request)), last_modified
+    return (get_catalogue_version(), now_relative_bucket(request)), None
+
+
+def event_fingerprint(request, event_id):
+    """Fingerprint one event; None lets the view answer 404"""
+    parts, last_modified = collection_fingerprint(Event.objects.filter(id=event_id))
+    return (parts, last_modified) if parts[0] else None
+
+
+def bookmarks_fingerprint(request):
+    return collection_fingerprint(Event.objects.filter(interested_users=request.user.pk))
+
+
+def organiser_events_fingerprint(request):
+    return collection_fingerprint(Event.objects.filter(organiser_id=request.user.pk))
+
+
+def bookings_fingerprint(request):
+    """Bookings embed event details, so event edits count as changes too"""
+    return collection_fingerprint(Booking.objects.filter(attendee_id=request.user.pk), 'event__updated_at')
+
+
+def filter_event_catalogue(params, events):
+    """
+    Apply the catalogue filters shared by EventListView, EventExportView and
+    the async list view to events, reading them from params (query string).
+
+    Query Parameters:
+        - search (str, optional): Full-text search in name, description, location
+        - category (str, optional): Filter by category (Tech, Arts, Sports, Education)
+        - from / to (str, optional): Only events taking place in this window
+          (YYYY-MM-DD or ISO datetime; a bare 'to' date includes that day)
+        - upcoming (bool, optional): Only events that have not started yet
+        - past (bool, optional): Only events that have already started
+
+    Date filters are range conditions on date_time, so they are answered by
+    a range scan of event_date_id_idx (or event_category_date_idx) instead
+    of walking the whole history of the catalogue.
+
+    Returns:
+        tuple: (events, ordering, filters applied, errors) - errors maps
+        field names to messages and is empty when every filter is valid
+    """
+    ordering = DEFAULT_ORDERING
+    errors = {}
+
+    # Validate the date window before touching the queryset
+    try:
+        start, end = parse_date_range(
+            params.get('from', '').strip(),
+            params.get('to', '').strip(),
+        )
+    except InvalidDateRange as e:
+        errors[e.field] = str(e)
+        start = end = None
+
+    upcoming = parse_flag(params.get('upcoming'))
+    past = parse_flag(params.get('past'))
+    if upcoming is None:
+        errors['upcoming'] = ERROR_MESSAGES['INVALID_FLAG']
+    if past is None:
+        errors['past'] = ERROR_MESSAGES['INVALID_FLAG']
+    if upcoming and past:
+        errors['past'] = ERROR_MESSAGES['UPCOMING_AND_PAST']
+
+    # Apply full-text search if provided (best matches first when ranked)
+    search_query = params.get('search', '').strip()
+    if search_query:
+        search_backend = get_search_backend()
+        events = search_backend.search(events, search_query)
+        if search_backend.ranked:
+            ordering = SEARCH_ORDERING
+        logger.info(f"Search filter applied: '{search_query}' (backend: {search_backend.name})")
+
+    # Apply category filter if provided
+    category = params.get('category', '').strip()
+    if category:
+        # Validate category is in allowed choices
+        if category not in dict(Event.CATEGORY_CHOICES):
+            logger.warning(f"Invalid category filter attempted: '{category}'")
+            errors['category'] = ERROR_MESSAGES['INVALID_CATEGORY']
+        else:
+            events = events.filter(category=category)
+            logger.info(f"Category filter applied: '{category}'")
+
+    if errors:
+        return events, ordering, {}, errors
+
+    # Apply the date window
+    now = timezone.now()
+    if upcoming:
+        events = events.filter(date_time__gte=now)
+        # Soonest first, unless search results are ranked
+        if ordering == DEFAULT_ORDERING:
+            ordering = UPCOMING_ORDERING
+    if past:
+        events = events.filter(date_time__lt=now)
+    if start is not None:
+        events = events.filter(date_time__gte=start)
+    if end is not None:
+        events = events.filter(date_time__lt=end)
+
+    filters = {
+        'search': search_query or None,
+        'category': category or None,
+        'from': start,
+        'to': end,
+        'upcoming': bool(upcoming),
+        'past': bool(past),
+    }
+    return events, ordering, filters, errors
+
+
+def event_list_payload(request, page, next_cursor, filters):
+    """Body of an event list page, shared with the async list view"""
+    # Serialize events
+    serializer = EventSerializer(page, many=True, context={'request': request})
+
+    # Build user-friendly response message
+    count = len(page)
+    if count == 0:
+        message = 'No events found matching your criteria'
+    else:
+        message = f'Found {count} event{"" if count == 1 else "s"}'
+
+    return {
+        'message': message,
+        'count': count,
+        'events': serializer.data,
+        'next_cursor': next_cursor,
+        'has_more': next_cursor is not None,
+        'filters': filters,
+    }
+
+
 class EventListView(APIView):
     """
     GET /api/events/
-    Retrieve all upcoming events with optional search and category filtering.
+    Retrieve events newest-first (soonest-first with upcoming=true) with
+    optional search and category filtering. Results are paginated with an
+    opaque cursor keyed on (date_time, id), or on (search_rank, id), best
+    match first, when a ranked full-text search is applied.
     
     Query Parameters:
-        - search (str, optional): Search in name, description, location
+        - search (str, optional): Full-text search in name, description, location
         - category (str, optional): Filter by category (Tech, Arts, Sports, Education)
+        - from / to (str, optional): Only events taking place in this date window
+        - upcoming / past (bool, optional): Only events that have not started / have started
+        - limit (int, optional): Page size (default EVENTS_PER_PAGE, max EVENTS_MAX_PER_PAGE)
+        - cursor (str, optional): next_cursor value returned by the previous page
     
     Returns:
-        200 OK: {'message', 'count', 'events' array, 'filters' applied}
-        400 Bad Request: {'error', 'fields'} - invalid category provided
+        200 OK: {'message', 'count', 'events' array, 'next_cursor', 'has_more', 'filters' applied}
+        400 Bad Request: {'error', 'fields'} - invalid category, date filter, limit or cursor provided
         500 Internal Server Error: {'error', 'detail'} - server error
     
     Access: Public (no authentication required)
+    Anonymous responses are cached per query string for CACHE_TIMEOUT_EVENTS
+    and invalidated whenever the event catalogue changes (see events/cache.py).
+    Responses carry an ETag; If-None-Match is answered with 304 Not Modified.
     """
     permission_classes = [AllowAny]
 
+    @conditional_get(event_catalogue_fingerprint)
+    @cache_anonymous_get
     def get(self, request):
         try:
-            # Get all events ordered by date (show both past and future events)
-            events = Event.objects.all().order_by('-date_time')
-            
-            logger.info(f"EventListView accessed - Total events in db: {Event.objects.count()}")
-
-            # Apply search filter if provided
-            search_query = request.query_params.get('search', '').strip()
-            if search_query:
-                events = events.filter(
-                    Q(name__icontains=search_query) |
-                    Q(description__icontains=search_query) |
-                    Q(location__icontains=search_query)
+            # Past and future events unless from/to/upcoming/past narrow the window;
+            # ordering is applied by the paginator
+            events, ordering, filters, errors = filter_event_catalogue(
+                request.query_params, Event.objects.with_stats(request.user)
+            )
+            if errors:
+                return Response(
+                    {'error': ERROR_MESSAGES['VALIDATION_FAILED'], 'fields': errors},
+                    status=status.HTTP_400_BAD_REQUEST
                 )
-                logger.info(f"Search filter applied: '{search_query}' - Found {events.count()} events")
-
-            # Apply category filter if provided
-            category = request.query_params.get('category', '').strip()
-            if category:
-                # Validate category is in allowed choices
-                if category not in dict(Event.CATEGORY_CHOICES):
-                    logger.warning(f"Invalid category filter attempted: '{category}'")
-                    return Response(
-                        {
-                            'error': ERROR_MESSAGES['VALIDATION_FAILED'],
-                            'fields': {
-                                'category': ERROR_MESSAGES['INVALID_CATEGORY']
-                            }
-                        },
-                        status=status.HTTP_400_BAD_REQUEST
-                    )
-                events = events.filter(category=category)
-                logger.info(f"Category filter applied: '{category}' - Found {events.count()} events")
 
-            # Serialize events
-            serializer = EventSerializer(events, many=True)
-            
-            # Build user-friendly response message
-            count = events.count()
-            if count == 0:
-                message = 'No events found matching your criteria'
-            else:
-                message = f'Found {count} event{"" if count == 1 else "s"}'
+            # Fetch a single page of events
+            try:
+                page, next_cursor = paginate_events(
+                    events,
+                    cursor=request.query_params.get('cursor', '').strip(),
+                    limit=request.query_params.get('limit'),
+                    ordering=ordering,
+                )
+            except InvalidPageParameter as e:
+                logger.warning(f"Invalid pagination parameter '{e.field}' on EventListView")
+                return Response(
+                    {'error': ERROR_MESSAGES['VALIDATION_FAILED'], 'fields': {e.field: str(e)}},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            logger.info(f"EventListView accessed - Returned {len(page)} events, more: {next_cursor is not None}")
 
             return Response(
-                {
-                    'message': message,
-                    'count': count,
-                    'events': serializer.data,
-                    'filters': {
-                        'search': search_query or None,
-                        'category': category or None,
-                    }
-                },
+                event_list_payload(request, page, next_cursor, filters),
                 status=status.HTTP_200_OK
             )
 
@@ -513,6 +618,56 @@ class EventListView(APIView):
             )
 
 
+class EventExportView(APIView):
+    """
+    GET /api/events/export/
+    Stream every event matching the catalogue filters, for exports too large
+    to page through. Rows are the same objects EventListView returns.
+
+    Query Parameters:
+        - search, category, from, to, upcoming, past: as for EventListView
+        - format (str, optional): 'json' (default, one JSON array) or 'ndjson'
+          (one event per line); Accept: application/x-ndjson also works
+
+    Returns:
+        200 OK: streamed JSON array or NDJSON of event objects
+        400 Bad Request: {'error', 'fields'} - invalid category or date filter provided
+        500 Internal Server Error: {'error', 'detail'} - server error
+
+    Access: Public (no authentication required)
+    Memory use is constant in the number of events (see events/streaming.py);
+    responses are neither cached nor given an ETag.
+    """
+    permission_classes = [AllowAny]
+    renderer_classes = [JSONRenderer, NDJSONRenderer]
+
+    def get(self, request):
+        try:
+            events, ordering, filters, errors = filter_event_catalogue(
+                request.query_params, Event.objects.with_stats(request.user)
+            )
+            if errors:
+                return Response(
+                    {'error': ERROR_MESSAGES['VALIDATION_FAILED'], 'fields': errors},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            fmt = request.accepted_renderer.format
+            logger.info(f"EventExportView streaming events as {fmt} - filters: {filters}")
+            rows = serialized_rows(order_events(events, ordering), EventSerializer, context={'request': request})
+            return streaming_export(rows, fmt, 'events', asynchronous=served_over_asgi(request))
+
+        except Exception as e:
+            logger.error(f"EventExportView error: {type(e).__name__}: {str(e)}")
+            return Response(
+                {
+                    'error': ERROR_MESSAGES.get('EVENT_RETRIEVAL_FAILED', 'Failed to retrieve events'),
+                    'detail': str(e)
+                },
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
 class EventDetailView(APIView):
     """
     GET /api/events/<id>/
@@ -527,17 +682,21 @@ class EventDetailView(APIView):
         500 Internal Server Error: {'error', 'detail'} - server error
     
     Access: Public (no authentication required)
+    Anonymous responses are cached like EventListView. Responses carry ETag
+    and Last-Modified; If-None-Match / If-Modified-Since are answered with 304.
     """
     permission_classes = [AllowAny]
 
+    @conditional_get(event_fingerprint, honor_if_modified_since=True)
+    @cache_anonymous_get
     def get(self, request, event_id):
         try:
             # Attempt to fetch event from database
-            event = Event.objects.get(id=event_id)
+            event = Event.objects.with_stats(request.user).get(id=event_id)
             logger.info(f"EventDetailView accessed for event ID: {event_id} - '{event.name}'")
             
             # Serialize single event object
-            serializer = EventSerializer(event)
+            serializer = EventSerializer(event, context={'request': request})
             return Response(
                 {'event': serializer.data},
                 status=status.HTTP_200_OK
@@ -570,6 +729,7 @@ class EventCreateView(APIView):
         - location (str, required): Event location (2-200 chars)
         - category (str, required): One of Tech, Arts, Sports, Education
         - cover_image (str, optional): URL to cover image
+        - capacity (int, optional): Maximum number of bookings (blank = unlimited)
     
     Returns:
         201 Created: {'message', 'event' object} - event successfully created
@@ -601,6 +761,7 @@ class EventCreateView(APIView):
             category = request.data.get('category', '').strip()
             cover_image = request.data.get('cover_image', '').strip()
             ticket_price = request.data.get('ticket_price', 0)
+            capacity = request.data.get('capacity', None)
 
             # Validate all required and optional fields using config constants
             errors = {}
@@ -640,6 +801,17 @@ class EventCreateView(APIView):
             elif category not in dict(Event.CATEGORY_CHOICES):
                 errors['category'] = ERROR_MESSAGES['INVALID_CATEGORY']
 
+            # Validate optional capacity (blank means unlimited)
+            if capacity in (None, ''):
+                capacity = None
+            else:
+                try:
+                    capacity = int(capacity)
+                    if capacity < 1:
+                        raise ValueError
+                except (TypeError, ValueError):
+                    errors['capacity'] = ERROR_MESSAGES['CAPACITY_INVALID']
+
             # Return early if validation failed
             if errors:
                 logger.warning(f"Event creation validation failed - User: {request.user.username}")
@@ -658,6 +830,7 @@ class EventCreateView(APIView):
                     category=category,
                     cover_image=cover_image if cover_image else None,
                     ticket_price=ticket_price,
+                    capacity=capacity,
                     organiser=request.user
                 )
                 logger.info(f"Event created successfully - ID: {event.id}, Name: '{name}', Organiser: {request.user.username}")
@@ -738,7 +911,7 @@ class EventDeleteView(APIView):
 
             # Get event details before deletion for logging and response
             event_name = event.name
-            interested_count = event.interested_users.count()
+            interested_count = event.interested_count
             
             logger.info(f"Deleting event - ID: {event_id}, Name: '{event_name}', Interested users: {interested_count}")
             
@@ -783,16 +956,22 @@ class EventDeleteView(APIView):
 
 class EventRSVPView(APIView):
     """
-    POST /api/events/<id>/rsvp/
-    Toggle user interest in an event (add or remove from interested_users).
-    This acts as both a subscribe and unsubscribe endpoint based on current status.
-    Useful for implementing RSVP functionality with single endpoint.
+    /api/events/<id>/rsvp/
+    Manage the user's interest in an event (interested_users).
+    
+    POST   - toggle: remove the interest if present, otherwise add it
+    PUT    - idempotent add (safe to retry)
+    DELETE - idempotent remove (safe to retry)
+    
+    Each change is a single conditional DELETE and/or INSERT on the
+    interested_users through table, so the cost does not depend on how many
+    users are interested in the event.
     
     URL Parameters:
         - event_id (int): Unique event identifier to toggle interest
     
     Returns:
-        200 OK: {'message', 'event' object} - user interest toggled successfully
+        200 OK: {'message', 'interested', 'changed', 'event' object} - interest updated
         404 Not Found: {'error'} - event doesn't exist
         500 Internal Server Error: {'error'} - server error
     
@@ -801,28 +980,47 @@ class EventRSVPView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request, event_id):
+        return self._update_interest(request, event_id, 'toggle')
+
+    def put(self, request, event_id):
+        return self._update_interest(request, event_id, 'add')
+
+    def delete(self, request, event_id):
+        return self._update_interest(request, event_id, 'remove')
+
+    def _update_interest(self, request, event_id, action):
         try:
-            # Fetch event from database
-            event = Event.objects.get(id=event_id)
-            logger.info(f"EventRSVPView accessed - Event ID: {event_id}, User: {request.user.username}")
+            # Fetch event (with serializer stats) from database
+            event = Event.objects.with_stats(request.user).get(id=event_id)
+            logger.info(f"EventRSVPView accessed - Event ID: {event_id}, User: {request.user.username}, Action: {action}")
+
+            if action == 'toggle':
+                interested = event.toggle_interested_user(request.user)
+                changed = True
+            elif action == 'add':
+                changed = event.add_interested_user(request.user)
+                interested = True
+            else:
+                changed = event.remove_interested_user(request.user)
+                interested = False
 
-            # Toggle user in interested_users (add if not present, remove if present)
-            if request.user not in event.interested_users.all():
-                # User is not interested yet, add them
-                event.interested_users.add(request.user)
+            if interested:
                 message = SUCCESS_MESSAGES['RSVP_ADDED']
                 logger.info(f"User added to interested list - Event ID: {event_id}, User: {request.user.username}")
             else:
-                # User is already interested, remove them
-                event.interested_users.remove(request.user)
                 message = SUCCESS_MESSAGES['RSVP_REMOVED']
                 logger.info(f"User removed from interested list - Event ID: {event_id}, User: {request.user.username}")
 
-            # Serialize updated event
-            serializer = EventSerializer(event)
+            # Mirror the counter update on the instance instead of re-reading it
+            if changed:
+                event.interested_count += 1 if interested else -1
+
+            serializer = EventSerializer(event, context={'request': request})
             return Response(
                 {
                     'message': message,
+                    'interested': interested,
+                    'changed': changed,
                     'event': serializer.data
                 },
                 status=status.HTTP_200_OK
@@ -854,25 +1052,28 @@ class UserBookmarksView(APIView):
         500 Internal Server Error: {'error'} - server error
     
     Access: Authenticated users only
+    Supports If-None-Match (304 Not Modified) like EventListView.
     """
     permission_classes = [IsAuthenticated]
 
+    @conditional_get(bookmarks_fingerprint)
     def get(self, request):
         try:
             logger.info(f"UserBookmarksView accessed - User: {request.user.username}")
             
             # Get all events the user is interested in
-            bookmarked_events = request.user.interested_events.all()
+            bookmarked_events = Event.objects.with_stats(request.user).filter(interested_users=request.user.pk)
             
             # Serialize the events
-            serializer = EventSerializer(bookmarked_events, many=True)
+            serializer = EventSerializer(bookmarked_events, many=True, context={'request': request})
+            bookmarks = serializer.data
             
-            logger.info(f"Retrieved {bookmarked_events.count()} bookmarked events for user: {request.user.username}")
+            logger.info(f"Retrieved {len(bookmarks)} bookmarked events for user: {request.user.username}")
             
             return Response(
                 {
-                    'bookmarks': serializer.data,
-                    'count': bookmarked_events.count()
+                    'bookmarks': bookmarks,
+                    'count': len(bookmarks)
                 },
                 status=status.HTTP_200_OK
             )
@@ -898,23 +1099,25 @@ class UserEventsView(APIView):
         500 Internal Server Error: {'error', 'detail'} - server error
     
     Access: Authenticated users only
+    Supports If-None-Match (304 Not Modified) like EventListView.
     """
     permission_classes = [IsAuthenticated]
 
+    @conditional_get(organiser_events_fingerprint)
     def get(self, request):
         try:
             logger.info(f"UserEventsView accessed - User: {request.user.username}")
             
             # Get all events created by current user, sorted by newest first
-            events = Event.objects.filter(
-                organiser=request.user
+            events = Event.objects.with_stats(request.user).filter(
+                organiser_id=request.user.pk
             ).order_by('-created_at')
             
             # Count total events for response message
             count = events.count()
             
             # Serialize events
-            serializer = EventSerializer(events, many=True)
+            serializer = EventSerializer(events, many=True, context={'request': request})
             
             # Build user-friendly response message
             if count == 0:
@@ -950,48 +1153,19 @@ class UserEventsView(APIView):
 
 @require_http_methods(["GET"])
 def seeker_dashboard(request):
-    """Serve attendee dashboard - restricted to Seeker role users"""
-    from django.shortcuts import redirect
-    from django.contrib.auth import login as auth_login
-    import logging
-    
-    logger = logging.getLogger(__name__)
-    
-    # First check if user has access token in request (from script)
-    access_token = request.GET.get('token', None)
-    logger.info(f"Seeker dashboard accessed. Token provided: {bool(access_token)}, User authenticated: {request.user.is_authenticated}")
-    
-    if access_token:
-        # If token is provided, verify it with JWT
-        from rest_framework_simplejwt.authentication import JWTAuthentication
-        from rest_framework.exceptions import AuthenticationFailed
-        from rest_framework.request import Request
-        
-        try:
-            # Create a DRF Request object with the token
-            auth = JWTAuthentication()
-            # Manually set the token in the request for authentication
-            request.META['HTTP_AUTHORIZATION'] = f'Bearer {access_token}'
-            # Wrap Django request in DRF Request object for JWT auth
-            drf_request = Request(request)
-            auth_result = auth.authenticate(drf_request)
-            if auth_result:
-                request.user = auth_result[0]
-                # Create Django session so subsequent page loads stay authenticated
-                auth_login(request, auth_result[0], backend='django.contrib.auth.backends.ModelBackend')
-                logger.info(f"JWT authentication successful for user: {request.user.username}")
-            else:
-                logger.warning("JWT authentication returned None")
-        except AuthenticationFailed as e:
-            logger.error(f"JWT authentication failed: {e}")
-            return redirect('login-page')
+    """
+    Serve attendee dashboard - restricted to Seeker role users.
+    The login page arrives here with ?token=<jwt>, which
+    JWTSessionBootstrapMiddleware has already turned into a session.
+    """
+    logger.info(f"Seeker dashboard accessed. User authenticated: {request.user.is_authenticated}")
     
     # Check if user is authenticated via session
     if not request.user.is_authenticated:
         return redirect('login-page')
     
     # Check if user has the correct role
-    if hasattr(request.user, 'profile') and request.user.profile.role != 'Seeker':
+    if session_role(request) != 'Seeker':
         return redirect('organizer-dashboard')
     
     return render(request, 'seeker_dashboard.html')
@@ -999,48 +1173,19 @@ def seeker_dashboard(request):
 
 @require_http_methods(["GET"])
 def organizer_dashboard(request):
-    """Serve organizer dashboard - restricted to Organizer role users"""
-    from django.shortcuts import redirect
-    from django.contrib.auth import login as auth_login
-    import logging
-    
-    logger = logging.getLogger(__name__)
-    
-    # First check if user has access token in request (from script)
-    access_token = request.GET.get('token', None)
-    logger.info(f"Organizer dashboard accessed. Token provided: {bool(access_token)}, User authenticated: {request.user.is_authenticated}")
-    
-    if access_token:
-        # If token is provided, verify it with JWT
-        from rest_framework_simplejwt.authentication import JWTAuthentication
-        from rest_framework.exceptions import AuthenticationFailed
-        from rest_framework.request import Request
-        
-        try:
-            # Create a DRF Request object with the token
-            auth = JWTAuthentication()
-            # Manually set the token in the request for authentication
-            request.META['HTTP_AUTHORIZATION'] = f'Bearer {access_token}'
-            # Wrap Django request in DRF Request object for JWT auth
-            drf_request = Request(request)
-            auth_result = auth.authenticate(drf_request)
-            if auth_result:
-                request.user = auth_result[0]
-                # Create Django session so subsequent page loads stay authenticated
-                auth_login(request, auth_result[0], backend='django.contrib.auth.backends.ModelBackend')
-                logger.info(f"JWT authentication successful for user: {request.user.username}")
-            else:
-                logger.warning("JWT authentication returned None")
-        except AuthenticationFailed as e:
-            logger.error(f"JWT authentication failed: {e}")
-            return redirect('login-page')
+    """
+    Serve organizer dashboard - restricted to Organizer role users.
+    The login page arrives here with ?token=<jwt>, which
+    JWTSessionBootstrapMiddleware has already turned into a session.
+    """
+    logger.info(f"Organizer dashboard accessed. User authenticated: {request.user.is_authenticated}")
     
     # Check if user is authenticated via session
     if not request.user.is_authenticated:
         return redirect('login-page')
     
     # Check if user has the correct role
-    if hasattr(request.user, 'profile') and request.user.profile.role != 'Organizer':
+    if session_role(request) != 'Organizer':
         return redirect('seeker-dashboard')
     
     return render(request, 'organizer_dashboard.html')
@@ -1079,6 +1224,9 @@ def logout_user(request):
 def user_profile(request):
     """
     Get current user's profile information including role
+
+    The role comes from the token claim when there is one; the name and
+    email are not claims, so a JWT request loads the User row for them.
     
     Returns:
         200 OK: User profile data with role
@@ -1091,11 +1239,11 @@ def user_profile(request):
         )
     
     try:
+        role = user_role(request.user)
         user = request.user
-        role = 'Seeker'  # Default role
-        
-        if hasattr(user, 'profile'):
-            role = user.profile.role
+        if not isinstance(user, User):
+            # ClaimsUser from a stateless JWT read
+            user = User.objects.only('username', 'email', 'first_name', 'last_name').get(pk=user.pk)
         
         return Response(
             {
@@ -1127,8 +1275,8 @@ class BookEventView(APIView):
     
     Returns:
         201 Created: {'message', 'booking' object} - booking created successfully
-        400 Bad Request: {'error'} - user already booked this event
         404 Not Found: {'error'} - event doesn't exist
+        409 Conflict: {'error'} - user already booked this event, or it is sold out
         401 Unauthorized: {'error'} - not authenticated
         500 Internal Server Error: {'error'} - server error
     
@@ -1142,33 +1290,23 @@ class BookEventView(APIView):
             event = Event.objects.get(id=event_id)
             logger.info(f"BookEventView accessed - Event ID: {event_id}, User: {request.user.username}")
 
-            # Check if user already booked this event
-            existing_booking = Booking.objects.filter(
-                event=event,
-                attendee=request.user,
-                status='confirmed'
-            ).first()
-
-            if existing_booking:
+            # Claim a seat, create the booking and bookmark the event atomically
+            try:
+                booking = event.book(request.user)
+            except AlreadyBooked:
                 logger.warning(f"User already booked event - Event ID: {event_id}, User: {request.user.username}")
                 return Response(
-                    {'error': 'You have already booked this event'},
-                    status=status.HTTP_400_BAD_REQUEST
+                    {'error': ERROR_MESSAGES['ALREADY_BOOKED']},
+                    status=status.HTTP_409_CONFLICT
+                )
+            except EventSoldOut:
+                logger.warning(f"Booking rejected, event sold out - Event ID: {event_id}, User: {request.user.username}")
+                return Response(
+                    {'error': ERROR_MESSAGES['EVENT_SOLD_OUT']},
+                    status=status.HTTP_409_CONFLICT
                 )
 
-            # Create booking record with event's current ticket price
-            booking = Booking.objects.create(
-                event=event,
-                attendee=request.user,
-                amount=event.ticket_price,
-                status='confirmed'
-            )
-
-            # Add event to user's interested list (bookmark)
-            if request.user not in event.interested_users.all():
-                event.interested_users.add(request.user)
-
-            logger.info(f"Booking created - Event ID: {event_id}, User: {request.user.username}, Amount: {event.ticket_price}")
+            logger.info(f"Booking created - Event ID: {event_id}, User: {request.user.username}, Amount: {booking.amount}")
 
             # Serialize booking
             serializer = BookingSerializer(booking)
@@ -1176,7 +1314,7 @@ class BookEventView(APIView):
                 {
                     'message': 'Event booked successfully!',
                     'booking': serializer.data,
-                    'revenue_to_organizer': str(event.ticket_price)
+                    'revenue_to_organizer': str(booking.amount)
                 },
                 status=status.HTTP_201_CREATED
             )
@@ -1199,12 +1337,20 @@ class OrganizerRevenueView(APIView):
     """
     GET /api/organizer/revenue/
     Get revenue statistics for the authenticated organizer.
-    Returns total revenue, booking count, and breakup by event.
+    Returns total revenue, booking count, and breakup by event, computed by a
+    single grouped query (totals included) in the database.
+    
+    Query Parameters:
+        - from (str, optional): Only count bookings made on/after this date (YYYY-MM-DD or ISO datetime)
+        - to (str, optional): Only count bookings made up to this date (inclusive for YYYY-MM-DD)
+        - ordering (str, optional): One of revenue, bookings, date_time, name;
+          prefix with '-' for descending (default: -revenue)
     
     Returns:
         200 OK: {
             'total_revenue': float,
             'total_bookings': int,
+            'filters': {'from', 'to', 'ordering'},
             'events': [
                 {
                     'event_id': int,
@@ -1215,6 +1361,7 @@ class OrganizerRevenueView(APIView):
                 }
             ]
         }
+        400 Bad Request: {'error', 'fields'} - invalid date or ordering
         401 Unauthorized: {'error'} - not authenticated
         403 Forbidden: {'error'} - user is not an organizer
         500 Internal Server Error: {'error'} - server error
@@ -1223,52 +1370,90 @@ class OrganizerRevenueView(APIView):
     """
     permission_classes = [IsAuthenticated]
 
+    # Public ordering names -> annotated/model fields
+    ORDERING_FIELDS = {
+        'revenue': 'period_revenue',
+        'bookings': 'period_bookings',
+        'date_time': 'date_time',
+        'name': 'name',
+    }
+
     def get(self, request):
         try:
-            # Check if user is organizer
-            if not hasattr(request.user, 'profile'):
+            # Check if user is organizer (token role claim, no profile query)
+            if user_role(request.user) != 'Organizer':
+                logger.warning(f"Non-organizer user attempted to access revenue - User: {request.user.username}")
                 return Response(
-                    {'error': 'User profile not found'},
+                    {'error': 'Only organizers can access revenue statistics'},
                     status=status.HTTP_403_FORBIDDEN
                 )
 
-            if request.user.profile.role != 'Organizer':
-                logger.warning(f"Non-organizer user attempted to access revenue - User: {request.user.username}")
+            # Validate optional date range and ordering
+            errors = {}
+            try:
+                start, end = parse_date_range(
+                    request.query_params.get('from', '').strip(),
+                    request.query_params.get('to', '').strip(),
+                )
+            except InvalidDateRange as e:
+                errors[e.field] = str(e)
+                start = end = None
+
+            ordering = request.query_params.get('ordering', '-revenue').strip() or '-revenue'
+            if ordering.lstrip('-') not in self.ORDERING_FIELDS:
+                errors['ordering'] = f'Ordering must be one of: {", ".join(self.ORDERING_FIELDS)}'
+
+            if errors:
                 return Response(
-                    {'error': 'Only organizers can access revenue statistics'},
-                    status=status.HTTP_403_FORBIDDEN
+                    {'error': ERROR_MESSAGES['VALIDATION_FAILED'], 'fields': errors},
+                    status=status.HTTP_400_BAD_REQUEST
                 )
 
-            # Get all events organized by this user
-            events = Event.objects.filter(organiser=request.user)
-            
-            events_data = []
-            total_revenue = 0
-            total_bookings = 0
+            order_field = self.ORDERING_FIELDS[ordering.lstrip('-')]
+            if ordering.startswith('-'):
+                order_field = f'-{order_field}'
+
+            # One grouped query: per-event figures plus window totals over all rows
+            rows = list(
+                Event.objects.filter(organiser_id=request.user.pk)
+                .with_revenue(start, end)
+                .annotate(
+                    all_revenue=Window(Sum('period_revenue')),
+                    all_bookings=Window(Sum('period_bookings')),
+                )
+                .order_by(order_field, 'id')
+                .values(
+                    'id', 'name', 'ticket_price', 'date_time', 'location',
+                    'period_revenue', 'period_bookings', 'all_revenue', 'all_bookings',
+                )
+            )
 
-            for event in events:
-                event_revenue = event.get_total_revenue()
-                event_bookings = event.get_booking_count()
-                
-                total_revenue += event_revenue
-                total_bookings += event_bookings
-
-                events_data.append({
-                    'event_id': event.id,
-                    'event_name': event.name,
-                    'revenue': float(event_revenue),
-                    'bookings': event_bookings,
-                    'ticket_price': float(event.ticket_price),
-                    'date_time': event.date_time,
-                    'location': event.location,
-                })
+            events_data = [
+                {
+                    'event_id': row['id'],
+                    'event_name': row['name'],
+                    'revenue': float(row['period_revenue']),
+                    'bookings': row['period_bookings'],
+                    'ticket_price': float(row['ticket_price']),
+                    'date_time': row['date_time'],
+                    'location': row['location'],
+                }
+                for row in rows
+            ]
+            total_revenue = rows[0]['all_revenue'] if rows else 0
+            total_bookings = rows[0]['all_bookings'] if rows else 0
 
             logger.info(f"Revenue report generated - User: {request.user.username}, Total Revenue: {total_revenue}, Bookings: {total_bookings}")
 
             return Response(
                 {
-                    'total_revenue': float(total_revenue),
-                    'total_bookings': total_bookings,
+                    'total_revenue': float(total_revenue or 0),
+                    'total_bookings': int(total_bookings or 0),
+                    'filters': {
+                        'from': start,
+                        'to': end,
+                        'ordering': ordering,
+                    },
                     'events': events_data
                 },
                 status=status.HTTP_200_OK
@@ -1282,42 +1467,172 @@ class OrganizerRevenueView(APIView):
             )
 
 
+class OrganizerRevenueExportView(APIView):
+    """
+    GET /api/organizer/revenue/export/
+    Stream the authenticated organizer's revenue as CSV or NDJSON, straight
+    from one values_list() query (no model instances are built).
+
+    Query Parameters:
+        - from / to (str, optional): Booking date range, as for OrganizerRevenueView
+        - group (str, optional): 'booking' (default) - one row per confirmed
+          booking, each carrying its event's revenue and booking count for the
+          period; or 'event' - one row per event, including events without bookings
+        - format (str, optional): 'csv' (default) or 'ndjson'
+
+    Returns:
+        200 OK: streamed CSV (with a header line) or NDJSON
+            group=booking columns: booking_id, booking_date, event_id,
+                event_name, attendee, amount, event_bookings, event_revenue
+            group=event columns: event_id, event_name, date_time, location,
+                ticket_price, bookings, revenue
+        400 Bad Request: {'error', 'fields'} - invalid date or group
+        401 Unauthorized: {'error'} - not authenticated
+        403 Forbidden: {'error'} - user is not an organizer
+        500 Internal Server Error: {'error'} - server error
+
+    Access: Authenticated Organizer users only
+    Amounts are exact decimal strings; dates are ISO 8601.
+    """
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [CSVRenderer, NDJSONRenderer]
+
+    BOOKING_COLUMNS = (
+        'booking_id', 'booking_date', 'event_id', 'event_name', 'attendee',
+        'amount', 'event_bookings', 'event_revenue',
+    )
+    EVENT_COLUMNS = ('event_id', 'event_name', 'date_time', 'location', 'ticket_price', 'bookings', 'revenue')
+
+    def get(self, request):
+        try:
+            # Check if user is organizer (token role claim, no profile query)
+            if user_role(request.user) != 'Organizer':
+                logger.warning(f"Non-organizer user attempted to export revenue - User: {request.user.username}")
+                return Response(
+                    {'error': 'Only organizers can access revenue statistics'},
+                    status=status.HTTP_403_FORBIDDEN
+                )
+
+            # Validate optional date range and grouping
+            errors = {}
+            try:
+                start, end = parse_date_range(
+                    request.query_params.get('from', '').strip(),
+                    request.query_params.get('to', '').strip(),
+                )
+            except InvalidDateRange as e:
+                errors[e.field] = str(e)
+                start = end = None
+
+            group = request.query_params.get('group', 'booking').strip() or 'booking'
+            if group not in ('booking', 'event'):
+                errors['group'] = "Group must be one of: booking, event"
+
+            if errors:
+                return Response(
+                    {'error': ERROR_MESSAGES['VALIDATION_FAILED'], 'fields': errors},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            if group == 'event':
+                columns = self.EVENT_COLUMNS
+                rows = (
+                    Event.objects.filter(organiser_id=request.user.pk)
+                    .with_revenue(start, end)
+                    .order_by('date_time', 'id')
+                    .values_list(
+                        'id', 'name', 'date_time', 'location', 'ticket_price',
+                        'period_bookings', 'period_revenue',
+                    )
+                )
+            else:
+                columns = self.BOOKING_COLUMNS
+                bookings = Booking.objects.filter(event__organiser_id=request.user.pk, status='confirmed')
+                if start is not None:
+                    bookings = bookings.filter(booking_date__gte=start)
+                if end is not None:
+                    bookings = bookings.filter(booking_date__lt=end)
+                # Per-event figures ride along on every booking row as window aggregates
+                rows = (
+                    bookings.annotate(
+                        event_bookings=Window(Count('id'), partition_by=[F('event_id')]),
+                        event_revenue=Window(Sum('amount'), partition_by=[F('event_id')]),
+                    )
+                    .order_by('event__date_time', 'event_id', 'booking_date', 'id')
+                    .values_list(
+                        'id', 'booking_date', 'event_id', 'event__name', 'attendee__username',
+                        'amount', 'event_bookings', 'event_revenue',
+                    )
+                )
+
+            fmt = request.accepted_renderer.format
+            logger.info(f"Revenue export started - User: {request.user.username}, group: {group}, format: {fmt}")
+            return streaming_export(
+                rows.iterator(chunk_size=EXPORT_CHUNK_SIZE), fmt, f'revenue-by-{group}', columns=columns,
+                asynchronous=served_over_asgi(request),
+            )
+
+        except Exception as e:
+            logger.error(f"OrganizerRevenueExportView error: {type(e).__name__}: {str(e)}")
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
 class UserBookingsView(APIView):
     """
     GET /api/user/bookings/
     Get all bookings made by the authenticated user (attendee).
-    Returns list of booked events with booking details.
+    Returns list of booked events with booking details, fetched together
+    with their events, organisers and attendee in one joined query.
+    
+    Query Parameters:
+        - compact (bool, optional): Leave out attendee_name and organiser_name
     
     Returns:
         200 OK: {
             'bookings': [booking objects],
             'count': int
         }
+        400 Bad Request: {'error', 'fields'} - invalid compact flag
         401 Unauthorized: {'error'} - not authenticated
         500 Internal Server Error: {'error'} - server error
     
     Access: Authenticated users only
+    Supports If-None-Match (304 Not Modified) like EventListView.
     """
     permission_classes = [IsAuthenticated]
 
+    @conditional_get(bookings_fingerprint)
     def get(self, request):
         try:
             logger.info(f"UserBookingsView accessed - User: {request.user.username}")
+
+            compact = parse_flag(request.query_params.get('compact'))
+            if compact is None:
+                return Response(
+                    {'error': ERROR_MESSAGES['VALIDATION_FAILED'], 'fields': {'compact': ERROR_MESSAGES['INVALID_FLAG']}},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
             
-            # Get all confirmed bookings for this user
-            bookings = Booking.objects.filter(
-                attendee=request.user,
-                status='confirmed'
-            ).order_by('-booking_date')
+            # Get all confirmed bookings for this user, with what the serializer reads
+            bookings = list(
+                Booking.objects.filter(
+                    attendee_id=request.user.pk,
+                    status='confirmed'
+                ).for_serializer(compact=compact).order_by('-booking_date')
+            )
             
-            serializer = BookingSerializer(bookings, many=True)
+            serializer_class = CompactBookingSerializer if compact else BookingSerializer
+            serializer = serializer_class(bookings, many=True)
             
-            logger.info(f"Retrieved {bookings.count()} bookings for user: {request.user.username}")
+            logger.info(f"Retrieved {len(bookings)} bookings for user: {request.user.username}")
             
             return Response(
                 {
                     'bookings': serializer.data,
-                    'count': bookings.count()
+                    'count': len(bookings)
                 },
                 status=status.HTTP_200_OK
             )
@@ -1328,3 +1643,116 @@ class UserBookingsView(APIView):
                 {'error': str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+
+
+class UserBookingsExportView(APIView):
+    """
+    GET /api/user/bookings/export/
+    Stream all confirmed bookings of the authenticated user, newest first.
+    Rows are the same objects UserBookingsView returns.
+
+    Query Parameters:
+        - format (str, optional): 'json' (default, one JSON array) or 'ndjson'
+          (one booking per line); Accept: application/x-ndjson also works
+
+    Returns:
+        200 OK: streamed JSON array or NDJSON of booking objects
+        401 Unauthorized: {'error'} - not authenticated
+        500 Internal Server Error: {'error'} - server error
+
+    Access: Authenticated users only
+    """
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [JSONRenderer, NDJSONRenderer]
+
+    def get(self, request):
+        try:
+            fmt = request.accepted_renderer.format
+            logger.info(f"UserBookingsExportView streaming bookings as {fmt} - User: {request.user.username}")
+
+            # Everything BookingSerializer reads comes from the one joined query
+            bookings = Booking.objects.filter(
+                attendee_id=request.user.pk,
+                status='confirmed'
+            ).for_serializer().order_by('-booking_date')
+
+            return streaming_export(
+                serialized_rows(bookings, BookingSerializer), fmt, 'bookings', asynchronous=served_over_asgi(request)
+            )
+
+        except Exception as e:
+            logger.error(f"UserBookingsExportView error: {type(e).__name__}: {str(e)}")
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+class RequestMetricsView(APIView):
+    """
+    GET /api/admin/metrics/
+    Rolling per-endpoint request metrics recorded by
+    RequestInstrumentationMiddleware in this worker process.
+
+    Returns:
+        200 OK: {
+            'enabled': bool - whether the middleware is installed,
+            'window_size': int - requests kept per endpoint,
+            'endpoints': {
+                'GET api/events/': {
+                    'count': int,
+                    'total_ms' / 'db_ms' / 'serializer_ms' / 'queries':
+                        {'p50', 'p95', 'p99'}
+                }
+            }
+        }
+        401 Unauthorized: {'error'} - not authenticated
+        403 Forbidden: {'error'} - user is not staff
+
+    Access: Admin (staff) users only
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(
+            {
+                'enabled': instrumentation_enabled(),
+                'window_size': metrics_registry.window_size,
+                'endpoints': metrics_registry.summary(),
+            },
+            status=status.HTTP_200_OK
+        )
+
+
+class HealthView(APIView):
+    """
+    GET /api/health/
+    Database liveness for load balancers, plus connection pool stats for
+    staff (see events/health.py).
+
+    Returns:
+        200 OK / 503 Service Unavailable: {
+            'status': 'ok' | 'error',
+            'databases': [              - staff only
+                {'alias', 'ok', 'latency_ms', 'vendor', 'pooled', 'pool'}
+            ]
+        }
+
+    Access: Public; details for admin (staff) users only
+    """
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        databases = health_report()
+        healthy = all(database['ok'] for database in databases)
+        if not healthy:
+            failed = ', '.join(database['alias'] for database in databases if not database['ok'])
+            logger.error(f"HealthView - Database check failed for: {failed}")
+
+        payload = {'status': 'ok' if healthy else 'error'}
+        if request.user.is_staff:
+            payload['databases'] = databases
+        return Response(
+            payload,
+            status=status.HTTP_200_OK if healthy else status.HTTP_503_SERVICE_UNAVAILABLE
+        )
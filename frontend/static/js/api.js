@@ -22,8 +22,60 @@ function getAuthHeaders() {
     return headers;
 }
 
+// sessionStorage key prefix for stored ETag/Last-Modified validators
+const VALIDATOR_STORAGE_PREFIX = 'api_validators:';
+
+/**
+ * Load the validators and data stored for a previous GET of url
+ * @param {string} url - Full request URL
+ * @returns {Object|null} {etag, lastModified, data} or null
+ */
+function loadValidators(url) {
+    try {
+        return JSON.parse(sessionStorage.getItem(VALIDATOR_STORAGE_PREFIX + url));
+    } catch (e) {
+        return null;
+    }
+}
+
+/**
+ * Remember a GET response's ETag/Last-Modified so the next request can be
+ * answered with 304 Not Modified
+ * @param {string} url - Full request URL
+ * @param {Response} response - Fetch response
+ * @param {Object} data - Parsed response data
+ */
+function storeValidators(url, response, data) {
+    const etag = response.headers.get('ETag');
+    if (!etag) {
+        sessionStorage.removeItem(VALIDATOR_STORAGE_PREFIX + url);
+        return;
+    }
+    try {
+        sessionStorage.setItem(VALIDATOR_STORAGE_PREFIX + url, JSON.stringify({
+            etag: etag,
+            lastModified: response.headers.get('Last-Modified'),
+            data: data,
+        }));
+    } catch (e) {
+        // Storage full or unavailable - just skip conditional requests
+        console.warn('[API] Could not store response validators');
+    }
+}
+
+/**
+ * Forget every stored validator (e.g. on logout)
+ */
+function clearValidators() {
+    Object.keys(sessionStorage)
+        .filter(key => key.startsWith(VALIDATOR_STORAGE_PREFIX))
+        .forEach(key => sessionStorage.removeItem(key));
+}
+
 /**
  * Generic API request helper with token refresh support
+ * GET requests replay stored ETag/Last-Modified validators and reuse the
+ * stored data when the server answers 304 Not Modified
  * @param {string} endpoint - API endpoint (relative to BASE_URL)
  * @param {string} method - HTTP method (GET, POST, PUT, DELETE, PATCH)
  * @param {Object} data - Request body data (for POST, PUT, DELETE)
@@ -51,8 +103,22 @@ async function apiRequest(endpoint, method = 'GET', data = null, requiresAuth =
             options.body = JSON.stringify(data);
         }
 
+        // Send back the validators of the last response for this URL
+        const stored = method === 'GET' ? loadValidators(url) : null;
+        if (stored) {
+            headers['If-None-Match'] = stored.etag;
+            if (stored.lastModified) {
+                headers['If-Modified-Since'] = stored.lastModified;
+            }
+        }
+
         const response = await fetch(url, options);
 
+        // Unchanged since the last request - reuse the stored data
+        if (response.status === 304 && stored) {
+            return stored.data;
+        }
+
         // Handle response
         let responseData = {};
         try {
@@ -140,6 +206,10 @@ async function apiRequest(endpoint, method = 'GET', data = null, requiresAuth =
             throw new Error(fullError);
         }
 
+        if (method === 'GET') {
+            storeValidators(url, response, responseData);
+        }
+
         return responseData;
 
     } catch (error) {
@@ -309,6 +379,7 @@ function clearTokens() {
     localStorage.removeItem('refresh_token');
     localStorage.removeItem('user_role');
     localStorage.removeItem('user_data');
+    clearValidators();
     console.log('All tokens cleared from localStorage');
 }
 
@@ -359,12 +430,13 @@ function logoutUser() {
    ======================================== */
 
 /**
- * Get all upcoming events
+ * Get one page of events (newest first)
  * @param {string} search - Optional search query
  * @param {string} category - Optional category filter
- * @returns {Promise<Object>} Response with events array
+ * @param {string} cursor - Optional next_cursor from the previous page
+ * @returns {Promise<Object>} Response with events array and next_cursor
  */
-async function getEvents(search = '', category = '') {
+async function getEvents(search = '', category = '', cursor = '') {
     let endpoint = 'events/';
     const params = new URLSearchParams();
 
@@ -374,6 +446,9 @@ async function getEvents(search = '', category = '') {
     if (category) {
         params.append('category', category);
     }
+    if (cursor) {
+        params.append('cursor', cursor);
+    }
 
     if (params.toString()) {
         endpoint += `?${params.toString()}`;
@@ -434,4 +509,17 @@ async function getUserEvents() {
  */
 async function toggleEventRSVP(eventId) {
     return apiPost(`events/${eventId}/rsvp/`, {}, true);
-}
\ No newline at end of file
+}
+
+/**
+ * Set RSVP state explicitly (idempotent, safe to retry)
+ * @param {number} eventId - Event ID
+ * @param {boolean} interested - true to add interest, false to remove it
+ * @returns {Promise<Object>} Response with updated event data
+ */
+async function setEventRSVP(eventId, interested) {
+    if (interested) {
+        return apiPut(`events/${eventId}/rsvp/`, {}, true);
+    }
+    return apiDelete(`events/${eventId}/rsvp/`, true);
+}
@@ -5,6 +5,12 @@
 // Store all events for filtering
 let allEvents = [];
 
+// Cursor for the next page of the current listing (null when on the last page)
+let nextCursor = null;
+// Search/category the loaded pages belong to, reused by "Load more"
+let currentSearch = '';
+let currentCategory = '';
+
 /**
  * Initialize events page
  */
@@ -67,17 +73,21 @@ async function loadEvents() {
         // Show loading state
         container.innerHTML = '<div class="loading">Loading events...</div>';
 
-        // Fetch events from API
-        const response = await apiGet('events/');
+        // Fetch the first page of upcoming events from API
+        currentSearch = '';
+        currentCategory = '';
+        const response = await apiGet(buildEventUrl());
         allEvents = response.events || [];
 
         console.log(`[EVENTS] Loaded ${allEvents.length} events`);
 
         // Render events (passing empty search/category params)
         renderEvents(allEvents, '', '');
+        updateLoadMore(response);
 
     } catch (error) {
         console.error('[EVENTS] Error:', error.message);
+        updateLoadMore(null);
         const container = document.getElementById('eventCardsContainer');
         if (container) {
             container.innerHTML = `<div class="error-message">
@@ -218,8 +228,8 @@ function formatDate(date) {
  * Handle search input
  */
 async function handleSearch() {
-    const searchQuery = document.getElementById('searchInput') ? .value || '';
-    const category = document.getElementById('categoryFilter') ? .value || '';
+    const searchQuery = document.getElementById('searchInput')?.value || '';
+    const category = document.getElementById('categoryFilter')?.value || '';
 
     await filterAndRenderEvents(searchQuery, category);
 }
@@ -228,8 +238,8 @@ async function handleSearch() {
  * Handle category filter change
  */
 async function handleCategoryFilter() {
-    const searchQuery = document.getElementById('searchInput') ? .value || '';
-    const category = document.getElementById('categoryFilter') ? .value || '';
+    const searchQuery = document.getElementById('searchInput')?.value || '';
+    const category = document.getElementById('categoryFilter')?.value || '';
 
     await filterAndRenderEvents(searchQuery, category);
 }
@@ -248,16 +258,21 @@ async function filterAndRenderEvents(search = '', category = '') {
 
         // Show loading state
         container.innerHTML = '<div class="loading">Searching events...</div>';
+        updateLoadMore(null);
 
         // Fetch filtered events from API
         try {
+            currentSearch = search;
+            currentCategory = category;
             const response = await apiGet(buildEventUrl(search, category));
             const filteredEvents = response.events || [];
+            allEvents = filteredEvents;
 
             console.log(`[FILTER] Found ${filteredEvents.length} matching events`);
 
             // Render filtered events with context
             renderEvents(filteredEvents, search, category);
+            updateLoadMore(response);
         } catch (apiError) {
             console.error('[FILTER] API call failed:', apiError);
 
@@ -273,6 +288,7 @@ async function filterAndRenderEvents(search = '', category = '') {
 
     } catch (error) {
         console.error('[FILTER] Error:', error.message);
+        updateLoadMore(null);
         const container = document.getElementById('eventCardsContainer');
         if (container) {
             const errorMsg = error.message || 'Error filtering events. Please try again.';
@@ -285,15 +301,72 @@ async function filterAndRenderEvents(search = '', category = '') {
     }
 }
 
+/**
+ * Show the "Load more" button while the listing has further pages
+ * @param {Object|null} response - Last page from the API (null hides the button)
+ */
+function updateLoadMore(response) {
+    nextCursor = response && response.has_more ? response.next_cursor : null;
+
+    const container = document.getElementById('eventCardsContainer');
+    if (!container) return;
+
+    let button = document.getElementById('loadMoreEvents');
+    if (!button) {
+        button = document.createElement('button');
+        button.id = 'loadMoreEvents';
+        button.type = 'button';
+        button.className = 'btn-secondary';
+        button.textContent = 'Load more events';
+        button.onclick = loadMoreEvents;
+        container.insertAdjacentElement('afterend', button);
+    }
+    button.style.display = nextCursor ? '' : 'none';
+}
+
+/**
+ * Append the next page of the current listing
+ */
+async function loadMoreEvents() {
+    const container = document.getElementById('eventCardsContainer');
+    const button = document.getElementById('loadMoreEvents');
+    if (!container || !nextCursor) return;
+
+    try {
+        button.disabled = true;
+        button.textContent = 'Loading...';
+
+        const response = await apiGet(buildEventUrl(currentSearch, currentCategory, nextCursor));
+        const events = response.events || [];
+        allEvents = allEvents.concat(events);
+
+        console.log(`[EVENTS] Loaded ${events.length} more events`);
+
+        events.forEach(event => {
+            const card = createEventCard(event);
+            if (card) container.appendChild(card);
+        });
+        updateLoadMore(response);
+    } catch (error) {
+        console.error('[EVENTS] Error loading more events:', error.message);
+        alert('Could not load more events. Please try again.');
+    } finally {
+        button.disabled = false;
+        button.textContent = 'Load more events';
+    }
+}
+
 /**
  * Build event API URL with query parameters
  * @param {string} search - Search query
  * @param {string} category - Category filter
+ * @param {string} cursor - Optional next_cursor from the previous page
  * @returns {string} API endpoint URL
  */
-function buildEventUrl(search = '', category = '') {
+function buildEventUrl(search = '', category = '', cursor = '') {
     let url = 'events/';
-    const params = new URLSearchParams();
+    // The public listing only shows events that have not started yet, soonest first
+    const params = new URLSearchParams({ upcoming: 'true' });
 
     if (search) {
         params.append('search', search);
@@ -301,11 +374,12 @@ function buildEventUrl(search = '', category = '') {
     if (category) {
         params.append('category', category);
     }
-
-    if (params.toString()) {
-        url += `?${params.toString()}`;
+    if (cursor) {
+        params.append('cursor', cursor);
     }
 
+    url += `?${params.toString()}`;
+
     return url;
 }
 